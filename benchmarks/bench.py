@@ -0,0 +1,266 @@
+"""
+Benchmarks of the simulator hot paths.
+
+    python benchmarks/bench.py run --output benchmarks/baselines/my_machine.json
+    python benchmarks/bench.py compare benchmarks/baselines/my_machine.json new.json
+
+`run` measures every benchmark and writes the results as JSON, `compare` flags the
+metrics of a new result file that got worse than a baseline by more than a threshold.
+Only results of the same scale, Python and NumPy versions are compared.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yahtzee_simulator.game import Game
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.simulator import Simulator
+from yahtzee_simulator.strategies import ExampleStrategy
+
+# Whether a bigger value of a metric is better
+HIGHER_IS_BETTER = {
+    "ns_per_call": False,
+    "games_per_sec": True,
+    "peak_memory_bytes": False,
+}
+
+
+def _random_rolls(count: int) -> List[tuple]:
+    rng = random.Random(0)
+    return [tuple(rng.randint(1, 6) for _ in range(5)) for _ in range(count)]
+
+
+def _time(function: Callable[[], int], repeat: int) -> float:
+    """Return the best seconds per call of `function` over `repeat` runs, per unit it returns."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        units = function()
+        best = min(best, (time.perf_counter() - start) / units)
+    return best
+
+
+def _peak_memory(function: Callable[[], int]) -> int:
+    """Return the peak memory allocated by Python while running `function` once."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_score_for_category(scale: int) -> Callable[[], int]:
+    rolls = _random_rolls(1000)
+    scorecard = Scorecard()
+
+    def run() -> int:
+        for _ in range(scale):
+            for dice in rolls:
+                for category in Category:
+                    scorecard.score_for_category(dice, category)
+        return scale * len(rolls) * len(Category)
+    return run
+
+
+def bench_available_categories_with_scores(scale: int) -> Callable[[], int]:
+    rolls = _random_rolls(1000)
+    scorecard = Scorecard()
+    for category in list(Category)[::2]:
+        scorecard.set_score((1, 2, 3, 4, 6), category)
+
+    def run() -> int:
+        for _ in range(scale):
+            for dice in rolls:
+                scorecard.get_available_categories_with_scores(dice)
+        return scale * len(rolls)
+    return run
+
+
+def bench_play_turn(scale: int) -> Callable[[], int]:
+    strategy = ExampleStrategy()
+
+    def run() -> int:
+        random.seed(0)
+        for _ in range(scale * 20):
+            game = Game(strategy)
+            for _ in Category:
+                game.play_turn()
+        return scale * 20 * len(Category)
+    return run
+
+
+def bench_play_game(scale: int) -> Callable[[], int]:
+    strategy = ExampleStrategy()
+
+    def run() -> int:
+        random.seed(0)
+        for _ in range(scale * 20):
+            Game(strategy).play_game()
+        return scale * 20
+    return run
+
+
+def _in_temporary_folder(function: Callable[[], int]) -> Callable[[], int]:
+    def run() -> int:
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as folder:
+            os.chdir(folder)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    return function()
+            finally:
+                os.chdir(cwd)
+    return run
+
+
+def bench_simulator_run(scale: int) -> Callable[[], int]:
+    def run() -> int:
+        # Without plots, which take a fixed time that save_results measures
+        simulator = Simulator(ExampleStrategy(), scale * 100, seed=0, save_plots=False)
+        simulator.run()
+        return scale * 100
+    return _in_temporary_folder(run)
+
+
+def bench_save_results(scale: int) -> Callable[[], int]:
+    def run() -> int:
+        simulator = Simulator(ExampleStrategy(), scale * 100, seed=0)
+        simulator.run()
+        simulator.wait_for_plots()
+        # Only time saving, the run above is setup
+        start = time.perf_counter()
+        simulator.save_results()
+        simulator.wait_for_plots()
+        return time.perf_counter() - start
+    return _in_temporary_folder(run)
+
+
+# name -> (benchmark factory, metric the per-unit time is reported as)
+BENCHMARKS: Dict[str, tuple] = {
+    "score_for_category": (bench_score_for_category, "ns_per_call"),
+    "get_available_categories_with_scores": (bench_available_categories_with_scores, "ns_per_call"),
+    "play_turn": (bench_play_turn, "ns_per_call"),
+    "play_game": (bench_play_game, "games_per_sec"),
+    "simulator_run": (bench_simulator_run, "games_per_sec"),
+    "save_results": (bench_save_results, "ns_per_call"),
+}
+
+
+def run_benchmarks(names: List[str], scale: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name in names:
+        factory, metric = BENCHMARKS[name]
+        benchmark = factory(scale)
+        if name == "save_results":
+            # The benchmark times itself, take the best of the repeats
+            seconds = min(benchmark() for _ in range(repeat))
+        else:
+            seconds = _time(benchmark, repeat)
+        value = 1 / seconds if metric == "games_per_sec" else seconds * 1e9
+        results[name] = {metric: value, "peak_memory_bytes": _peak_memory(factory(scale))}
+        print(f"{name:<40} {metric} = {value:,.1f}  peak memory = {results[name]['peak_memory_bytes']:,} B")
+    return results
+
+
+def environment_differences(baseline: Dict, current: Dict) -> List[str]:
+    """Return how the settings and environment of two result files differ, which makes them incomparable."""
+    def settings(meta: Dict) -> Dict:
+        # Patch releases of Python do not change its speed much
+        return {"scale": meta.get("scale"), "python": ".".join(str(meta.get("python")).split(".")[:2]),
+                "numpy": meta.get("numpy")}
+    base, new = settings(baseline.get("meta", {})), settings(current.get("meta", {}))
+    return [f"{key} {base[key]} != {new[key]}" for key in base if base[key] != new[key]]
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Return a description of every metric that got worse than the baseline by more than `threshold`."""
+    regressions = []
+    for name, metrics in current["benchmarks"].items():
+        base_metrics = baseline["benchmarks"].get(name)
+        if base_metrics is None:
+            continue
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            if not base:
+                continue
+            change = (value - base) / base
+            worse = -change if HIGHER_IS_BETTER[metric] else change
+            status = "REGRESSION" if worse > threshold else "ok"
+            print(f"{name:<40} {metric:<18} {base:>16,.1f} -> {value:>16,.1f}  {change:+7.1%}  {status}")
+            if worse > threshold:
+                regressions.append(f"{name} {metric} {change:+.1%}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Yahtzee simulator hot paths.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks and save the results as JSON.")
+    run_parser.add_argument("--output", "-o", help="JSON file to write the results to.")
+    run_parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run.")
+    run_parser.add_argument("--scale", type=int, default=5, help="Work per benchmark, bigger is steadier.")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark, the best counts.")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions against a baseline.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="Relative change that counts as a regression (default 0.10).")
+    compare_parser.add_argument("--force", action="store_true",
+                                help="Compare results of different scales or Python or NumPy versions anyway.")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        results = {
+            "meta": {
+                "time": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "scale": args.scale,
+            },
+            "benchmarks": run_benchmarks(args.only or list(BENCHMARKS), args.scale, args.repeat),
+        }
+        if args.output:
+            os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=4)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    differences = environment_differences(baseline, current)
+    if differences:
+        print("The results are not comparable: " + ", ".join(differences))
+        if not args.force:
+            print("Re-record the baseline in the same environment, or pass --force.")
+            return 2
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s): " + ", ".join(regressions))
+        return 1
+    print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
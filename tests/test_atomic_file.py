@@ -0,0 +1,22 @@
+import os
+import tempfile
+import unittest
+from yahtzee_simulator.atomic_file import atomic_write
+
+class TestAtomicWrite(unittest.TestCase):
+    def test_replaces_only_complete_files(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "nested", "data.json")
+            with atomic_write(path, "w") as f:
+                f.write("complete")
+
+            with self.assertRaises(RuntimeError), atomic_write(path, "w") as f:
+                f.write("half")
+                raise RuntimeError("Simulated crash")
+            with open(path) as f:
+                self.assertEqual(f.read(), "complete")
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["data.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
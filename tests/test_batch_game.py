@@ -0,0 +1,40 @@
+import unittest
+import numpy as np
+from yahtzee_simulator.batch_game import BatchGame
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.strategies import ExampleBatchStrategy, ExampleStrategy
+
+class TestBatchGame(unittest.TestCase):
+    def test_play_game_fills_every_category(self):
+        game = BatchGame(ExampleBatchStrategy(), 500, np.random.default_rng(1))
+        totals = game.play_game()
+        self.assertTrue(np.all(game.scores >= 0))
+        for scores, total in zip(game.scores.tolist(), totals):
+            bonus = 50 if sum(scores[:6]) >= 63 else 0
+            self.assertEqual(sum(scores) + bonus, total)
+
+    def test_same_seed_same_games(self):
+        first = BatchGame(ExampleBatchStrategy(), 100, np.random.default_rng(7)).play_game()
+        second = BatchGame(ExampleBatchStrategy(), 100, np.random.default_rng(7)).play_game()
+        np.testing.assert_array_equal(first, second)
+
+    def test_example_port_matches_example_strategy(self):
+        rng = np.random.default_rng(3)
+        batch_strategy = ExampleBatchStrategy()
+        strategy = ExampleStrategy()
+        dice = rng.integers(1, 7, size=(300, 5), dtype=np.int8)
+        scores = np.where(rng.random((300, 15)) < 0.6, 0, -1).astype(np.int16)
+        scores[:, 14] = -1  # Leave at least one category open
+        chosen = batch_strategy.choose_category(dice, scores)
+        for row_dice, row_scores, category in zip(dice, scores, chosen):
+            scorecard = Scorecard()
+            for cat, score in zip(Category, row_scores):
+                if score >= 0:
+                    scorecard.set_score((0, 0, 0, 0, 0), cat)
+            expected = strategy.choose_category(tuple(int(d) for d in row_dice), scorecard)
+            self.assertEqual(list(Category)[category], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
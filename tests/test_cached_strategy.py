@@ -0,0 +1,75 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from yahtzee_simulator.cached_strategy import CachedStrategy, state_key
+from yahtzee_simulator.dice_source import RandomDiceSource
+from yahtzee_simulator.game import Game
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.strategies import ExampleStrategy
+
+class CountingStrategy(ExampleStrategy):
+    def __init__(self):
+        self.calls = 0
+
+    def choose_category(self, dice, scorecard):
+        self.calls += 1
+        return super().choose_category(dice, scorecard)
+
+class TestCachedStrategy(unittest.TestCase):
+    def test_state_key_ignores_dice_order(self):
+        scorecard = Scorecard()
+        self.assertEqual(state_key((6, 1, 3, 3, 2), 1, scorecard), state_key((1, 2, 3, 3, 6), 1, scorecard))
+        self.assertNotEqual(state_key((1, 2, 3, 3, 6), 1, scorecard), state_key((1, 2, 3, 3, 6), 2, scorecard))
+        filled = Scorecard()
+        filled.set_score((1, 1, 1, 1, 1), Category.YAHTZEE)
+        self.assertNotEqual(state_key((1, 2, 3, 3, 6), 1, scorecard), state_key((1, 2, 3, 3, 6), 1, filled))
+
+    def test_games_match_uncached(self):
+        for seed in range(5):
+            plain = Game(ExampleStrategy(), RandomDiceSource(seed))
+            cached = Game(CachedStrategy(ExampleStrategy()), RandomDiceSource(seed))
+            plain.dice_source.start_game(0)
+            cached.dice_source.start_game(0)
+            plain.play_game()
+            cached.play_game()
+            self.assertEqual(plain.scorecard.category_scores(), cached.scorecard.category_scores())
+
+    def test_hits_misses_and_eviction(self):
+        strategy = CountingStrategy()
+        cached = CachedStrategy(strategy, maxsize=2)
+        scorecard = Scorecard()
+        cached.choose_category((1, 2, 3, 4, 5), scorecard)
+        cached.choose_category((5, 4, 3, 2, 1), scorecard)
+        self.assertEqual(strategy.calls, 1)
+        cached.choose_category((6, 6, 6, 6, 6), scorecard)
+        cached.choose_category((2, 2, 3, 3, 3), scorecard)  # Evicts (1, 2, 3, 4, 5)
+        cached.choose_category((1, 2, 3, 4, 5), scorecard)
+        self.assertEqual(strategy.calls, 4)
+        self.assertEqual(cached.cache_info(), (1, 4, 2, 2, 2))
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "decisions.pkl")
+            cached = CachedStrategy(CountingStrategy(), path=path)
+            random.seed(3)
+            Game(cached).play_game()
+            cached.save()
+
+            strategy = CountingStrategy()
+            reloaded = CachedStrategy(strategy, path=path)
+            self.assertEqual(reloaded.cache_info().currsize, cached.cache_info().currsize)
+            random.seed(3)
+            Game(reloaded).play_game()
+            self.assertEqual(strategy.calls, 0)
+
+            # Pickled copies, like those sent to worker processes, load the saved cache instead of carrying it
+            cached._store(0, True)
+            copied = pickle.loads(pickle.dumps(cached))
+            self.assertEqual(copied.cache_info(), (0, 0, 0, cached.maxsize, reloaded.cache_info().currsize))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+from yahtzee_simulator.dice_source import AlignedDiceSource, NumpyDiceSource, RandomDiceSource
+
+class TestDiceSource(unittest.TestCase):
+    def test_numpy_games_only_depend_on_seed_and_index(self):
+        first = NumpyDiceSource(seed=3, games_per_buffer=4)
+        first.start_game(9)
+        expected = [first.roll(5), first.roll(2)]
+
+        second = NumpyDiceSource(seed=3, games_per_buffer=4)
+        for game_index in (0, 9):
+            second.start_game(game_index)
+            rolls = [second.roll(5), second.roll(2)]
+        self.assertEqual(rolls, expected)
+
+    def test_numpy_buffers_grow_with_the_games_played(self):
+        source = NumpyDiceSource(seed=6, games_per_buffer=64)
+        source.start_game(2)
+        self.assertEqual(len(source._dice), 3 * NumpyDiceSource.DICE_PER_GAME)
+
+        # Growing the buffer gives the dice of generating it whole, in games and as a stream
+        whole = np.random.default_rng([6, 1]).integers(1, 7, size=64 * NumpyDiceSource.DICE_PER_GAME, dtype=np.int8)
+        for index in (64, 65, 70, 100, 127):
+            source.start_game(index)
+            start = (index - 64) * NumpyDiceSource.DICE_PER_GAME
+            self.assertEqual(source.roll(5), tuple(whole[start:start + 5].tolist()))
+        stream = NumpyDiceSource(seed=6, games_per_buffer=64)
+        dice = [d for _ in range(64 * NumpyDiceSource.DICE_PER_GAME // 5 + 1) for d in stream.roll(5)]
+        stream.start_game(64)
+        self.assertEqual(len(dice), 64 * NumpyDiceSource.DICE_PER_GAME + 5)
+        self.assertEqual(dice[-5:], [d for d in stream.roll(5)])
+
+    def test_numpy_dice_values(self):
+        source = NumpyDiceSource(seed=1, games_per_buffer=1)
+        dice = [d for _ in range(200) for d in source.roll(5)]  # Spans several buffers
+        self.assertEqual(set(dice), {1, 2, 3, 4, 5, 6})
+
+    def test_seeded_random_source_repeats_games(self):
+        source = RandomDiceSource(seed=8)
+        source.start_game(2)
+        expected = source.roll(5)
+        source.start_game(1)
+        source.roll(5)
+        source.start_game(2)
+        self.assertEqual(source.roll(5), expected)
+
+    def test_aligned_rolls_do_not_depend_on_kept_dice(self):
+        first = AlignedDiceSource(seed=5)
+        first.start_game(3)
+        first.start_turn()
+        first_rolls = [first.roll(5), first.roll(1), first.roll(4)]
+        first.start_turn()
+        first_next_turn = first.roll(5)
+
+        second = AlignedDiceSource(seed=5)
+        second.start_game(3)
+        second.start_turn()
+        second_rolls = [second.roll(5), second.roll(3), second.roll(2)]
+        second.start_turn()
+        self.assertEqual(second.roll(5), first_next_turn)
+        self.assertEqual(first_rolls[0], second_rolls[0])
+        self.assertEqual(first_rolls[1], second_rolls[1][:1])
+        self.assertEqual(first_rolls[2][:2], second_rolls[2])
+
+    def test_aligned_source_moves_to_next_game(self):
+        continuous = AlignedDiceSource(seed=2)
+        for _ in range(16):
+            continuous.start_turn()
+        indexed = AlignedDiceSource(seed=2)
+        indexed.start_game(1)
+        indexed.start_turn()
+        self.assertEqual(continuous.roll(5), indexed.roll(5))
+
+
+if __name__ == "__main__":
+    unittest.main()
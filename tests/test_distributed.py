@@ -0,0 +1,105 @@
+import contextlib
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from yahtzee_simulator.distributed import run_coordinator, run_worker
+from yahtzee_simulator.simulator import Simulator
+from yahtzee_simulator.strategies import ExampleStrategy, LookaheadStrategy
+
+def take_shard_and_fail(address, answer=None):
+    """Take a shard and disconnect, without answering like a crashed worker or with a broken answer."""
+    with socket.create_connection(address) as connection, connection.makefile("rwb") as stream:
+        stream.write(b'{"type": "hello", "strategy": "ExampleStrategy", "dice_source": "RandomDiceSource"}\n')
+        stream.flush()
+        stream.readline()
+        if answer is not None:
+            stream.write(answer)
+            stream.flush()
+            stream.readline()
+
+class TestDistributed(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def load_summary(self, simulator):
+        simulator.wait_for_plots()
+        with open(os.path.join(simulator.run_folder, "summary.json")) as f:
+            summary = json.load(f)
+        del summary["time"]
+        return summary
+
+    def test_summary_matches_single_process_run(self):
+        local = Simulator(ExampleStrategy(), 45, seed=21, keep_scorecards=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            local.run()
+
+        threads = []
+        shards_done = []
+        rejections = []
+
+        def start_workers(address):
+            def start_healthy_workers():
+                take_shard_and_fail(address)
+                take_shard_and_fail(address, b'["not", "a", "result"]\n')
+                # A worker of another strategy is turned away
+                try:
+                    run_worker(address, LookaheadStrategy())
+                except ValueError as e:
+                    rejections.append(e)
+                for _ in range(2):
+                    threads.append(threading.Thread(
+                        target=lambda: shards_done.append(run_worker(address, ExampleStrategy()))))
+                    threads[-1].start()
+            threads.append(threading.Thread(target=start_healthy_workers))
+            threads[-1].start()
+
+        distributed = Simulator(ExampleStrategy(), 45, seed=21, keep_scorecards=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_coordinator(distributed, ("127.0.0.1", 0), shard_size=10, on_listening=start_workers)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(rejections), 1)
+        self.assertEqual(sum(shards_done), 5)  # Including the shards of the workers that failed
+        self.assertEqual(self.load_summary(distributed), self.load_summary(local))
+
+    def test_shards_of_hung_workers_are_reassigned(self):
+        released = threading.Event()
+        threads = []
+        shards_done = []
+
+        def hang(address):
+            with socket.create_connection(address) as connection, connection.makefile("rwb") as stream:
+                stream.write(b'{"type": "hello", "strategy": "ExampleStrategy", "dice_source": "RandomDiceSource"}\n')
+                stream.flush()
+                stream.readline()
+                shards_done.append(run_worker(address, ExampleStrategy()))
+                released.wait()
+
+        def start_workers(address):
+            threads.append(threading.Thread(target=hang, args=(address,)))
+            threads[-1].start()
+
+        simulator = Simulator(ExampleStrategy(), 20, seed=3, keep_scorecards=False, save_plots=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_coordinator(simulator, ("127.0.0.1", 0), shard_size=10, shard_timeout=0.5,
+                            on_listening=start_workers)
+        released.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(shards_done, [2])
+        self.assertEqual(simulator.statistics.count, 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import numpy as np
+from yahtzee_simulator.dice_source import RandomDiceSource
+from yahtzee_simulator.exact_evaluator import StateSpaceTooLarge, evaluate_exactly, evaluate_strategy
+from yahtzee_simulator.game import Game
+from yahtzee_simulator.keep_table import ROLL_PROBABILITIES
+from yahtzee_simulator.score_statistics import ScoreStatistics
+from yahtzee_simulator.score_table import SCORE_TABLE
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.simulator import simulate_games
+from yahtzee_simulator.strategies import ExampleStrategy
+from yahtzee_simulator.strategy import Strategy
+
+# Everything filled but sixes, full house, chance and yahtzee, three sixes short of the bonus
+ENDGAME = [3, 6, 9, 12, 15, -1, 10, 14, 12, 16, -1, 15, 20, -1, -1]
+
+class FirstOpenCategoryStrategy(Strategy):
+    """Never rerolls and fills the categories in order."""
+    def should_finish_turn(self, dice, rolls_left, scorecard):
+        return True
+
+    def choose_dice_to_keep(self, dice, rolls_left, scorecard):
+        return dice
+
+    def choose_category(self, dice, scorecard):
+        return scorecard.available_categories()[0]
+
+class KeepSixesStrategy(FirstOpenCategoryStrategy):
+    """Rerolls everything but sixes."""
+    def should_finish_turn(self, dice, rolls_left, scorecard):
+        return False
+
+    def choose_dice_to_keep(self, dice, rolls_left, scorecard):
+        return tuple(value for value in dice if value == 6)
+
+class TestExactEvaluator(unittest.TestCase):
+    def test_one_roll_per_category(self):
+        evaluation = evaluate_exactly(FirstOpenCategoryStrategy(), signature=Scorecard.filled_mask)
+        self.assertTrue(evaluation.exact)
+        self.assertAlmostEqual(evaluation.score_distribution.sum(), 1.0)
+        # Every category gets one independent roll
+        expected = float((ROLL_PROBABILITIES @ SCORE_TABLE).sum())
+        self.assertAlmostEqual(evaluation.expected_score - 50 * evaluation.bonus_probability, expected)
+        self.assertEqual(evaluation.strategy_calls, 15 * 252 * 2)
+
+    def test_matches_sampling(self):
+        strategy = KeepSixesStrategy()
+        evaluation = evaluate_exactly(strategy)
+        coarse = evaluate_exactly(strategy, signature=Scorecard.filled_mask, score_distribution=False)
+        self.assertAlmostEqual(coarse.expected_score, evaluation.expected_score)
+        self.assertAlmostEqual(coarse.bonus_probability, evaluation.bonus_probability)
+        self.assertLess(coarse.strategy_calls, evaluation.strategy_calls)
+
+        category_scores, _, _ = simulate_games(strategy, 0, 2000, 5, keep_scorecards=False)
+        statistics = ScoreStatistics()
+        statistics.add_batch(category_scores)
+        low, high = statistics.mean_confidence_interval(0.999)
+        self.assertLess(low, evaluation.expected_score)
+        self.assertLess(evaluation.expected_score, high)
+        self.assertAlmostEqual(evaluation.standard_deviation(), statistics.standard_deviation(), delta=1.5)
+
+    def test_falls_back_to_sampling(self):
+        with self.assertRaises(StateSpaceTooLarge):
+            evaluate_exactly(KeepSixesStrategy(), max_states=10)
+        evaluation = evaluate_strategy(KeepSixesStrategy(), max_states=10, fallback_games=50, seed=2)
+        self.assertFalse(evaluation.exact)
+        self.assertEqual(evaluation.states, 50)
+        self.assertAlmostEqual(float(np.sum(evaluation.score_distribution)), 1.0)
+
+    def test_example_strategy_endgame(self):
+        strategy = ExampleStrategy()
+        start = Scorecard.from_category_scores(ENDGAME)
+        evaluation = evaluate_exactly(strategy, scorecard=start)
+        # ExampleStrategy ignores the upper subtotal, so the filled categories are all it needs
+        coarse = evaluate_exactly(strategy, signature=Scorecard.filled_mask, score_distribution=False,
+                                  scorecard=start)
+        self.assertAlmostEqual(coarse.expected_score, evaluation.expected_score)
+        self.assertLessEqual(coarse.states, 2 ** 4)
+        self.assertLess(coarse.strategy_calls, evaluation.strategy_calls)
+
+        totals = []
+        source = RandomDiceSource(8)
+        for i in range(3000):
+            source.start_game(i)
+            game = Game(strategy, source)
+            game.scorecard = Scorecard.from_category_scores(ENDGAME)
+            while not game.scorecard.is_complete():
+                game.play_turn()
+            totals.append(game.scorecard.total_score())
+        mean = float(np.mean(totals))
+        error = float(np.std(totals, ddof=1)) / np.sqrt(len(totals))
+        self.assertAlmostEqual(evaluation.expected_score, mean, delta=4 * error)
+        self.assertAlmostEqual(evaluation.score_distribution @ np.arange(len(evaluation.score_distribution)),
+                               evaluation.expected_score)
+
+    def test_large_state_spaces_fall_back_early(self):
+        # A whole game of ExampleStrategy needs millions of decisions, the budget stops it long before
+        with self.assertRaises(StateSpaceTooLarge):
+            evaluate_exactly(ExampleStrategy(), signature=Scorecard.filled_mask, max_strategy_calls=20_000)
+        evaluation = evaluate_strategy(ExampleStrategy(), max_strategy_calls=20_000, fallback_games=40, seed=3)
+        self.assertFalse(evaluation.exact)
+        self.assertEqual(evaluation.states, 40)
+
+if __name__ == "__main__":
+    unittest.main()
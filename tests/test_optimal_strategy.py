@@ -0,0 +1,52 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.strategies.optimal_strategy import NUMBER_OF_MASKS, OptimalStrategy
+
+class TestOptimalStrategy(unittest.TestCase):
+    def setUp(self):
+        """Use an all-zero table so no solve is needed; only the last turn is then meaningful."""
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "values.npy")
+        np.save(path, np.zeros((NUMBER_OF_MASKS, 64), dtype=np.float32))
+        self.strategy = OptimalStrategy(path)
+        self.scorecard = Scorecard()
+        for category in Category:
+            if category != Category.FOURS:
+                self.scorecard.set_score((1, 1, 2, 3, 5), category)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_keeps_dice_for_the_last_category(self):
+        dice = (4, 1, 4, 6, 4)
+        self.assertFalse(self.strategy.should_finish_turn(dice, 2, self.scorecard))
+        self.assertEqual(self.strategy.choose_dice_to_keep(dice, 2, self.scorecard), (4, 4, 4))
+        self.assertEqual(self.strategy.choose_category(dice, self.scorecard), Category.FOURS)
+
+    def test_finishes_when_nothing_can_improve(self):
+        self.assertTrue(self.strategy.should_finish_turn((4, 4, 4, 4, 4), 2, self.scorecard))
+
+    def test_plans_are_cached_per_instance(self):
+        strategy = OptimalStrategy(self.strategy.table_path, max_plans=2)
+        for upper in range(3):
+            strategy.choose_category((1, 2, 3, 4, 5), Scorecard.from_category_scores([upper] + [-1] * 14))
+        # The oldest plan was dropped
+        self.assertEqual(list(strategy._plans), [(1, 1), (1, 2)])
+        self.assertEqual(self.strategy._plans, {})
+        copy = pickle.loads(pickle.dumps(strategy))
+        self.assertEqual((copy.max_plans, copy._plans), (2, {}))
+
+    def test_rejects_other_tables(self):
+        path = os.path.join(self.tmp.name, "other.npy")
+        np.save(path, np.zeros((10, 10)))
+        with self.assertRaises(ValueError):
+            OptimalStrategy(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import numpy as np
+from yahtzee_simulator.remote_strategy import RemoteStrategy, StrategyServer, play_remote_games
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.simulator import simulate_games
+from yahtzee_simulator.strategies import ExampleBatchStrategy, LookaheadStrategy
+
+async def play(strategy, number_of_games, concurrency, address=("127.0.0.1", 0)):
+    server = StrategyServer(strategy)
+    client = RemoteStrategy(await server.start(address))
+    await client.connect()
+    try:
+        scores = await play_remote_games(client, number_of_games, seed=7, concurrency=concurrency)
+    finally:
+        await client.close()
+        await server.close()
+    return scores, client
+
+class ForgetfulServer(StrategyServer):
+    """Leaves the last decision of every batch unanswered."""
+    def decide(self, requests):
+        return super().decide(requests)[:-1]
+
+async def play_with_forgetful_server():
+    server = ForgetfulServer(LookaheadStrategy())
+    client = RemoteStrategy(await server.start())
+    await client.connect()
+    try:
+        return await asyncio.wait_for(play_remote_games(client, 4, seed=1), 30)
+    finally:
+        await client.close()
+        await server.close()
+
+class TestRemoteStrategy(unittest.TestCase):
+    def test_matches_local_games(self):
+        local, _, _ = simulate_games(LookaheadStrategy(), 0, 20, 7)
+        scores, client = asyncio.run(play(LookaheadStrategy(), 20, concurrency=20))
+        np.testing.assert_array_equal(scores, local)
+        # Every round trip carries the decisions of all games waiting on the server
+        self.assertLess(client.batches * 10, client.requests)
+
+    def test_batch_strategy_over_unix_socket(self):
+        with tempfile.TemporaryDirectory() as folder:
+            address = os.path.join(folder, "strategy.sock")
+            scores, client = asyncio.run(play(ExampleBatchStrategy(), 30, concurrency=8, address=address))
+        self.assertEqual(scores.shape, (30, len(Category)))
+        self.assertTrue(np.all(scores >= 0))
+        self.assertEqual(client.requests, 30 * 15 * 5)  # ExampleBatchStrategy rolls three times every turn
+
+    def test_missing_answers_fail_the_games(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(play_with_forgetful_server())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from yahtzee_simulator.run_index import DEFAULT_INDEX_PATH, RunIndex, main
+from yahtzee_simulator.simulator import Simulator
+from yahtzee_simulator.strategies import ExampleStrategy, LookaheadStrategy
+
+class TestRunIndex(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.runs = []
+        for strategy, seed in ((ExampleStrategy(), 1), (ExampleStrategy(), 2), (LookaheadStrategy(), 1)):
+            simulator = Simulator(strategy, 20, seed=seed, save_plots=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                simulator.run()
+            self.runs.append(simulator)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_runs_are_registered(self):
+        with RunIndex() as index:
+            records = index.query(order_by="average")
+            self.assertEqual(len(records), 3)
+            self.assertEqual(records[0].strategy, "LookaheadStrategy")
+            self.assertEqual(records[0].average, self.runs[2].average_score())
+            self.assertEqual(records[0].seed, 1)
+            self.assertEqual(len(index.query(strategy="ExampleStrategy")), 2)
+            self.assertEqual(index.query(since="2000-01-01", until=records[0].time[:10])[0].strategy,
+                             records[0].strategy)
+            self.assertEqual(index.query(since="2999-01-01"), [])
+            self.assertEqual(index.summary(self.runs[1].run_folder)["seed"], 2)
+
+    def test_best_per_strategy_and_compare(self):
+        with RunIndex() as index:
+            best = index.best_per_strategy()
+            self.assertEqual([record.strategy for record in best], ["LookaheadStrategy", "ExampleStrategy"])
+            self.assertEqual(best[1].average, max(run.average_score() for run in self.runs[:2]))
+            difference = index.compare(self.runs[2].run_folder, self.runs[0].run_folder)
+            self.assertAlmostEqual(difference["average"], self.runs[2].average_score() - self.runs[0].average_score())
+
+    def test_rebuild_from_folders(self):
+        os.remove(DEFAULT_INDEX_PATH)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            main(["rebuild"])
+            main(["best"])
+        self.assertIn("Indexed 3 runs", output.getvalue())
+        self.assertIn("LookaheadStrategy", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+from yahtzee_simulator.batch_game import BatchGame
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.score_statistics import ScoreStatistics
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.strategies import ExampleBatchStrategy
+
+class TestScoreStatistics(unittest.TestCase):
+    def setUp(self):
+        """Play a batch of games to get realistic category scores."""
+        game = BatchGame(ExampleBatchStrategy(), 1001, np.random.default_rng(5))
+        self.totals = game.play_game()
+        self.category_scores = game.scores
+        self.statistics = ScoreStatistics()
+        self.statistics.add_batch(self.category_scores)
+
+    def test_matches_numpy(self):
+        self.assertAlmostEqual(self.statistics.mean(), float(np.mean(self.totals)))
+        self.assertAlmostEqual(self.statistics.standard_deviation(), float(np.std(self.totals)))
+        self.assertEqual(self.statistics.median(), float(np.median(self.totals)))
+        self.assertEqual(self.statistics.quantile(0.9), float(np.quantile(self.totals, 0.9)))
+        self.assertEqual(self.statistics.best(), int(np.max(self.totals)))
+        self.assertEqual(self.statistics.worst(), int(np.min(self.totals)))
+
+    def test_single_games_and_merge(self):
+        first, second = ScoreStatistics(), ScoreStatistics()
+        for i, scores in enumerate(self.category_scores.tolist()):
+            scorecard = Scorecard()
+            for category, score in zip(Category, scores):
+                # Only the scratched categories matter for the zero counts
+                if score == 0:
+                    scorecard.set_score((0, 0, 0, 0, 0), category)
+            (first if i % 2 else second).add(scorecard)
+        first.merge(second)
+        self.assertEqual(first.count, 1001)
+        np.testing.assert_array_equal(first.category_zeros, self.statistics.category_zeros)
+
+    def test_round_trip(self):
+        copy = ScoreStatistics.from_dict(self.statistics.to_dict())
+        self.assertEqual(copy.to_dict(), self.statistics.to_dict())
+        self.assertEqual(copy.bonus_percentage(), self.statistics.bonus_percentage())
+
+    def test_rates(self):
+        zero_rates = self.statistics.category_zero_rates()
+        fill_rates = self.statistics.category_fill_rates()
+        for category in Category:
+            self.assertAlmostEqual(zero_rates[category] + fill_rates[category], 1.0)
+
+    def test_confidence_intervals(self):
+        low, high = self.statistics.mean_confidence_interval(0.95)
+        half_width = 1.959964 * float(np.std(self.totals, ddof=1)) / np.sqrt(len(self.totals))
+        self.assertAlmostEqual(low, float(np.mean(self.totals)) - half_width, places=4)
+        self.assertAlmostEqual(high, float(np.mean(self.totals)) + half_width, places=4)
+        self.assertLess(self.statistics.mean_confidence_interval(0.5)[1], high)
+
+        low, high = self.statistics.bonus_percentage_confidence_interval()
+        self.assertLessEqual(low, self.statistics.bonus_percentage())
+        self.assertGreaterEqual(high, self.statistics.bonus_percentage())
+        with self.assertRaises(ValueError):
+            self.statistics.mean_confidence_interval(1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
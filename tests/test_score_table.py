@@ -0,0 +1,32 @@
+import unittest
+from itertools import product
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.score_table import ROLLS, SCORE_TABLE, calculate_score, roll_scores
+
+class TestScoreTable(unittest.TestCase):
+    def test_distinct_rolls(self):
+        self.assertEqual(len(ROLLS), 252)
+        self.assertEqual(SCORE_TABLE.shape, (252, 15))
+
+    def test_table_matches_scoring_rules(self):
+        for dice in product(range(1, 7), repeat=5):
+            expected = tuple(calculate_score(dice, cat) for cat in Category)
+            self.assertEqual(roll_scores(dice), expected)
+
+    def test_irregular_dice_fall_back(self):
+        self.assertEqual(roll_scores([6, 6, 6, 6, 6])[list(Category).index(Category.YAHTZEE)], 50)
+        self.assertEqual(sum(roll_scores((0, 0, 0, 0, 0))), 0)
+
+    def test_available_categories_with_scores(self):
+        scorecard = Scorecard()
+        scorecard.set_score((3, 3, 3, 5, 5), Category.FULL_HOUSE)
+        possible = scorecard.get_available_categories_with_scores((5, 3, 5, 3, 3))
+        self.assertNotIn(Category.FULL_HOUSE, possible)
+        self.assertEqual(possible[Category.THREES], 9)
+        self.assertEqual(possible[Category.TWO_PAIR], 16)
+        self.assertNotIn(Category.YAHTZEE, possible)
+
+
+if __name__ == "__main__":
+    unittest.main()
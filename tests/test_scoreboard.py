@@ -1,3 +1,5 @@
+import copy
+import pickle
 import unittest
 from yahtzee_simulator.scorecard import Scorecard
 from yahtzee_simulator.score_category import Category
@@ -81,7 +83,55 @@ class TestScorecard(unittest.TestCase):
         score = self.scorecard.score_for_category(dice, Category.YAHTZEE)
         self.assertEqual(score, 50)
 
-
+    def test_running_totals(self):
+        self.scorecard.set_score((6, 6, 6, 6, 2), Category.SIXES)
+        self.scorecard.set_score((5, 5, 5, 5, 1), Category.FIVES)
+        self.scorecard.set_score((4, 4, 4, 1, 1), Category.FOURS)
+        self.scorecard.set_score((1, 2, 3, 4, 5), Category.SMALL_STRAIGHT)
+        self.assertEqual(self.scorecard.upper_section_score(), 56)
+        self.assertFalse(self.scorecard.has_bonus())
+        self.assertEqual(self.scorecard.total_score(), 71)
+
+        self.scorecard.set_score((3, 3, 3, 1, 1), Category.THREES)
+        self.assertTrue(self.scorecard.has_bonus())
+        self.assertEqual(self.scorecard.total_score(), 130)
+
+    def test_filled_categories(self):
+        self.scorecard.set_score((2, 2, 3, 3, 3), Category.FULL_HOUSE)
+        self.assertEqual(self.scorecard.scores[Category.FULL_HOUSE], 13)
+        self.assertIsNone(self.scorecard.get_score(Category.CHANCE))
+        self.assertNotIn(Category.FULL_HOUSE, self.scorecard.available_categories())
+        self.assertEqual(self.scorecard.filled_mask(), 1 << list(Category).index(Category.FULL_HOUSE))
+        with self.assertRaises(ValueError):
+            self.scorecard.set_score((1, 1, 1, 2, 2), Category.FULL_HOUSE)
+
+        for category in self.scorecard.available_categories():
+            self.scorecard.set_score((1, 1, 1, 1, 1), category)
+        self.assertTrue(self.scorecard.is_complete())
+
+    def test_write_scores(self):
+        self.scorecard.scores[Category.SIXES] = 24
+        self.scorecard.scores[Category.CHANCE] = 20
+        self.assertEqual(self.scorecard.get_score(Category.SIXES), 24)
+        self.assertEqual(self.scorecard.upper_section_score(), 24)
+        self.assertEqual(self.scorecard.total_score(), 44)
+        self.scorecard.scores[Category.SIXES] = None
+        self.assertIn(Category.SIXES, self.scorecard.available_categories())
+        self.assertEqual(self.scorecard.total_score(), 20)
+
+        self.scorecard.scores = {category: 1 for category in Category}
+        self.assertTrue(self.scorecard.is_complete())
+        self.assertEqual(dict(self.scorecard.scores), {category: 1 for category in Category})
+        with self.assertRaises(KeyError):
+            self.scorecard.scores["Chance"] = 1
+
+    def test_pickle_and_copy(self):
+        self.scorecard.set_score((6, 6, 6, 2, 2), Category.SIXES)
+        for copied in (pickle.loads(pickle.dumps(self.scorecard)), copy.deepcopy(self.scorecard)):
+            self.assertEqual(copied.category_scores(), self.scorecard.category_scores())
+            self.assertEqual(copied.scores[Category.SIXES], 18)
+            copied.set_score((1, 1, 1, 1, 1), Category.YAHTZEE)
+            self.assertIsNone(self.scorecard.scores[Category.YAHTZEE])
 
 
 if __name__ == "__main__":
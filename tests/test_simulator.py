@@ -0,0 +1,220 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from yahtzee_simulator.dice_source import NumpyDiceSource
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.simulator import Simulator
+from yahtzee_simulator.strategies import ExampleStrategy
+
+class UnpicklableStrategy(ExampleStrategy):
+    def __init__(self):
+        self.key = lambda cat: cat.max_score
+
+class CrashingStrategy(ExampleStrategy):
+    """Fails in the middle of a run, after a given number of games."""
+    def __init__(self, games):
+        self.turns_left = games * len(Category) + 7
+
+    def choose_category(self, dice, scorecard):
+        self.turns_left -= 1
+        if self.turns_left < 0:
+            raise RuntimeError("Simulated crash")
+        return super().choose_category(dice, scorecard)
+
+class TestSimulator(unittest.TestCase):
+    def setUp(self):
+        """Run every simulation inside a temporary results directory."""
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def run_quietly(self, simulator: Simulator) -> Simulator:
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulator.run()
+        simulator.wait_for_plots()
+        return simulator
+
+    def test_seeded_runs_match_across_workers(self):
+        single = self.run_quietly(Simulator(ExampleStrategy(), 40, seed=11))
+        pooled = self.run_quietly(Simulator(ExampleStrategy(), 40, workers=2, seed=11))
+        np.testing.assert_array_equal(single.scores, pooled.scores)
+        self.assertEqual(single.get_bonus_percentage(), pooled.get_bonus_percentage())
+
+    def test_numpy_dice_runs_match_across_workers(self):
+        single = self.run_quietly(Simulator(ExampleStrategy(), 30, seed=4, dice_source=NumpyDiceSource))
+        pooled = self.run_quietly(Simulator(ExampleStrategy(), 30, workers=3, seed=4, dice_source=NumpyDiceSource))
+        np.testing.assert_array_equal(single.scores, pooled.scores)
+
+    def test_statistics_without_scorecards(self):
+        kept = self.run_quietly(Simulator(ExampleStrategy(), 25, seed=2))
+        streamed = self.run_quietly(Simulator(ExampleStrategy(), 25, workers=2, seed=2, keep_scorecards=False))
+        self.assertEqual(streamed.game_scorecards, [])
+        self.assertEqual(streamed.average_score(), float(np.mean(kept.scores)))
+        self.assertEqual(streamed.median_score(), float(np.median(kept.scores)))
+        self.assertEqual(streamed.get_bonus_percentage(), kept.get_bonus_percentage())
+
+    def test_load_results(self):
+        simulator = self.run_quietly(Simulator(ExampleStrategy(), 30, workers=2, seed=6, keep_scorecards=False))
+        results = Simulator.load_results(simulator.run_folder)
+        self.assertEqual(len(results), 30)
+        self.assertEqual(float(np.mean(results.totals)), simulator.average_score())
+        self.assertEqual(int(np.count_nonzero(results.category_column(Category.YAHTZEE))),
+                         simulator.statistics.count - simulator.statistics.category_zeros[-1])
+
+        serial = self.run_quietly(Simulator(ExampleStrategy(), 30, seed=6))
+        self.assertNotEqual(serial.run_folder, simulator.run_folder)
+        np.testing.assert_array_equal(Simulator.load_results(serial.run_folder).category_scores,
+                                      results.category_scores)
+        self.assertEqual(results.category_scores[0].tolist(), serial.game_scorecards[0].category_scores())
+
+    def test_plots_are_optional(self):
+        plotted = self.run_quietly(Simulator(ExampleStrategy(), 10, seed=3))
+        self.assertTrue(os.path.exists(os.path.join(plotted.run_folder, "histogram.png")))
+        self.assertTrue(os.path.exists(os.path.join(plotted.run_folder, "upper_section_histogram.png")))
+
+        headless = self.run_quietly(Simulator(ExampleStrategy(), 10, seed=3, save_plots=False))
+        self.assertFalse(os.path.exists(os.path.join(headless.run_folder, "histogram.png")))
+
+    def test_profiling(self):
+        plain = self.run_quietly(Simulator(ExampleStrategy(), 20, seed=8, save_plots=False))
+        self.assertIsNone(plain.profile_stats)
+
+        profiled = self.run_quietly(Simulator(ExampleStrategy(), 20, workers=2, seed=8, save_plots=False, profile=True))
+        np.testing.assert_array_equal(plain.scores, profiled.scores)
+        sections = profiled.profile_stats.sections
+        turns = 20 * len(Category)
+        self.assertEqual(sections["turn"].count, turns)
+        self.assertEqual(sections["set_score"].count, turns)
+        self.assertEqual(sections["choose_category"].count, turns)
+        # ExampleStrategy always rolls three times
+        self.assertEqual(sections["choose_dice_to_keep"].count, 2 * turns)
+        self.assertEqual(sections["roll_dice"].count, 3 * turns)
+        self.assertEqual(sum(sections["turn"].buckets), turns)
+
+        with open(os.path.join(profiled.run_folder, "summary.json")) as f:
+            summary = json.load(f)
+        self.assertEqual(summary["profile"]["sections"]["turn"]["count"], turns)
+
+    def test_stops_at_requested_precision(self):
+        single = self.run_quietly(Simulator(ExampleStrategy(), 5000, seed=9, save_plots=False,
+                                            precision=2.0, check_every=100))
+        self.assertEqual(single.stop_reason, "precision")
+        self.assertLess(single.number_of_games, 5000)
+        self.assertEqual(single.number_of_games % 100, 0)
+        self.assertEqual(len(single.scores), single.number_of_games)
+        low, high = single.average_score_confidence_interval()
+        self.assertLessEqual((high - low) / 2, 2.0)
+
+        pooled = self.run_quietly(Simulator(ExampleStrategy(), 5000, workers=2, seed=9, save_plots=False,
+                                            precision=2.0, check_every=100))
+        self.assertEqual(pooled.number_of_games, single.number_of_games)
+        self.assertEqual(pooled.average_score(), single.average_score())
+        self.assertEqual(len(Simulator.load_results(pooled.run_folder)), pooled.number_of_games)
+
+        with open(os.path.join(single.run_folder, "summary.json")) as f:
+            summary = json.load(f)
+        self.assertEqual(summary["stop_reason"], "precision")
+        self.assertEqual(summary["number_of_games"], single.number_of_games)
+        self.assertAlmostEqual(summary["average_ci"][0], low)
+
+    def test_unreachable_precision_plays_every_game(self):
+        simulator = self.run_quietly(Simulator(ExampleStrategy(), 50, seed=9, save_plots=False,
+                                               precision=0.01, bonus_precision=0.01, check_every=10))
+        self.assertEqual(simulator.stop_reason, "number_of_games")
+        self.assertEqual(simulator.number_of_games, 50)
+        with self.assertRaises(ValueError):
+            Simulator(ExampleStrategy(), 50, precision=1.0, check_every=0)
+
+    def test_resume_after_crash(self):
+        complete = self.run_quietly(Simulator(ExampleStrategy(), 60, seed=12, save_plots=False))
+
+        crashed = Simulator(CrashingStrategy(37), 60, seed=12, save_plots=False, checkpoint_every=10)
+        with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(RuntimeError):
+            crashed.run()
+        # Games after the last checkpoint were written but will be played again
+        self.assertEqual(len(Simulator.load_results(crashed.run_folder)), 37)
+
+        with self.assertRaises(ValueError):
+            Simulator(ExampleStrategy(), 60, resume=crashed.run_folder).run()
+        with self.assertRaises(ValueError):
+            Simulator(CrashingStrategy(60), 60, seed=13, resume=crashed.run_folder).run()
+
+        with self.assertRaises(ValueError):
+            Simulator(ExampleStrategy(), 60, resume=complete.run_folder)  # Has no checkpoint
+
+        # Without new checkpoints, both resumes continue from game 30
+        for workers in (None, 3):
+            resumed = self.run_quietly(Simulator(CrashingStrategy(60), 60, workers=workers, save_plots=False,
+                                                 resume=crashed.run_folder))
+            self.assertEqual(resumed.run_folder, crashed.run_folder)
+            self.assertEqual(resumed.seed, 12)
+            np.testing.assert_array_equal(resumed.scores, complete.scores)
+            self.assertEqual(resumed.statistics.to_dict(), complete.statistics.to_dict())
+            np.testing.assert_array_equal(Simulator.load_results(resumed.run_folder).category_scores,
+                                          Simulator.load_results(complete.run_folder).category_scores)
+
+    def test_finished_runs_are_not_resumed(self):
+        stopped = self.run_quietly(Simulator(ExampleStrategy(), 5000, seed=9, save_plots=False, precision=2.0,
+                                             check_every=100, checkpoint_every=100))
+        self.assertEqual(stopped.stop_reason, "precision")
+        with self.assertRaises(ValueError):
+            Simulator(ExampleStrategy(), 5000, save_plots=False, precision=2.0, check_every=100,
+                      resume=stopped.run_folder).run()
+        self.assertEqual(len(Simulator.load_results(stopped.run_folder)), stopped.number_of_games)
+
+    def test_resume_profiled_run(self):
+        crashed = Simulator(CrashingStrategy(25), 40, seed=12, save_plots=False, profile=True, checkpoint_every=10)
+        with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(RuntimeError):
+            crashed.run()
+        resumed = self.run_quietly(Simulator(CrashingStrategy(40), 40, save_plots=False, profile=True,
+                                             resume=crashed.run_folder))
+        # The games played again after the last checkpoint are only counted once
+        self.assertEqual(resumed.profile_stats.sections["turn"].count, 40 * len(Category))
+        self.assertEqual(resumed.profile_stats.sections["set_score"].count, 40 * len(Category))
+
+    def test_unpicklable_strategy_runs_in_one_process(self):
+        with self.assertWarns(UserWarning):
+            simulator = self.run_quietly(Simulator(UnpicklableStrategy(), 5, workers=2, seed=1))
+        self.assertEqual(len(simulator.game_scorecards), 5)
+
+    def test_replay_games(self):
+        simulator = self.run_quietly(Simulator(ExampleStrategy(), 200, workers=2, save_plots=False))
+        self.assertIsNotNone(simulator.seed)
+        worst, best = simulator.extreme_games(0.01)
+        self.assertEqual(len(worst), 2)
+        self.assertEqual(simulator.scores[worst[0]], simulator.worst_score())
+        self.assertEqual(simulator.scores[best[0]], simulator.best_score())
+        for index in worst + best:
+            game = simulator.replay(index)
+            self.assertEqual(game.scorecard.category_scores(), simulator.game_scorecards[index].category_scores())
+            self.assertEqual(len(game.history), len(Category))
+
+        # Games of a saved run replay from its folder too
+        streamed = self.run_quietly(Simulator(ExampleStrategy(), 50, seed=5, dice_source=NumpyDiceSource,
+                                              keep_scorecards=False, save_plots=False))
+        loaded = Simulator.from_run_folder(streamed.run_folder, ExampleStrategy())
+        _, (best_index,) = loaded.extreme_games(0.001)
+        self.assertEqual(loaded.replay(best_index).scorecard.total_score(), streamed.best_score())
+        with self.assertRaises(IndexError):
+            loaded.replay(50)
+
+        # Custom dice sources cannot be looked up by name and are passed in
+        custom = self.run_quietly(Simulator(ExampleStrategy(), 20, seed=5, keep_scorecards=False, save_plots=False,
+                                            dice_source=lambda seed: NumpyDiceSource(seed)))
+        with self.assertRaises(ValueError):
+            Simulator.from_run_folder(custom.run_folder, ExampleStrategy())
+        loaded = Simulator.from_run_folder(custom.run_folder, ExampleStrategy(), dice_source=NumpyDiceSource)
+        _, (best_index,) = loaded.extreme_games(0.001)
+        self.assertEqual(loaded.replay(best_index).scorecard.total_score(), custom.best_score())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import pickle
+import random
+import unittest
+import numpy as np
+from yahtzee_simulator.game import Game
+from yahtzee_simulator.keep_table import KEEPS
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.score_table import CATEGORY_INDEX
+from yahtzee_simulator.strategies import LookaheadStrategy
+from yahtzee_simulator.strategy_helpers import (
+    best_keeps, expected_category_score, expected_category_scores, keep_values, outcome_distribution,
+    possible_keeps, probability_of_target,
+)
+
+class TestStrategyHelpers(unittest.TestCase):
+    def test_outcome_distribution(self):
+        outcomes = outcome_distribution((6, 6, 6, 6))
+        self.assertEqual(len(outcomes), 6)
+        self.assertAlmostEqual(outcomes[(6, 6, 6, 6, 6)], 1 / 6)
+        self.assertAlmostEqual(sum(outcome_distribution((2, 1)).values()), 1.0)
+        self.assertEqual(outcome_distribution((3, 1, 2, 5, 4)), {(1, 2, 3, 4, 5): 1.0})
+
+    def test_possible_keeps(self):
+        self.assertEqual(len(possible_keeps((1, 2, 3, 4, 5))), 32)
+        self.assertEqual(possible_keeps((6, 6, 6, 6, 6)), [(6,) * n for n in range(6)])
+
+    def test_expected_scores(self):
+        self.assertAlmostEqual(expected_category_score((6, 6, 6), Category.SIXES), 20.0)
+        self.assertAlmostEqual(expected_category_score((), Category.CHANCE), 17.5)
+        # A second reroll never hurts
+        self.assertTrue(np.all(expected_category_scores(2) >= expected_category_scores(1) - 1e-9))
+
+    def test_probability_of_target(self):
+        self.assertAlmostEqual(probability_of_target((), Category.YAHTZEE, 50), 6 / 6 ** 5)
+        self.assertAlmostEqual(probability_of_target((4, 4, 4, 4), Category.YAHTZEE, 50), 1 / 6)
+        # Chance of a Yahtzee within two rolls when keeping the most common value in between
+        self.assertAlmostEqual(probability_of_target((), Category.YAHTZEE, 50, rerolls=2), 0.0126315, places=6)
+        with self.assertRaises(ValueError):
+            keep_values(np.zeros(252), rerolls=0)
+
+    def test_best_keeps(self):
+        # With every keep worth the same, every roll keeps all of its dice
+        keeps = best_keeps(np.zeros(len(KEEPS)))
+        self.assertEqual([len(KEEPS[k]) for k in keeps], [5] * 252)
+        keeps = best_keeps(expected_category_scores()[:, CATEGORY_INDEX[Category.SIXES]])
+        self.assertEqual(KEEPS[keeps[0]], ())  # Rolling (1, 1, 1, 1, 1) keeps nothing for sixes
+
+    def test_lookahead_strategy_plays(self):
+        random.seed(5)
+        strategy = LookaheadStrategy()
+        game = Game(strategy)
+        game.play_game()
+        self.assertTrue(game.scorecard.is_complete())
+        # Planned turns stay with the instance and are not pickled
+        self.assertEqual(len(strategy._plans), len(Category))
+        self.assertEqual(pickle.loads(pickle.dumps(strategy))._plans, {})
+        self.assertEqual(LookaheadStrategy()._plans, {})
+
+        capped = LookaheadStrategy(max_plans=4)
+        random.seed(5)
+        Game(capped).play_game()
+        self.assertEqual(len(capped._plans), 4)
+        self.assertEqual(pickle.loads(pickle.dumps(capped)).max_plans, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from collections import Counter
+from yahtzee_simulator.strategy import Strategy
+from yahtzee_simulator.strategy_helpers import get_least_worth_category_left
+from yahtzee_simulator.sweep import Sweep, grid_search, random_search
+
+class RerollStrategy(Strategy):
+    """Keeps the most common value, rerolling up to `rerolls` times."""
+    def __init__(self, rerolls: int, low_threshold: int = 0) -> None:
+        self.rerolls = rerolls
+        self.low_threshold = low_threshold
+
+    def should_finish_turn(self, dice, rolls_left, scorecard):
+        return 2 - rolls_left >= self.rerolls
+
+    def choose_dice_to_keep(self, dice, rolls_left, scorecard):
+        value, _ = Counter(dice).most_common(1)[0]
+        return tuple(d for d in dice if d == value)
+
+    def choose_category(self, dice, scorecard):
+        possible = {category: score for category, score in scorecard.get_available_categories_with_scores(dice).items()
+                    if score > self.low_threshold}
+        if possible:
+            return max(possible, key=possible.get)
+        return get_least_worth_category_left(scorecard.available_categories())
+
+class TestSweep(unittest.TestCase):
+    def test_search_spaces(self):
+        grid = grid_search({"rerolls": [0, 1, 2], "low_threshold": [0, 5]})
+        self.assertEqual(len(grid), 6)
+        self.assertIn({"rerolls": 2, "low_threshold": 5}, grid)
+        samples = random_search({"rerolls": [0, 1, 2], "low_threshold": lambda rng: rng.randint(0, 10)}, 5, seed=1)
+        self.assertEqual(samples, random_search({"rerolls": [0, 1, 2],
+                                                 "low_threshold": lambda rng: rng.randint(0, 10)}, 5, seed=1))
+        self.assertTrue(all(0 <= sample["low_threshold"] <= 10 for sample in samples))
+
+    def test_race_drops_bad_configurations(self):
+        sweep = Sweep(RerollStrategy, grid_search({"rerolls": [0, 1, 2]}), max_games=400, initial_games=25,
+                      seed=3).run()
+        self.assertEqual(sweep.best().parameters, {"rerolls": 2})
+        worst = sweep.ranked()[-1]
+        self.assertEqual(worst.parameters, {"rerolls": 0})
+        self.assertEqual(worst.eliminated_in_round, 1)
+        self.assertEqual(worst.games, 25)
+        self.assertLess(sweep.total_games, 3 * 400)
+        # Scores are only kept for the games played, and only while a configuration is in the race
+        for result, totals in zip(sweep.results, sweep.totals):
+            if result.eliminated_in_round is None:
+                self.assertEqual(len(totals), result.games)
+            else:
+                self.assertIsNone(totals)
+
+        pooled = Sweep(RerollStrategy, grid_search({"rerolls": [0, 1, 2]}), max_games=400, initial_games=25,
+                       seed=3, workers=2).run()
+        self.assertEqual([r.parameters for r in pooled.ranked()], [r.parameters for r in sweep.ranked()])
+        self.assertEqual([r.games for r in pooled.ranked()], [r.games for r in sweep.ranked()])
+        self.assertEqual([r.mean() for r in pooled.ranked()], [r.mean() for r in sweep.ranked()])
+
+    def test_save_results(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as folder:
+            os.chdir(folder)
+            try:
+                sweep = Sweep(RerollStrategy, [{"rerolls": 1}, {"rerolls": 2}], max_games=20, initial_games=10,
+                              seed=2).run()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    sweep.print_summary()
+                with open(os.path.join(sweep.save_results(), "summary.json")) as f:
+                    summary = json.load(f)
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(len(summary["ranking"]), 2)
+        self.assertEqual(summary["total_games"], sweep.total_games)
+        self.assertEqual(summary["seed"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from yahtzee_simulator.strategies import ExampleStrategy, LookaheadStrategy
+from yahtzee_simulator.tournament import Tournament
+
+class TestTournament(unittest.TestCase):
+    def test_same_strategy_plays_the_same_games(self):
+        tournament = Tournament([ExampleStrategy(), ExampleStrategy()], 30, seed=4).run()
+        self.assertEqual(list(tournament.strategies), ["ExampleStrategy", "ExampleStrategy_2"])
+        comparison = tournament.compare("ExampleStrategy", "ExampleStrategy_2")
+        self.assertEqual(comparison.mean_difference, 0.0)
+        self.assertFalse(comparison.is_significant())
+
+    def test_paired_comparison(self):
+        strategies = {"lookahead": LookaheadStrategy(), "example": ExampleStrategy()}
+        tournament = Tournament(strategies, 60, seed=1).run()
+        self.assertEqual(tournament.standings(), ["lookahead", "example"])
+        comparison = tournament.comparisons()[0]
+        differences = tournament.totals["lookahead"].astype(float) - tournament.totals["example"]
+        self.assertAlmostEqual(comparison.mean_difference, float(differences.mean()))
+        self.assertTrue(comparison.is_significant())
+        self.assertLess(comparison.low, comparison.mean_difference)
+
+        pooled = Tournament(strategies, 60, seed=1, workers=2).run()
+        np.testing.assert_array_equal(pooled.totals["example"], tournament.totals["example"])
+        np.testing.assert_array_equal(pooled.totals["lookahead"], tournament.totals["lookahead"])
+
+    def test_save_results(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as folder:
+            os.chdir(folder)
+            try:
+                tournament = Tournament([ExampleStrategy(), LookaheadStrategy()], 10, seed=3).run()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    tournament.print_summary()
+                with open(os.path.join(tournament.save_results(), "summary.json")) as f:
+                    summary = json.load(f)
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(summary["standings"][0]["strategy"], "LookaheadStrategy")
+        self.assertEqual(len(summary["comparisons"]), 1)
+        self.assertEqual(summary["seed"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
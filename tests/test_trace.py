@@ -0,0 +1,53 @@
+import io
+import unittest
+from yahtzee_simulator.decision_type import DecisionType
+from yahtzee_simulator.dice_source import RandomDiceSource
+from yahtzee_simulator.game import Game
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.strategies import ExampleStrategy
+from yahtzee_simulator.trace import EventType, GameTrace, read_traces, write_traces
+
+class TestTrace(unittest.TestCase):
+    def test_render_turn(self):
+        trace = GameTrace()
+        trace.roll(1, (2, 2, 3, 5, 2))
+        trace.keep((2, 2, 2))
+        trace.roll(2, (2, 2, 2, 6, 6))
+        trace.choose(DecisionType.FINISH_TURN, Category.FULL_HOUSE)
+        [turn] = trace.turns()
+        self.assertEqual(turn[:4], [
+            "Roll number 1: (2, 2, 3, 5, 2)",
+            "Continuing turn, keeping dice: (2, 2, 2)",
+            "Roll number 2: (2, 2, 2, 6, 6)",
+            "Finishing turn, choosing category: Category.FULL_HOUSE",
+        ])
+        self.assertIn("Full House           18", turn[4])
+        decisions = [event.decision() for event in trace.events() if event.type != EventType.ROLL]
+        self.assertEqual([d.type for d in decisions], [DecisionType.KEEP_DICE, DecisionType.FINISH_TURN])
+
+    def test_game_trace_round_trip(self):
+        source = RandomDiceSource(seed=1)
+        games = []
+        for i in range(2):
+            source.start_game(i)
+            game = Game(ExampleStrategy(), source, trace=True)
+            game.play_game()
+            games.append(game)
+        self.assertEqual(len(games[0].history), 15)
+
+        f = io.BytesIO()
+        write_traces(f, [game.trace for game in games])
+        f.seek(0)
+        traces = read_traces(f)
+        self.assertEqual([trace.turns() for trace in traces], [game.history for game in games])
+        self.assertEqual(traces[1].turns()[-1][-1], f"Current scorecard:\n {games[1].scorecard}")
+
+    def test_no_trace_by_default(self):
+        game = Game(ExampleStrategy())
+        game.play_game()
+        self.assertIsNone(game.trace)
+        self.assertEqual(game.history, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
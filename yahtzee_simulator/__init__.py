@@ -1,9 +1,16 @@
 from .simulator import Simulator
+from .tournament import Tournament
+from .sweep import Sweep, grid_search, random_search
 from .game import Game
 from .scorecard import Scorecard
 from .score_category import Category, Dice
 from .strategy_helpers import *
 from .strategy import Strategy
+from .cached_strategy import CachedStrategy
+from .exact_evaluator import evaluate_strategy
+from .batch_game import BatchGame
+from .batch_simulator import BatchSimulator
+from .batch_strategy import BatchStrategy
 
 # Optional: version
 __version__ = "0.1.0"
\ No newline at end of file
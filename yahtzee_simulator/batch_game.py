@@ -0,0 +1,68 @@
+from typing import Optional
+
+import numpy as np
+
+from yahtzee_simulator.batch_strategy import BatchStrategy
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.score_table import SCORE_TABLE, roll_indices, total_scores
+
+
+class BatchGame:
+    """Plays a batch of games in lockstep, one turn at a time across all games."""
+
+    def __init__(self, strategy: BatchStrategy, number_of_games: int,
+                 rng: Optional[np.random.Generator] = None) -> None:
+        self.strategy = strategy
+        self.number_of_games = number_of_games
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.dice = np.zeros((number_of_games, 5), dtype=np.int8)
+        self.rolls_left = np.zeros(number_of_games, dtype=np.int8)
+        # Score per game and category, -1 while the category is unfilled
+        self.scores = np.full((number_of_games, len(Category)), -1, dtype=np.int16)
+
+    def roll_dice(self, games: np.ndarray, keep: np.ndarray) -> None:
+        """Reroll the dice not kept in the given games."""
+        new_dice = self.rng.integers(1, 7, size=(len(games), 5), dtype=np.int8)
+        self.dice[games] = np.where(keep, self.dice[games], new_dice)
+        self.rolls_left[games] -= 1
+
+    def play_turn(self) -> None:
+        all_games = np.arange(self.number_of_games)
+        self.rolls_left[:] = 3
+        self.roll_dice(all_games, np.zeros((self.number_of_games, 5), dtype=bool))
+        active = all_games
+        # Games that finish early keep their dice until every game is done rolling
+        while len(active) > 0 and self.rolls_left[active[0]] > 0:
+            finish = np.asarray(self.strategy.should_finish_turn(
+                self.dice[active], self.rolls_left[active], self.scores[active]), dtype=bool)
+            active = active[~finish]
+            if len(active) == 0:
+                break
+            keep = np.asarray(self.strategy.choose_dice_to_keep(
+                self.dice[active], self.rolls_left[active], self.scores[active]), dtype=bool)
+            self.roll_dice(active, keep)
+        categories = np.asarray(self.strategy.choose_category(self.dice, self.scores), dtype=np.intp)
+        self.set_scores(categories)
+
+    def set_scores(self, categories: np.ndarray) -> None:
+        """Fill the chosen category of every game with the score of its current dice."""
+        games = np.arange(self.number_of_games)
+        if np.any(self.scores[games, categories] >= 0):
+            raise ValueError("Category already filled.")
+        self.scores[games, categories] = SCORE_TABLE[roll_indices(self.dice), categories]
+
+    def play_game(self) -> np.ndarray:
+        for turn in Category:
+            self.play_turn()
+        return self.total_scores()
+
+    def upper_section_scores(self) -> np.ndarray:
+        """Return the upper section subtotal of every game."""
+        return np.maximum(self.scores[:, :6], 0).sum(axis=1)
+
+    def has_bonus(self) -> np.ndarray:
+        return self.upper_section_scores() >= 63
+
+    def total_scores(self) -> np.ndarray:
+        """Return the total score of every game including the upper section bonus."""
+        return total_scores(self.scores)
@@ -0,0 +1,55 @@
+from yahtzee_simulator.batch_game import BatchGame
+from yahtzee_simulator.batch_strategy import BatchStrategy
+from yahtzee_simulator.score_statistics import ScoreStatistics
+
+import numpy as np
+
+from typing import Optional
+
+
+class BatchSimulator:
+    """Simulates games with a `BatchStrategy`, playing `batch_size` games in lockstep at a time."""
+
+    def __init__(self, strategy: BatchStrategy, number_of_games: int, batch_size: int = 100_000,
+                 seed: Optional[int] = None) -> None:
+        self.strategy = strategy
+        self.number_of_games = number_of_games
+        self.batch_size = batch_size
+        self.seed = seed
+
+        self.statistics = ScoreStatistics()
+
+    def run(self):
+        rng = np.random.default_rng(self.seed)
+        for start in range(0, self.number_of_games, self.batch_size):
+            count = min(self.batch_size, self.number_of_games - start)
+            print(f"Simulating games {start + count} / {self.number_of_games}", end="\r")
+            game = BatchGame(self.strategy, count, rng)
+            game.play_game()
+            self.statistics.add_batch(game.scores)
+        print()
+
+    def average_score(self) -> float:
+        return self.statistics.mean()
+
+    def median_score(self) -> float:
+        return self.statistics.median()
+
+    def best_score(self) -> int:
+        return self.statistics.best()
+
+    def worst_score(self) -> int:
+        return self.statistics.worst()
+
+    def standard_deviation(self) -> float:
+        return self.statistics.standard_deviation()
+
+    def get_bonus_percentage(self) -> float:
+        return self.statistics.bonus_percentage()
+
+    def print_summary(self):
+        print(f"Average score over {self.number_of_games} games: {self.average_score()}")
+        print(f"Best score: {self.best_score()}")
+        print(f"Worst score: {self.worst_score()}")
+        print(f"Standard deviation: {self.standard_deviation()}")
+        print(f"Median score: {self.median_score()}")
@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+import numpy as np
+
+class BatchStrategy(ABC):
+    """
+    Abstract base class for strategies that decide for a whole batch of games at once.
+
+    Dice are passed as an (n, 5) array, rolls left as an (n,) array and scores as
+    an (n, 15) array in `Category` order where unfilled categories hold -1.
+    """
+
+    @abstractmethod
+    def should_finish_turn(self, dice: np.ndarray, rolls_left: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """
+        Decide for each game whether to stop rolling and score this turn.
+        Returns an (n,) boolean array.
+        """
+
+    @abstractmethod
+    def choose_dice_to_keep(self, dice: np.ndarray, rolls_left: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """
+        Decide which dice to keep in each game if rolling again.
+        Returns an (n, 5) boolean mask, True for the dice to keep.
+        """
+
+    @abstractmethod
+    def choose_category(self, dice: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """
+        Decide which category to fill in each game.
+        Returns an (n,) array of category indices in `Category` order.
+        """
@@ -0,0 +1,140 @@
+import os
+import pickle
+from collections import OrderedDict
+from typing import Dict, Hashable, NamedTuple, Optional
+
+from yahtzee_simulator.atomic_file import atomic_write
+from yahtzee_simulator.score_category import Category, Dice
+from yahtzee_simulator.score_table import ROLL_INDEX
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.strategy import Strategy
+
+# Decision kinds, the lowest bits of a cache key
+_FINISH_TURN = 0
+_KEEP_DICE = 1
+_CHOOSE_CATEGORY = 2
+
+
+def state_key(dice: Dice, rolls_left: int, scorecard: Scorecard) -> int:
+    """
+    Return the canonical signature of a decision state packed into an int.
+
+    Two states share a signature when they have the same dice in any order, the same
+    rolls left, the same open categories and the same upper subtotal.
+    """
+    roll = ROLL_INDEX.get(dice)
+    if roll is None:
+        roll = ROLL_INDEX[tuple(sorted(dice))]
+    return ((scorecard.filled_mask() << 7 | scorecard.upper_section_score()) << 8 | roll) << 2 | rolls_left
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class CachedStrategy(Strategy):
+    """
+    Remembers the decisions of an expensive strategy, so it is only asked once per state.
+
+    Decisions are keyed on `state_key`, so the wrapped strategy must decide from the sorted
+    dice, the rolls left, the open categories and the upper subtotal alone. The least
+    recently used decisions are evicted once `maxsize` are cached. With a `path` the cache
+    is loaded from it if it exists, and `save` writes it back for the next run. Pickled
+    copies, like those of worker processes, start from the cache saved at `path`.
+    """
+
+    def __init__(self, strategy: Strategy, maxsize: int = 1 << 20, path: Optional[str] = None) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.strategy = strategy
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache: "OrderedDict[int, Hashable]" = OrderedDict()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __getstate__(self) -> Dict:
+        # Worker processes start from the saved cache at `path` instead of receiving a copy
+        return {"strategy": self.strategy, "maxsize": self.maxsize, "path": self.path}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(state["strategy"], state["maxsize"], state["path"])
+
+    def _lookup(self, key: int):
+        cache = self._cache
+        try:
+            value = cache[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        cache.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _store(self, key: int, value) -> None:
+        cache = self._cache
+        cache[key] = value
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+            self.evictions += 1
+
+    def should_finish_turn(self, dice: Dice, rolls_left: int, scorecard: Scorecard) -> bool:
+        key = state_key(dice, rolls_left, scorecard) << 2 | _FINISH_TURN
+        finish = self._lookup(key)
+        if finish is None:
+            finish = self.strategy.should_finish_turn(dice, rolls_left, scorecard)
+            self._store(key, finish)
+        return finish
+
+    def choose_dice_to_keep(self, dice: Dice, rolls_left: int, scorecard: Scorecard) -> tuple[int]:
+        key = state_key(dice, rolls_left, scorecard) << 2 | _KEEP_DICE
+        dice_to_keep = self._lookup(key)
+        if dice_to_keep is None:
+            # Kept dice are values, so the same ones can be kept from the dice in any order
+            dice_to_keep = tuple(self.strategy.choose_dice_to_keep(dice, rolls_left, scorecard))
+            self._store(key, dice_to_keep)
+        return dice_to_keep
+
+    def choose_category(self, dice: Dice, scorecard: Scorecard) -> Category:
+        key = state_key(dice, 0, scorecard) << 2 | _CHOOSE_CATEGORY
+        category = self._lookup(key)
+        if category is None:
+            category = self.strategy.choose_category(dice, scorecard)
+            self._store(key, category)
+        return category
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._cache))
+
+    def cache_clear(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the cached decisions to `path`, or to the path the cache was created with."""
+        path = path if path is not None else self.path
+        if path is None:
+            raise ValueError("No path to save the cache to.")
+        with atomic_write(path) as f:
+            pickle.dump({
+                "strategy": self.strategy.__class__.__name__,
+                "decisions": list(self._cache.items()),
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self, path: str) -> None:
+        """Add the decisions saved at `path` to the cache."""
+        with open(path, "rb") as f:
+            saved = pickle.load(f)
+        if saved["strategy"] != self.strategy.__class__.__name__:
+            raise ValueError(
+                f"{path} holds decisions of {saved['strategy']}, not {self.strategy.__class__.__name__}"
+            )
+        for key, value in saved["decisions"]:
+            self._store(key, value)
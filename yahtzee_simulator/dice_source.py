@@ -0,0 +1,140 @@
+from abc import ABC, abstractmethod
+from random import Random, randint
+from typing import List, Optional
+
+import numpy as np
+
+from yahtzee_simulator.seeding import game_seed, new_seed
+
+
+class DiceSource(ABC):
+    """Where a `Game` gets its dice from."""
+
+    seed: Optional[int] = None
+
+    def start_game(self, game_index: int) -> None:
+        """Move to the dice of the given game in a run. Sources without per-game streams ignore this."""
+
+    def start_turn(self) -> None:
+        """Called by `Game` at the start of every turn. Sources without per-turn dice ignore this."""
+
+    @abstractmethod
+    def roll(self, number_of_dice: int) -> tuple[int, ...]:
+        """Return the values of the given number of newly rolled dice."""
+
+
+class RandomDiceSource(DiceSource):
+    """
+    Dice from Python's `random` module.
+
+    Without a seed the global generator is used, as a plain `Game` always has. With a
+    seed every game of the run gets its own generator state, derived from the seed and
+    the game's index.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.seed = seed
+        self._rng = Random() if seed is not None else None
+        self._randint = self._rng.randint if self._rng is not None else randint
+
+    def start_game(self, game_index: int) -> None:
+        if self._rng is not None:
+            self._rng.seed(game_seed(self.seed, game_index))
+
+    def roll(self, number_of_dice: int) -> tuple[int, ...]:
+        randint = self._randint
+        return tuple(randint(1, 6) for _ in range(number_of_dice))
+
+
+class NumpyDiceSource(DiceSource):
+    """
+    Dice generated in bulk with NumPy and handed out from a buffer.
+
+    Every game owns a fixed block of `DICE_PER_GAME` dice, enough for any game, and the
+    blocks of `games_per_buffer` consecutive games are generated at once from a stream
+    seeded by the run seed and the buffer number. A game's dice therefore only depend on
+    the seed and its index. Without `start_game` calls the dice are handed out as one
+    continuous stream.
+
+    A buffer is only generated up to the games asked for so far, and regenerated larger
+    when a later game is asked for, so short runs and replays of single games stay cheap.
+    The dice are the same as when generating the whole buffer at once.
+    """
+
+    DICE_PER_GAME = 15 * 3 * 5  # 15 turns of at most three rolls of five dice
+
+    def __init__(self, seed: Optional[int] = None, games_per_buffer: int = 4096) -> None:
+        self.seed = seed if seed is not None else new_seed()
+        self.games_per_buffer = games_per_buffer
+        self._buffer_number = -1
+        # Games of the current buffer generated so far
+        self._games = 0
+        self._dice: List[int] = []
+        self._position = 0
+
+    def _fill(self, buffer_number: int, games: int) -> None:
+        """Generate the first `games` games of a buffer."""
+        rng = np.random.default_rng([self.seed, buffer_number])
+        # The dice of a smaller buffer are the start of those of a larger one
+        size = games * self.DICE_PER_GAME
+        # Python ints are much faster to slice into tuples than NumPy scalars
+        self._dice = rng.integers(1, 7, size=size, dtype=np.int8).tolist()
+        self._buffer_number = buffer_number
+        self._games = games
+
+    def _grow(self, games: int) -> None:
+        """Generate at least `games` games of the current buffer, and at least 4 times as many as before."""
+        self._fill(self._buffer_number, min(self.games_per_buffer, max(games, 4 * self._games)))
+
+    def start_game(self, game_index: int) -> None:
+        buffer_number, offset = divmod(game_index, self.games_per_buffer)
+        if buffer_number != self._buffer_number:
+            self._fill(buffer_number, offset + 1)
+        elif offset >= self._games:
+            self._grow(offset + 1)
+        self._position = offset * self.DICE_PER_GAME
+
+    def roll(self, number_of_dice: int) -> tuple[int, ...]:
+        position = self._position
+        if position + number_of_dice > len(self._dice):
+            if self._buffer_number >= 0 and self._games < self.games_per_buffer:
+                self._grow(self._games + 1)
+            else:
+                self._fill(self._buffer_number + 1, 1)
+                position = 0
+        self._position = position + number_of_dice
+        return tuple(self._dice[position:position + number_of_dice])
+
+
+class AlignedDiceSource(NumpyDiceSource):
+    """
+    NumPy dice laid out by turn and roll, for comparing strategies with common random numbers.
+
+    Every roll of every turn has five dice of its own in the game's block, and rolling
+    fewer dice takes the first of them. Strategies playing the same game therefore get the
+    same dice in the same roll of the same turn, whatever they kept before. Without
+    `start_game` calls every 15 turns move on to the next game.
+    """
+
+    def __init__(self, seed: Optional[int] = None, games_per_buffer: int = 4096) -> None:
+        super().__init__(seed, games_per_buffer)
+        self._game_index = -1
+        self._game_start = 0
+        self._turn = 0
+
+    def start_game(self, game_index: int) -> None:
+        super().start_game(game_index)
+        self._game_index = game_index
+        self._game_start = self._position
+        self._turn = -1
+
+    def start_turn(self) -> None:
+        if self._game_index < 0 or self._turn >= 14:
+            self.start_game(self._game_index + 1)
+        self._turn += 1
+        self._position = self._game_start + self._turn * 15
+
+    def roll(self, number_of_dice: int) -> tuple[int, ...]:
+        position = self._position
+        self._position = position + 5
+        return tuple(self._dice[position:position + number_of_dice])
@@ -0,0 +1,262 @@
+"""
+Runs spread over several machines: a coordinator hands out shards of games to workers over TCP.
+
+Every worker plays the games of a shard with per-game seeds, exactly like a local run
+would, and sends back only the `ScoreStatistics` of the shard. The coordinator merges
+them, so the summary is the same as a single-process run with the same seed. Shards of
+workers that disconnect or time out are handed to another worker.
+
+    python -m yahtzee_simulator.distributed coordinate --port 8700 --games 100000000 --seed 1 \\
+        --strategy yahtzee_simulator.strategies:OptimalStrategy
+    python -m yahtzee_simulator.distributed work --host coordinator --port 8700 --processes 8 \\
+        --strategy yahtzee_simulator.strategies:OptimalStrategy
+
+The protocol is newline-delimited JSON. A worker says hello with the names of its strategy
+and dice source, then receives `shard` messages and answers each with a `result`, until
+it receives `done`.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import multiprocessing
+import socket
+import sys
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from yahtzee_simulator import dice_source as dice_sources
+from yahtzee_simulator.dice_source import RandomDiceSource
+from yahtzee_simulator.score_statistics import ScoreStatistics
+from yahtzee_simulator.seeding import new_seed
+from yahtzee_simulator.simulator import DiceSourceFactory, Simulator, simulate_games
+from yahtzee_simulator.strategy import Strategy
+
+Address = Tuple[str, int]
+
+# Longest message line, a shard result holds a few histograms
+_LINE_LIMIT = 1 << 22
+
+# Seconds a worker may take for a shard before it goes to another worker
+DEFAULT_SHARD_TIMEOUT = 3600.0
+
+# TCP keepalive: probe an idle connection after a minute, give up after six unanswered probes
+_KEEPALIVE_OPTIONS = (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 6))
+
+
+def _enable_keepalive(sock: socket.socket) -> None:
+    """Make a connection to a host that died without closing it fail instead of hanging."""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    for name, value in _KEEPALIVE_OPTIONS:
+        # Not every platform can tune the probes
+        if hasattr(socket, name):
+            sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, name), value)
+
+
+def _factory_name(dice_source: DiceSourceFactory) -> str:
+    return getattr(dice_source, "__name__", dice_source.__class__.__name__)
+
+
+class Coordinator:
+    """Hands out the shards of a seeded run to workers and merges their statistics."""
+
+    def __init__(self, number_of_games: int, seed: int, strategy_name: str, dice_source_name: str,
+                 shard_size: int = 100_000, shard_timeout: Optional[float] = DEFAULT_SHARD_TIMEOUT) -> None:
+        self.number_of_games = number_of_games
+        self.seed = seed
+        self.strategy_name = strategy_name
+        self.dice_source_name = dice_source_name
+        self.shard_timeout = shard_timeout
+        self.address: Optional[Address] = None
+        # Shard start -> number of games
+        self.shards: Dict[int, int] = {
+            start: min(shard_size, number_of_games - start) for start in range(0, number_of_games, shard_size)
+        }
+        self.reassigned = 0
+        self._queue = deque(self.shards)
+        self._results: Dict[int, ScoreStatistics] = {}
+        self._changed: Optional[asyncio.Condition] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, address: Address = ("0.0.0.0", 0)) -> Address:
+        """Start listening for workers and return the address, with the port filled in when it was 0."""
+        self._changed = asyncio.Condition()
+        self._server = await asyncio.start_server(self._handle, *address, limit=_LINE_LIMIT)
+        self.address = self._server.sockets[0].getsockname()[:2]
+        return self.address
+
+    def _finished(self) -> bool:
+        return len(self._results) == len(self.shards)
+
+    async def wait(self) -> ScoreStatistics:
+        """Wait until every shard is done and return the statistics of the whole run."""
+        async with self._changed:
+            await self._changed.wait_for(self._finished)
+        statistics = ScoreStatistics()
+        for start in sorted(self._results):
+            statistics.merge(self._results[start])
+        return statistics
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _next_shard(self) -> Optional[int]:
+        """Return the start of a shard to play, waiting while other workers may still fail theirs."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._queue or self._finished())
+            return self._queue.popleft() if self._queue else None
+
+    async def _requeue(self, start: int) -> None:
+        async with self._changed:
+            self.reassigned += 1
+            self._queue.appendleft(start)
+            self._changed.notify_all()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        start = None
+        try:
+            _enable_keepalive(writer.get_extra_info("socket"))
+            hello = json.loads(await reader.readline())
+            if (hello.get("strategy"), hello.get("dice_source")) != (self.strategy_name, self.dice_source_name):
+                await self._send(writer, {
+                    "type": "error",
+                    "message": f"This run plays {self.strategy_name} with {self.dice_source_name}",
+                })
+                return
+            while (start := await self._next_shard()) is not None:
+                await self._send(writer, {"type": "shard", "start": start, "count": self.shards[start],
+                                          "seed": self.seed})
+                line = await asyncio.wait_for(reader.readline(), self.shard_timeout)
+                if not line:
+                    raise ConnectionError("Worker disconnected")
+                statistics = ScoreStatistics.from_dict(json.loads(line)["statistics"])
+                async with self._changed:
+                    self._results[start] = statistics
+                    self._changed.notify_all()
+                start = None
+            await self._send(writer, {"type": "done"})
+        except Exception:
+            # A worker that dies, hangs or sends garbage only loses its connection
+            pass
+        finally:
+            if start is not None:
+                await self._requeue(start)
+            writer.close()
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, message: dict) -> None:
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+
+
+def run_coordinator(simulator: Simulator, address: Address = ("0.0.0.0", 0), shard_size: int = 100_000,
+                    shard_timeout: Optional[float] = DEFAULT_SHARD_TIMEOUT,
+                    on_listening: Optional[Callable[[Address], None]] = None) -> Simulator:
+    """
+    Play the games of a simulator on workers and save its results as a local run would.
+
+    Only the statistics come back from the workers, so the run folder has no per-game
+    results. `on_listening` is called with the address once workers can connect.
+    """
+    if simulator.seed is None:
+        simulator.seed = new_seed()
+    coordinator = Coordinator(simulator.number_of_games, simulator.seed, simulator.strategy.__class__.__name__,
+                              _factory_name(simulator.dice_source), shard_size, shard_timeout)
+
+    async def coordinate() -> ScoreStatistics:
+        listening = await coordinator.start(address)
+        print(f"Coordinating {simulator.number_of_games} games on {listening}")
+        if on_listening is not None:
+            on_listening(listening)
+        try:
+            return await coordinator.wait()
+        finally:
+            await coordinator.close()
+
+    simulator.stop_reason = "number_of_games"
+    simulator.statistics = asyncio.run(coordinate())
+    simulator.save_results()
+    return simulator
+
+
+def run_worker(address: Address, strategy: Strategy, dice_source: DiceSourceFactory = RandomDiceSource) -> int:
+    """Play shards for the coordinator at `address` until the run is done, and return how many."""
+    shards = 0
+    with socket.create_connection(address) as connection, connection.makefile("rwb") as stream:
+        _enable_keepalive(connection)
+        stream.write(json.dumps({
+            "type": "hello",
+            "strategy": strategy.__class__.__name__,
+            "dice_source": _factory_name(dice_source),
+        }).encode() + b"\n")
+        stream.flush()
+        while line := stream.readline(_LINE_LIMIT):
+            message = json.loads(line)
+            if message["type"] == "done":
+                break
+            if message["type"] == "error":
+                raise ValueError(message["message"])
+            category_scores, _, _ = simulate_games(strategy, message["start"], message["count"], message["seed"],
+                                                   dice_source, keep_scorecards=False)
+            statistics = ScoreStatistics()
+            statistics.add_batch(category_scores)
+            stream.write(json.dumps({
+                "type": "result",
+                "start": message["start"],
+                "statistics": statistics.to_dict(),
+            }).encode() + b"\n")
+            stream.flush()
+            shards += 1
+    return shards
+
+
+def _load_strategy(path: str) -> Strategy:
+    """Create a strategy from a "module:Class" path."""
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)()
+
+
+def _work(host: str, port: int, strategy_path: str, dice_source_name: str) -> None:
+    run_worker((host, port), _load_strategy(strategy_path), getattr(dice_sources, dice_source_name))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Spread a simulation over several machines.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("coordinate", "work"):
+        command = commands.add_parser(name)
+        command.add_argument("--host", default="0.0.0.0" if name == "coordinate" else "127.0.0.1")
+        command.add_argument("--port", type=int, default=8700)
+        command.add_argument("--strategy", default="yahtzee_simulator.strategies:ExampleStrategy",
+                             help="Strategy class as module:Class, created without arguments.")
+        command.add_argument("--dice-source", default="RandomDiceSource",
+                             help="Name of a dice source in yahtzee_simulator.dice_source.")
+        if name == "coordinate":
+            command.add_argument("--games", type=int, required=True)
+            command.add_argument("--seed", type=int)
+            command.add_argument("--shard-size", type=int, default=100_000)
+            command.add_argument("--shard-timeout", type=float, default=DEFAULT_SHARD_TIMEOUT,
+                                 help="Seconds before a shard is reassigned.")
+        else:
+            command.add_argument("--processes", type=int, default=1, help="Worker processes to start.")
+    args = parser.parse_args(argv)
+
+    if args.command == "coordinate":
+        simulator = Simulator(_load_strategy(args.strategy), args.games, seed=args.seed, keep_scorecards=False,
+                              dice_source=getattr(dice_sources, args.dice_source))
+        run_coordinator(simulator, (args.host, args.port), args.shard_size, args.shard_timeout)
+        simulator.print_summary()
+        return 0
+
+    workers = [multiprocessing.Process(target=_work, args=(args.host, args.port, args.strategy, args.dice_source))
+               for _ in range(args.processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Exact evaluation of a strategy, without sampling games.
+
+A turn is a small Markov chain over the 252 sorted rolls and the rolls left: the
+strategy is asked what it does with every roll once, and the keep transition tables
+give the probability of every way the turn can end. Chaining the turns over the
+reachable scorecard states gives the exact expected score and score distribution.
+
+    evaluation = evaluate_strategy(MyStrategy(), signature=Scorecard.filled_mask)
+    print(evaluation.expected_score, evaluation.exact)
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from yahtzee_simulator.keep_table import KEEP_INDEX, KEEP_TRANSITIONS, ROLL_PROBABILITIES
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.score_statistics import MAX_TOTAL_SCORE, ScoreStatistics
+from yahtzee_simulator.score_table import CATEGORIES, CATEGORY_INDEX, ROLLS, SCORE_TABLE
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.seeding import new_seed
+from yahtzee_simulator.strategy import Strategy
+
+UPPER_BONUS_THRESHOLD = 63
+UPPER_BONUS = 50
+
+Signature = Callable[[Scorecard], Hashable]
+
+
+def default_signature(scorecard: Scorecard) -> Hashable:
+    """The filled categories and the upper subtotal up to the bonus, all `OptimalStrategy` decides from."""
+    return scorecard.filled_mask(), min(scorecard.upper_section_score(), UPPER_BONUS_THRESHOLD)
+
+
+@dataclass
+class Evaluation:
+    """The expected result of a strategy, exact unless the state space was too large."""
+    expected_score: float
+    bonus_probability: float
+    # Probability of every final score, indexed by the score. None if it was not tracked.
+    score_distribution: Optional[np.ndarray]
+    exact: bool
+    # States of the chain, or games played when sampling
+    states: int
+    strategy_calls: int
+
+    def standard_deviation(self) -> Optional[float]:
+        if self.score_distribution is None:
+            return None
+        scores = np.arange(len(self.score_distribution))
+        return float(np.sqrt(self.score_distribution @ (scores - self.expected_score) ** 2))
+
+
+class StateSpaceTooLarge(Exception):
+    pass
+
+
+class _TurnPlanner:
+    """Asks the strategy about every roll of a turn from one scorecard."""
+
+    def __init__(self, strategy: Strategy, max_calls: Optional[int] = None) -> None:
+        self.strategy = strategy
+        self.max_calls = max_calls
+        self.calls = 0
+
+    def _keeps(self, rolls_left: int, scorecard: Scorecard, reachable: np.ndarray) -> np.ndarray:
+        """Return the index of the kept dice for every reachable roll, -1 where the turn ends."""
+        strategy = self.strategy
+        keeps = np.full(len(ROLLS), -1)
+        for r in np.flatnonzero(reachable):
+            dice = ROLLS[r]
+            self.calls += 1
+            if not strategy.should_finish_turn(dice, rolls_left, scorecard):
+                self.calls += 1
+                keeps[r] = KEEP_INDEX[tuple(sorted(strategy.choose_dice_to_keep(dice, rolls_left, scorecard)))]
+        return keeps
+
+    def plan(self, scorecard: Scorecard) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the probability of ending the turn with every roll, and the category the
+        strategy fills with it.
+        """
+        if self.max_calls is not None and self.calls >= self.max_calls:
+            raise StateSpaceTooLarge(f"Evaluating the strategy takes more than {self.max_calls} decisions")
+        ending = np.zeros(len(ROLLS))
+        probabilities = ROLL_PROBABILITIES
+        for rolls_left in (2, 1):
+            keeps = self._keeps(rolls_left, scorecard, probabilities > 0)
+            rerolled = keeps >= 0
+            ending += np.where(rerolled, 0.0, probabilities)
+            probabilities = probabilities[rerolled] @ KEEP_TRANSITIONS[keeps[rerolled]]
+        ending += probabilities
+
+        categories = np.full(len(ROLLS), -1)
+        for r in np.flatnonzero(ending > 0):
+            self.calls += 1
+            category = CATEGORY_INDEX[self.strategy.choose_category(ROLLS[r], scorecard)]
+            if scorecard.filled_mask() >> category & 1:
+                raise ValueError(f"Category {CATEGORIES[category]} already filled.")
+            categories[r] = category
+        return ending, categories
+
+
+def _successors(ending: np.ndarray, categories: np.ndarray) -> Dict[Tuple[int, int], float]:
+    """Group the end of a turn into (category, score) outcomes with their probabilities."""
+    rolls = np.flatnonzero(ending > 0)
+    scores = SCORE_TABLE[rolls, categories[rolls]]
+    outcomes: Dict[Tuple[int, int], float] = {}
+    for category, score, probability in zip(categories[rolls].tolist(), scores.tolist(), ending[rolls].tolist()):
+        key = (category, score)
+        outcomes[key] = outcomes.get(key, 0.0) + probability
+    return outcomes
+
+
+def _add_upper_shifted(target: np.ndarray, values: np.ndarray, shift: int) -> None:
+    """Add `values`, indexed by the capped upper subtotal, to `target` after `shift` more upper points."""
+    if shift == 0:
+        target += values
+        return
+    target[shift:-1] += values[:-1 - shift]
+    target[-1] += values[-1 - shift:].sum(axis=0)
+
+
+class _ChainState:
+    """
+    One state of the chain: the filled categories and the strategy's signature, with
+    the probability of every upper subtotal up to the bonus and the points scored so far.
+    """
+
+    __slots__ = ("category_scores", "probability", "points")
+
+    def __init__(self, category_scores: List[int], score_distribution: bool) -> None:
+        # The category scores of one way to reach the state stand in for all of them
+        self.category_scores = category_scores
+        self.probability = np.zeros(UPPER_BONUS_THRESHOLD + 1)
+        # Per upper subtotal the distribution of the points so far, or probability times their mean
+        self.points: Union[Dict[int, np.ndarray], np.ndarray] = (
+            {} if score_distribution else np.zeros(UPPER_BONUS_THRESHOLD + 1)
+        )
+
+
+def evaluate_exactly(strategy: Strategy, signature: Signature = default_signature, max_states: int = 100_000,
+                     max_strategy_calls: Optional[int] = 5_000_000, score_distribution: bool = True,
+                     scorecard: Optional[Scorecard] = None) -> Evaluation:
+    """
+    Compute the expected final score of a strategy from the turn-level Markov chain.
+
+    The chain walks the reachable states turn by turn, a state being the filled
+    categories and the `signature` of the scorecard, with the upper subtotal up to the
+    bonus tracked within it. The strategy is asked about every roll of a turn once per
+    state, so it must decide from the dice in any order and what the signature
+    captures, and the signature after a turn must follow from the one before and the
+    score filled in. A coarser signature means fewer states, e.g. `Scorecard.filled_mask`
+    for strategies that ignore the upper subtotal, like `ExampleStrategy`.
+
+    Raises `StateSpaceTooLarge` as soon as a turn reaches more than `max_states` states,
+    counting every upper subtotal when tracking the score distribution, or the strategy
+    would be asked more than `max_strategy_calls` times. A game asks 15 to 75 times.
+    Start from a partly filled `scorecard` to evaluate the rest of a game.
+    """
+    planner = _TurnPlanner(strategy, max_strategy_calls)
+    length = MAX_TOTAL_SCORE + 1
+    start = scorecard if scorecard is not None else Scorecard()
+    first = _ChainState(start.category_scores(), score_distribution)
+    upper = min(start.upper_section_score(), UPPER_BONUS_THRESHOLD)
+    points = sum(score for score in first.category_scores if score > 0)
+    first.probability[upper] = 1.0
+    if score_distribution:
+        first.points[upper] = _point_mass(points, length)
+    else:
+        first.points[upper] = points
+    states: Dict[tuple, _ChainState] = {(start.filled_mask(), signature(start)): first}
+    total_states = 1
+    for turn in range(start.filled_mask().bit_count(), len(Category)):
+        next_states: Dict[tuple, _ChainState] = {}
+        reached = 0
+        for (mask, _), state in states.items():
+            outcomes = _successors(*planner.plan(Scorecard.from_category_scores(state.category_scores)))
+            for (category, score), outcome_probability in outcomes.items():
+                next_scores = list(state.category_scores)
+                next_scores[category] = score
+                next_key = (mask | 1 << category, signature(Scorecard.from_category_scores(next_scores)))
+                next_state = next_states.get(next_key)
+                if next_state is None:
+                    reached += 1
+                    next_state = next_states[next_key] = _ChainState(next_scores, score_distribution)
+                shift = score if category < 6 else 0
+                _add_upper_shifted(next_state.probability, outcome_probability * state.probability, shift)
+                if score_distribution:
+                    for upper, distribution in state.points.items():
+                        next_upper = min(upper + shift, UPPER_BONUS_THRESHOLD)
+                        row = next_state.points.get(next_upper)
+                        if row is None:
+                            reached += 1
+                            row = next_state.points[next_upper] = np.zeros(length)
+                        row[score:] += outcome_probability * distribution[:length - score]
+                else:
+                    _add_upper_shifted(next_state.points,
+                                       outcome_probability * (state.points + score * state.probability), shift)
+                if reached > max_states:
+                    raise StateSpaceTooLarge(f"Turn {turn + 1} reaches more than {max_states} states")
+        states = next_states
+        total_states += reached
+
+    bonus = sum(float(state.probability[UPPER_BONUS_THRESHOLD]) for state in states.values())
+    if not score_distribution:
+        expected = sum(float(state.points.sum()) for state in states.values()) + UPPER_BONUS * bonus
+        return Evaluation(expected, bonus, None, True, total_states, planner.calls)
+    distribution = np.zeros(length)
+    for state in states.values():
+        for upper, points in state.points.items():
+            if upper == UPPER_BONUS_THRESHOLD:
+                distribution[UPPER_BONUS:] += points[:length - UPPER_BONUS]
+            else:
+                distribution += points
+    expected = float(distribution @ np.arange(length))
+    return Evaluation(expected, bonus, distribution, True, total_states, planner.calls)
+
+
+def _point_mass(score: int, length: int) -> np.ndarray:
+    distribution = np.zeros(length)
+    distribution[score] = 1.0
+    return distribution
+
+
+def evaluate_strategy(strategy: Strategy, signature: Signature = default_signature, max_states: int = 100_000,
+                      max_strategy_calls: Optional[int] = 5_000_000, score_distribution: bool = True,
+                      fallback_games: int = 100_000, seed: Optional[int] = None) -> Evaluation:
+    """
+    Return the exact expected result of a strategy, or an estimate from `fallback_games`
+    simulated games if evaluating it exactly takes more than `max_states` states or
+    `max_strategy_calls` decisions.
+    """
+    try:
+        return evaluate_exactly(strategy, signature, max_states, max_strategy_calls, score_distribution)
+    except StateSpaceTooLarge:
+        pass
+    from yahtzee_simulator.simulator import simulate_games
+
+    statistics = ScoreStatistics()
+    category_scores, _, _ = simulate_games(strategy, 0, fallback_games, seed if seed is not None else new_seed(),
+                                           keep_scorecards=False)
+    statistics.add_batch(category_scores)
+    return Evaluation(
+        expected_score=statistics.mean(),
+        bonus_probability=statistics.bonus_percentage() / 100,
+        score_distribution=statistics.histogram() / statistics.count if score_distribution else None,
+        exact=False,
+        states=fallback_games,
+        strategy_calls=0,
+    )
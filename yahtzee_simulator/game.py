@@ -1,47 +1,83 @@
 from yahtzee_simulator.scorecard import Scorecard
 from yahtzee_simulator.score_category import Category
-from random import randint
+from yahtzee_simulator.dice_source import DiceSource, RandomDiceSource
 from yahtzee_simulator.score_category import Dice
 from yahtzee_simulator.strategy import Strategy
+from yahtzee_simulator.decision_type import DecisionType
+from yahtzee_simulator.trace import GameTrace
+
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from yahtzee_simulator.profiling import DecisionProfile
 
 
 
 class Game:
-    def __init__(self, strategy: Strategy) -> None:
+    def __init__(self, strategy: Strategy, dice_source: Optional[DiceSource] = None, trace: bool = False,
+                 profile: Optional["DecisionProfile"] = None) -> None:
         self.scorecard = Scorecard()
         self.strategy = strategy
         self.rolls_left = 3
-        self.history = []  # To trace the history of the game
+        # To trace the history of the game, None when tracing is off
+        self.trace: Optional[GameTrace] = GameTrace() if trace else None
+        # Dice come from the global random module unless another source is given
+        self.dice_source = dice_source if dice_source is not None else RandomDiceSource()
+        # Timings are recorded into the profile, None when profiling is off. The strategy,
+        # dice source and scorecard are wrapped so the unprofiled turn loop stays untouched.
+        self.profile = profile
+        if profile is not None:
+            from yahtzee_simulator.profiling import ProfiledDiceSource, ProfiledScorecard, ProfiledStrategy
+            self.scorecard = ProfiledScorecard(profile)
+            self.strategy = ProfiledStrategy(strategy, profile)
+            self.dice_source = ProfiledDiceSource(self.dice_source, profile)
 
     def roll_dice(self, number_of_dice: int) -> tuple[int, ...]:
         self.rolls_left -= 1
-        return tuple(randint(1, 6) for _ in range(number_of_dice))
+        return self.dice_source.roll(number_of_dice)
     
     def play_turn(self) -> None:
         self.rolls_left = 3
-        turn_history = []
+        self.dice_source.start_turn()
+        trace = self.trace
         dice = self.roll_dice(5)
         while self.rolls_left > 0:
-            turn_history.append(f"Roll number {3 - self.rolls_left}: {dice}")
+            if trace is not None:
+                trace.roll(3 - self.rolls_left, dice)
             if self.strategy.should_finish_turn(dice, self.rolls_left, self.scorecard):
                 category = self.strategy.choose_category(dice, self.scorecard)
-                turn_history.append(f"Finishing turn, choosing category: {category}")
+                if trace is not None:
+                    trace.choose(DecisionType.FINISH_TURN, category)
                 self.scorecard.set_score(dice, category)
                 return
             dice_to_keep = self.strategy.choose_dice_to_keep(dice, self.rolls_left, self.scorecard)
-            turn_history.append(f"Continuing turn, keeping dice: {dice_to_keep}")
+            if trace is not None:
+                trace.keep(dice_to_keep)
             dice = dice_to_keep + self.roll_dice(5 - len(dice_to_keep))
         # Must finish turn since no rolls left
-        turn_history.append(f"Roll number {3 - self.rolls_left}: {dice}")
+        if trace is not None:
+            trace.roll(3 - self.rolls_left, dice)
         category = self.strategy.choose_category(dice, self.scorecard)
-        turn_history.append(f"No rolls left, choosing category: {category}")
+        if trace is not None:
+            trace.choose(DecisionType.CHOOSE_CATEGORY, category)
         self.scorecard.set_score(dice, category)
-        turn_history.append(f"Current scorecard:\n {self.scorecard}")
-        self.history.append(turn_history)
+
+    @property
+    def history(self) -> List[List[str]]:
+        """The lines of every turn, rendered from the trace. Empty when tracing is off."""
+        return self.trace.turns() if self.trace is not None else []
 
     def play_game(self) -> Scorecard:
+        if self.profile is None:
+            for turn in Category:
+                self.play_turn()
+            return
+        turns = self.profile.sections["turn"]
         for turn in Category:
+            start = perf_counter_ns()
             self.play_turn()
+            turns.add(perf_counter_ns() - start)
     
     def print_history(self) -> None:
         for turn_number, turn in enumerate(self.history, start=1):
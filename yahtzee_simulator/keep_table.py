@@ -0,0 +1,52 @@
+from itertools import combinations, combinations_with_replacement
+from math import factorial
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from yahtzee_simulator.score_table import ROLL_INDEX, ROLLS
+
+# Every multiset of zero to five dice a player can keep before rolling again, sorted.
+KEEPS: List[Tuple[int, ...]] = [
+    keep for size in range(6) for keep in combinations_with_replacement(range(1, 7), size)
+]
+KEEP_INDEX: Dict[Tuple[int, ...], int] = {keep: i for i, keep in enumerate(KEEPS)}
+
+
+def _outcome_probability(outcome: Tuple[int, ...]) -> float:
+    """Return the probability of rolling exactly this multiset of dice."""
+    ways = factorial(len(outcome))
+    for value in set(outcome):
+        ways //= factorial(outcome.count(value))
+    return ways / 6 ** len(outcome)
+
+
+def _build_transitions() -> np.ndarray:
+    transitions = np.zeros((len(KEEPS), len(ROLLS)))
+    for k, keep in enumerate(KEEPS):
+        for outcome in combinations_with_replacement(range(1, 7), 5 - len(keep)):
+            roll = tuple(sorted(keep + outcome))
+            transitions[k, ROLL_INDEX[roll]] += _outcome_probability(outcome)
+    return transitions
+
+
+def _build_roll_keeps() -> np.ndarray:
+    roll_keeps = np.empty((len(ROLLS), 32), dtype=np.int16)
+    for r, roll in enumerate(ROLLS):
+        keeps = {KEEP_INDEX[tuple(roll[i] for i in chosen)]
+                 for size in range(6) for chosen in combinations(range(5), size)}
+        keeps = sorted(keeps)
+        # Pad with the keep-everything option so every row has the same length
+        roll_keeps[r] = keeps + [KEEP_INDEX[roll]] * (32 - len(keeps))
+    return roll_keeps
+
+
+# KEEP_TRANSITIONS[k, r] is the probability that keeping KEEPS[k] and rolling the
+# other dice gives ROLLS[r].
+KEEP_TRANSITIONS: np.ndarray = _build_transitions()
+
+# Indices of all the keeps possible from each roll, padded to 32 columns.
+ROLL_KEEPS: np.ndarray = _build_roll_keeps()
+
+# Probability of each roll when rolling all five dice.
+ROLL_PROBABILITIES: np.ndarray = KEEP_TRANSITIONS[KEEP_INDEX[()]]
@@ -0,0 +1,138 @@
+import os
+import threading
+import warnings
+from typing import Callable, Optional
+
+import numpy as np
+
+
+# matplotlib is only imported once a plot is drawn, so runs that never plot (pool workers,
+# batch jobs) do not pay for importing it.
+
+def _figure_factory() -> Callable:
+    # The object-oriented API keeps figures out of pyplot's global state, so they can be
+    # drawn on a background thread
+    from matplotlib.figure import Figure
+    return Figure
+
+
+def calculate_histogram_params(values: np.ndarray) -> tuple[int, int, int]:
+    """
+    Calculate histogram parameters for given score values.
+
+    Args:
+        values: Array of score values.
+
+    Returns:
+        Tuple (x_min, x_max, num_bins):
+            x_min: Minimum score - 5
+            x_max: Maximum score + 5
+            num_bins: Number of unique scores + 10
+    """
+    if len(values) == 0:
+        return 0, 0, 0
+
+    min_val = int(np.min(values))
+    max_val = int(np.max(values))
+    x_min = min_val - 5
+    x_max = max_val + 5
+    num_bins = len(np.unique(values)) + 10
+
+    return x_min, x_max, num_bins
+
+
+def plot_upper_section_frequencies(frequencies: np.ndarray, number_of_games: int,
+                                   new_figure: Optional[Callable] = None):
+    """Plot the upper section histogram, `frequencies[s]` being the number of games scoring s."""
+    import matplotlib.ticker as mticker
+
+    upper_scores = np.flatnonzero(frequencies)  # Every upper section score that occurred
+    if len(upper_scores) == 0:
+        return None
+
+    x_min, x_max, num_bins = calculate_histogram_params(upper_scores)
+
+    fig = (new_figure or _figure_factory())(figsize=(10, 6))
+    ax = fig.add_subplot()
+
+    # Get histogram data
+    counts, bin_edges = np.histogram(upper_scores, bins=num_bins, range=(x_min, x_max),
+                                     weights=frequencies[upper_scores])
+
+    # Color bins differently depending on whether they are below/above 63
+    bin_centers = 0.5 * (bin_edges[1:] + bin_edges[:-1])
+    colors = ['orange' if center < 63 else 'lightgreen' for center in bin_centers]
+
+    ax.bar(bin_centers, counts, width=(bin_edges[1] - bin_edges[0]),
+           color=colors, edgecolor='black')
+
+    ax.set_title(f"Upper Section Score Distribution over {number_of_games} Games")
+    ax.set_xlabel("Upper Section Score")
+    ax.set_ylabel("Frequency")
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.set_xticks(range(x_min, x_max + 1, 5))
+    ax.yaxis.set_major_locator(mticker.MaxNLocator(nbins='auto', integer=True))
+    fig.tight_layout()
+    return fig
+
+
+def plot_score_frequencies(frequencies: np.ndarray, number_of_games: int,
+                           new_figure: Optional[Callable] = None):
+    """Plot the total score histogram, `frequencies[s]` being the number of games scoring s."""
+    import matplotlib.ticker as mticker
+
+    scores = np.flatnonzero(frequencies)  # Every total score that occurred
+    if len(scores) == 0:
+        return None
+
+    x_min, x_max, num_bins = calculate_histogram_params(scores)
+
+    fig = (new_figure or _figure_factory())(figsize=(10, 6))
+    ax = fig.add_subplot()
+    ax.hist(
+        scores,
+        weights=frequencies[scores],
+        bins=num_bins,
+        range=(x_min, x_max),
+        color='lightgreen',
+        edgecolor='black'
+    )
+    ax.set_title(f"Score Distribution over {number_of_games} Games")
+    ax.set_xlabel("Score")
+    ax.set_ylabel("Frequency")
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.set_xticks(range(x_min, x_max + 1, 10))
+    ax.yaxis.set_major_locator(mticker.MaxNLocator(nbins='auto', integer=True))
+    fig.tight_layout()
+    return fig
+
+
+def save_plots(run_folder: str, score_frequencies: np.ndarray, upper_frequencies: np.ndarray,
+               number_of_games: int) -> None:
+    """Save the score and upper section histograms of a run as PNG files."""
+    try:
+        histogram = plot_score_frequencies(score_frequencies, number_of_games)
+        if histogram is not None:
+            histogram.savefig(os.path.join(run_folder, "histogram.png"))
+
+        upper_histogram = plot_upper_section_frequencies(upper_frequencies, number_of_games)
+        if upper_histogram is not None:
+            upper_histogram.savefig(os.path.join(run_folder, "upper_section_histogram.png"))
+    except ImportError:
+        warnings.warn("matplotlib is not installed, no plots were saved.")
+
+
+def save_plots_in_background(run_folder: str, score_frequencies: np.ndarray, upper_frequencies: np.ndarray,
+                             number_of_games: int) -> threading.Thread:
+    """
+    Start saving the plots of a run on a background thread and return the thread.
+
+    The thread is not a daemon, so the interpreter waits for the plots before exiting.
+    """
+    thread = threading.Thread(
+        target=save_plots,
+        args=(run_folder, score_frequencies.copy(), upper_frequencies.copy(), number_of_games),
+        name="yahtzee-plots",
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,181 @@
+from time import perf_counter_ns
+from typing import Dict, List
+
+from yahtzee_simulator.dice_source import DiceSource
+from yahtzee_simulator.score_category import Category, Dice
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.strategy import Strategy
+
+
+class LatencyHistogram:
+    """Call count and latencies of one profiled section, in power-of-two nanosecond buckets."""
+
+    BUCKETS = 64
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        # buckets[b] counts the calls that took from 2^(b-1) up to 2^b - 1 nanoseconds
+        self.buckets: List[int] = [0] * self.BUCKETS
+
+    def add(self, ns: int) -> None:
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.buckets[ns.bit_length()] += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count > 0 else 0.0
+
+    def percentile_ns(self, q: float) -> int:
+        """Return an upper bound of the q-quantile latency, accurate to a factor of two."""
+        rank = q * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min((1 << bucket) - 1, self.max_ns)
+        return 0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "mean_ns": self.mean_ns(),
+            "p50_ns": self.percentile_ns(0.5),
+            "p99_ns": self.percentile_ns(0.99),
+            "max_ns": self.max_ns,
+            "buckets": self.buckets,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "LatencyHistogram":
+        """Restore a histogram saved with `to_dict`."""
+        histogram = cls()
+        histogram.count = data["count"]
+        histogram.total_ns = data["total_ns"]
+        histogram.max_ns = data["max_ns"]
+        histogram.buckets = list(data["buckets"])
+        return histogram
+
+
+class DecisionProfile:
+    """
+    Where the time of a run goes: the strategy's decisions, whole turns, and the engine's
+    dice rolling and scoring.
+    """
+
+    SECTIONS = ("should_finish_turn", "choose_dice_to_keep", "choose_category", "turn", "roll_dice", "set_score")
+
+    def __init__(self) -> None:
+        self.sections: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name in self.SECTIONS}
+
+    def record(self, section: str, ns: int) -> None:
+        self.sections[section].add(ns)
+
+    def merge(self, other: "DecisionProfile") -> None:
+        for name, histogram in other.sections.items():
+            self.sections[name].merge(histogram)
+
+    def strategy_ns(self) -> int:
+        """Return the total time spent in the strategy's decisions."""
+        return sum(self.sections[name].total_ns
+                   for name in ("should_finish_turn", "choose_dice_to_keep", "choose_category"))
+
+    def engine_ns(self) -> int:
+        """Return the time of all turns not spent in the strategy."""
+        return self.sections["turn"].total_ns - self.strategy_ns()
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "strategy_ns": self.strategy_ns(),
+            "engine_ns": self.engine_ns(),
+            "sections": {name: histogram.to_dict() for name, histogram in self.sections.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "DecisionProfile":
+        """Restore a profile saved with `to_dict`."""
+        profile = cls()
+        for name, histogram in data["sections"].items():
+            profile.sections[name] = LatencyHistogram.from_dict(histogram)
+        return profile
+
+    def print_summary(self) -> None:
+        for name, histogram in self.sections.items():
+            print(f"{name:<20} calls: {histogram.count:>10}  mean: {histogram.mean_ns():>10.0f} ns  "
+                  f"p99: {histogram.percentile_ns(0.99):>10} ns")
+        print(f"{'Strategy total':<20} {self.strategy_ns() / 1e9:.3f} s")
+        print(f"{'Engine total':<20} {self.engine_ns() / 1e9:.3f} s")
+
+
+class ProfiledStrategy(Strategy):
+    """Times every decision of the wrapped strategy."""
+
+    def __init__(self, strategy: Strategy, profile: DecisionProfile) -> None:
+        self.strategy = strategy
+        self._should_finish_turn = profile.sections["should_finish_turn"]
+        self._choose_dice_to_keep = profile.sections["choose_dice_to_keep"]
+        self._choose_category = profile.sections["choose_category"]
+
+    def should_finish_turn(self, dice: Dice, rolls_left: int, scorecard: Scorecard) -> bool:
+        start = perf_counter_ns()
+        finish = self.strategy.should_finish_turn(dice, rolls_left, scorecard)
+        self._should_finish_turn.add(perf_counter_ns() - start)
+        return finish
+
+    def choose_dice_to_keep(self, dice: Dice, rolls_left: int, scorecard: Scorecard) -> tuple[int]:
+        start = perf_counter_ns()
+        dice_to_keep = self.strategy.choose_dice_to_keep(dice, rolls_left, scorecard)
+        self._choose_dice_to_keep.add(perf_counter_ns() - start)
+        return dice_to_keep
+
+    def choose_category(self, dice: Dice, scorecard: Scorecard) -> Category:
+        start = perf_counter_ns()
+        category = self.strategy.choose_category(dice, scorecard)
+        self._choose_category.add(perf_counter_ns() - start)
+        return category
+
+
+class ProfiledDiceSource(DiceSource):
+    """Times every roll of the wrapped dice source."""
+
+    def __init__(self, dice_source: DiceSource, profile: DecisionProfile) -> None:
+        self.dice_source = dice_source
+        self.seed = dice_source.seed
+        self._roll_dice = profile.sections["roll_dice"]
+
+    def start_game(self, game_index: int) -> None:
+        self.dice_source.start_game(game_index)
+
+    def start_turn(self) -> None:
+        self.dice_source.start_turn()
+
+    def roll(self, number_of_dice: int) -> tuple[int, ...]:
+        start = perf_counter_ns()
+        dice = self.dice_source.roll(number_of_dice)
+        self._roll_dice.add(perf_counter_ns() - start)
+        return dice
+
+
+class ProfiledScorecard(Scorecard):
+    """Scorecard that times the scoring of every turn."""
+
+    __slots__ = ("_set_score",)
+
+    def __init__(self, profile: DecisionProfile) -> None:
+        super().__init__()
+        self._set_score = profile.sections["set_score"]
+
+    def set_score(self, dice: Dice, category: Category) -> None:
+        start = perf_counter_ns()
+        super().set_score(dice, category)
+        self._set_score.add(perf_counter_ns() - start)
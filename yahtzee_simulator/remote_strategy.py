@@ -0,0 +1,309 @@
+"""
+Strategies running in another process, asked for decisions in batches.
+
+Games are played as coroutines by `play_remote_games`. Every decision they need is
+queued on a `RemoteStrategy`, which sends all queued decisions to a strategy server as
+one batch, so a round trip serves many games at once.
+
+The protocol is newline-delimited JSON over a TCP or Unix socket. A request line is a
+list of decisions `[method, dice, rolls_left, category_scores]`, where `method` is 0 for
+`should_finish_turn`, 1 for `choose_dice_to_keep` and 2 for `choose_category`, and
+`category_scores` is `Scorecard.category_scores()`. The response line is the list of
+answers in the same order: a bool, the list of dice values to keep, or a category index.
+
+`StrategyServer` serves any `Strategy` or `BatchStrategy` this way and stands in for a
+real model server:
+
+    python -m yahtzee_simulator.remote_strategy serve --strategy ExampleStrategy --port 8765
+    python -m yahtzee_simulator.remote_strategy play --port 8765 --games 10000 --seed 1
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from yahtzee_simulator.batch_strategy import BatchStrategy
+from yahtzee_simulator.dice_source import RandomDiceSource
+from yahtzee_simulator.results import SCORE_DTYPE
+from yahtzee_simulator.score_category import Category, Dice
+from yahtzee_simulator.score_statistics import ScoreStatistics
+from yahtzee_simulator.score_table import CATEGORIES, CATEGORY_INDEX
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.simulator import DiceSourceFactory
+from yahtzee_simulator.strategy import Strategy
+
+SHOULD_FINISH_TURN = 0
+CHOOSE_DICE_TO_KEEP = 1
+CHOOSE_CATEGORY = 2
+
+# A (host, port) pair for TCP, or the path of a Unix socket
+Address = Union[Tuple[str, int], str]
+
+# Longest line a stream reads, a batch is one line
+_LINE_LIMIT = 1 << 26
+
+
+class StrategyServer:
+    """Serves the decisions of a `Strategy` or `BatchStrategy` to `RemoteStrategy` clients."""
+
+    def __init__(self, strategy: Union[Strategy, BatchStrategy]) -> None:
+        self.strategy = strategy
+        self.address: Optional[Address] = None
+        self.batches = 0
+        self.requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, address: Address = ("127.0.0.1", 0)) -> Address:
+        """Start listening and return the address, with the port filled in when it was 0."""
+        if isinstance(address, str):
+            self._server = await asyncio.start_unix_server(self._handle, path=address, limit=_LINE_LIMIT)
+            self.address = address
+        else:
+            self._server = await asyncio.start_server(self._handle, *address, limit=_LINE_LIMIT)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        return self.address
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                answers = self.decide(json.loads(line))
+                writer.write(json.dumps(answers, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+        except ConnectionResetError:
+            pass
+        finally:
+            writer.close()
+
+    def decide(self, requests: List[list]) -> list:
+        """Answer a batch of decisions in the protocol's encoding."""
+        self.batches += 1
+        self.requests += len(requests)
+        if isinstance(self.strategy, BatchStrategy):
+            return self._decide_batch(requests)
+        strategy = self.strategy
+        answers = []
+        for method, dice, rolls_left, category_scores in requests:
+            dice = tuple(dice)
+            scorecard = Scorecard.from_category_scores(category_scores)
+            if method == SHOULD_FINISH_TURN:
+                answers.append(bool(strategy.should_finish_turn(dice, rolls_left, scorecard)))
+            elif method == CHOOSE_DICE_TO_KEEP:
+                answers.append(list(strategy.choose_dice_to_keep(dice, rolls_left, scorecard)))
+            else:
+                answers.append(CATEGORY_INDEX[strategy.choose_category(dice, scorecard)])
+        return answers
+
+    def _decide_batch(self, requests: List[list]) -> list:
+        # One vectorized call per kind of decision in the batch
+        answers: list = [None] * len(requests)
+        for method in (SHOULD_FINISH_TURN, CHOOSE_DICE_TO_KEEP, CHOOSE_CATEGORY):
+            rows = [i for i, request in enumerate(requests) if request[0] == method]
+            if not rows:
+                continue
+            dice = np.array([requests[i][1] for i in rows], dtype=np.int8)
+            rolls_left = np.array([requests[i][2] for i in rows], dtype=np.int8)
+            scores = np.array([requests[i][3] for i in rows], dtype=np.int16)
+            if method == SHOULD_FINISH_TURN:
+                results = self.strategy.should_finish_turn(dice, rolls_left, scores).tolist()
+            elif method == CHOOSE_DICE_TO_KEEP:
+                masks = self.strategy.choose_dice_to_keep(dice, rolls_left, scores)
+                results = [row[mask].tolist() for row, mask in zip(dice, masks)]
+            else:
+                results = self.strategy.choose_category(dice, scores).tolist()
+            for i, result in zip(rows, results):
+                answers[i] = result
+        return answers
+
+
+class RemoteStrategy:
+    """
+    Asks a strategy server for decisions, batching the requests of concurrent games.
+
+    Requests queue up while a batch is on the wire and go out together, at most
+    `max_batch_size` per batch.
+    """
+
+    def __init__(self, address: Address, max_batch_size: int = 4096) -> None:
+        self.address = address
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.requests = 0
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: List[Tuple[list, asyncio.Future]] = []
+        self._sending = False
+        # The event loop only holds tasks weakly
+        self._sender: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        if isinstance(self.address, str):
+            self._reader, self._writer = await asyncio.open_unix_connection(self.address, limit=_LINE_LIMIT)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(*self.address, limit=_LINE_LIMIT)
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def should_finish_turn(self, dice: Dice, rolls_left: int, scorecard: Scorecard) -> bool:
+        return await self._ask([SHOULD_FINISH_TURN, dice, rolls_left, scorecard.category_scores()])
+
+    async def choose_dice_to_keep(self, dice: Dice, rolls_left: int, scorecard: Scorecard) -> tuple[int]:
+        return tuple(await self._ask([CHOOSE_DICE_TO_KEEP, dice, rolls_left, scorecard.category_scores()]))
+
+    async def choose_category(self, dice: Dice, scorecard: Scorecard) -> Category:
+        return CATEGORIES[await self._ask([CHOOSE_CATEGORY, dice, 0, scorecard.category_scores()])]
+
+    async def _ask(self, request: list):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((request, future))
+        if not self._sending:
+            # Sending starts once every game that is ready to run has queued its request
+            self._sending = True
+            self._sender = asyncio.get_running_loop().create_task(self._send())
+        return await future
+
+    async def _send(self) -> None:
+        try:
+            while self._pending:
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+                try:
+                    self._writer.write(json.dumps([request for request, _ in batch],
+                                                  separators=(",", ":")).encode() + b"\n")
+                    await self._writer.drain()
+                    line = await self._reader.readline()
+                    if not line:
+                        raise ConnectionError("The strategy server closed the connection.")
+                    answers = json.loads(line)
+                    if not isinstance(answers, list) or len(answers) != len(batch):
+                        raise ValueError(f"The strategy server did not answer all {len(batch)} requests of a batch.")
+                except Exception as e:
+                    for _, future in batch:
+                        future.set_exception(e)
+                    continue
+                self.batches += 1
+                self.requests += len(batch)
+                for (_, future), answer in zip(batch, answers):
+                    future.set_result(answer)
+        finally:
+            self._sending = False
+
+
+class AsyncGame:
+    """A `Game` whose strategy decisions are awaited, so many games can wait on a server at once."""
+
+    def __init__(self, strategy: RemoteStrategy, dice_source) -> None:
+        self.scorecard = Scorecard()
+        self.strategy = strategy
+        self.rolls_left = 3
+        self.dice_source = dice_source
+
+    def roll_dice(self, number_of_dice: int) -> tuple[int, ...]:
+        self.rolls_left -= 1
+        return self.dice_source.roll(number_of_dice)
+
+    async def play_turn(self) -> None:
+        self.rolls_left = 3
+        self.dice_source.start_turn()
+        dice = self.roll_dice(5)
+        while self.rolls_left > 0:
+            if await self.strategy.should_finish_turn(dice, self.rolls_left, self.scorecard):
+                break
+            dice_to_keep = await self.strategy.choose_dice_to_keep(dice, self.rolls_left, self.scorecard)
+            dice = dice_to_keep + self.roll_dice(5 - len(dice_to_keep))
+        self.scorecard.set_score(dice, await self.strategy.choose_category(dice, self.scorecard))
+
+    async def play_game(self) -> None:
+        for turn in Category:
+            await self.play_turn()
+
+
+async def play_remote_games(strategy: RemoteStrategy, number_of_games: int, seed: Optional[int] = None,
+                            dice_source: DiceSourceFactory = RandomDiceSource,
+                            concurrency: int = 1024) -> np.ndarray:
+    """
+    Play games with a remote strategy, `concurrency` of them at a time.
+
+    Returns the (number_of_games, 15) category scores. With a seed every game gets the
+    same dice as in a seeded `Simulator` run.
+    """
+    category_scores = np.empty((number_of_games, len(Category)), dtype=SCORE_DTYPE)
+    game_indices = iter(range(number_of_games))
+
+    async def play_in_turn() -> None:
+        # Every coroutine has its own dice source, since their games interleave
+        source = dice_source(seed)
+        for i in game_indices:
+            source.start_game(i)
+            game = AsyncGame(strategy, source)
+            await game.play_game()
+            category_scores[i] = game.scorecard.category_scores()
+
+    await asyncio.gather(*(play_in_turn() for _ in range(min(concurrency, number_of_games))))
+    return category_scores
+
+
+def run_remote_games(address: Address, number_of_games: int, seed: Optional[int] = None,
+                     dice_source: DiceSourceFactory = RandomDiceSource, concurrency: int = 1024,
+                     max_batch_size: int = 4096) -> np.ndarray:
+    """Connect to a strategy server, play the games and return their category scores."""
+    async def run() -> np.ndarray:
+        strategy = RemoteStrategy(address, max_batch_size)
+        await strategy.connect()
+        try:
+            return await play_remote_games(strategy, number_of_games, seed, dice_source, concurrency)
+        finally:
+            await strategy.close()
+    return asyncio.run(run())
+
+
+def _address(args: argparse.Namespace) -> Address:
+    return args.unix_socket if args.unix_socket else (args.host, args.port)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from yahtzee_simulator import strategies
+
+    parser = argparse.ArgumentParser(description="Serve or play against a strategy over a socket.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("serve", "play"):
+        command = commands.add_parser(name)
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=8765)
+        command.add_argument("--unix-socket", help="Use a Unix socket at this path instead of TCP.")
+        if name == "serve":
+            command.add_argument("--strategy", default="ExampleStrategy",
+                                 help="Name of a strategy in yahtzee_simulator.strategies.")
+        else:
+            command.add_argument("--games", type=int, default=1000)
+            command.add_argument("--seed", type=int)
+            command.add_argument("--concurrency", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        async def serve() -> None:
+            server = StrategyServer(getattr(strategies, args.strategy)())
+            print(f"Serving {args.strategy} on {await server.start(_address(args))}")
+            await server.serve_forever()
+        asyncio.run(serve())
+        return 0
+
+    statistics = ScoreStatistics()
+    statistics.add_batch(run_remote_games(_address(args), args.games, args.seed, concurrency=args.concurrency))
+    print(f"Average score over {args.games} games: {statistics.mean()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import json
+import os
+from typing import List
+
+import numpy as np
+
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.score_table import total_scores
+from yahtzee_simulator.scorecard import Scorecard
+
+SCORES_FILE = "scores.bin"
+TOTALS_FILE = "totals.bin"
+HEADER_FILE = "results.json"
+
+SCORE_DTYPE = np.dtype(np.int8)
+TOTAL_DTYPE = np.dtype(np.int16)
+
+
+class ResultsWriter:
+    """
+    Appends the results of every game to a run folder in a columnar binary format.
+
+    `scores.bin` holds a games x 15 matrix of category scores in `Category` order and
+    `totals.bin` the total score of each game. Games are buffered and written in chunks.
+    """
+
+    def __init__(self, folder: str, chunk_size: int = 65536) -> None:
+        self.folder = folder
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._scores = open(os.path.join(folder, SCORES_FILE), "ab")
+        self._totals = open(os.path.join(folder, TOTALS_FILE), "ab")
+        self._pending_scores: List[List[int]] = []
+        self._pending_totals: List[int] = []
+        with open(os.path.join(folder, HEADER_FILE), "w") as f:
+            json.dump({
+                "categories": [cat.name for cat in Category],
+                "score_dtype": SCORE_DTYPE.str,
+                "total_dtype": TOTAL_DTYPE.str,
+            }, f, indent=4)
+
+    def add(self, scorecard: Scorecard) -> None:
+        self._pending_scores.append(scorecard.category_scores())
+        self._pending_totals.append(scorecard.total_score())
+        if len(self._pending_totals) >= self.chunk_size:
+            self.flush()
+
+    def add_batch(self, category_scores: np.ndarray) -> None:
+        """Append the games of an (n, 15) array of category scores."""
+        self.flush()
+        np.ascontiguousarray(category_scores, dtype=SCORE_DTYPE).tofile(self._scores)
+        total_scores(category_scores).astype(TOTAL_DTYPE).tofile(self._totals)
+        self.count += len(category_scores)
+
+    def flush(self) -> None:
+        if self._pending_totals:
+            np.array(self._pending_scores, dtype=SCORE_DTYPE).tofile(self._scores)
+            np.array(self._pending_totals, dtype=TOTAL_DTYPE).tofile(self._totals)
+            self.count += len(self._pending_totals)
+            self._pending_scores = []
+            self._pending_totals = []
+        self._scores.flush()
+        self._totals.flush()
+
+    def sync(self) -> None:
+        """Flush the games and make sure they are on disk."""
+        self.flush()
+        os.fsync(self._scores.fileno())
+        os.fsync(self._totals.fileno())
+
+    def close(self) -> None:
+        self.flush()
+        self._scores.close()
+        self._totals.close()
+
+
+def truncate_results(folder: str, count: int) -> None:
+    """Drop every game after the first `count` from the results in a run folder."""
+    for name, row_size in ((SCORES_FILE, SCORE_DTYPE.itemsize * len(Category)), (TOTALS_FILE, TOTAL_DTYPE.itemsize)):
+        path = os.path.join(folder, name)
+        if os.path.getsize(path) > count * row_size:
+            os.truncate(path, count * row_size)
+
+
+class Results:
+    """Results of a run memory-mapped from its folder, so only the rows used are read."""
+
+    def __init__(self, folder: str) -> None:
+        self.folder = folder
+        with open(os.path.join(folder, HEADER_FILE)) as f:
+            header = json.load(f)
+        self.categories = [Category[name] for name in header["categories"]]
+        total_dtype = np.dtype(header["total_dtype"])
+        score_dtype = np.dtype(header["score_dtype"])
+        # The game count follows from the file size, so an interrupted run can still be read
+        totals_path = os.path.join(folder, TOTALS_FILE)
+        scores_path = os.path.join(folder, SCORES_FILE)
+        count = min(os.path.getsize(totals_path) // total_dtype.itemsize,
+                    os.path.getsize(scores_path) // (score_dtype.itemsize * len(self.categories)))
+        if count == 0:
+            self.totals = np.zeros(0, dtype=total_dtype)
+            self.category_scores = np.zeros((0, len(self.categories)), dtype=score_dtype)
+        else:
+            self.totals = np.memmap(totals_path, dtype=total_dtype, mode="r", shape=(count,))
+            self.category_scores = np.memmap(scores_path, dtype=score_dtype,
+                                             mode="r", shape=(count, len(self.categories)))
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def category_column(self, category: Category) -> np.ndarray:
+        """Return the score of every game in one category."""
+        return self.category_scores[:, self.categories.index(category)]
+
+    def upper_section_scores(self) -> np.ndarray:
+        upper = [self.categories.index(cat) for cat in list(Category)[:6]]
+        return self.category_scores[:, upper].sum(axis=1, dtype=np.int16)
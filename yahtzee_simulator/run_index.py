@@ -0,0 +1,269 @@
+"""
+A SQLite index of the runs in the results folder, for queries across runs.
+
+    python -m yahtzee_simulator.run_index rebuild
+    python -m yahtzee_simulator.run_index list --strategy OptimalStrategy --since 2026-01-01
+    python -m yahtzee_simulator.run_index best --since 2026-01-01
+    python -m yahtzee_simulator.run_index compare results/A/run_x results/B/run_y
+
+`Simulator.save_results` registers every run, `rebuild` indexes runs saved before.
+"""
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_INDEX_PATH = os.path.join("results", "index.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_folder TEXT PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    time TEXT,
+    number_of_games INTEGER,
+    seed TEXT,
+    dice_source TEXT,
+    average REAL,
+    median REAL,
+    best INTEGER,
+    worst INTEGER,
+    std_dev REAL,
+    bonus_percentage REAL,
+    stop_reason TEXT,
+    summary TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_strategy ON runs (strategy, time);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (time);
+"""
+
+# Columns runs can be sorted by
+ORDER_COLUMNS = ("time", "average", "median", "best", "worst", "std_dev", "bonus_percentage", "number_of_games")
+
+
+@dataclass(frozen=True)
+class RunRecord:
+    """The indexed metrics and parameters of one run."""
+    run_folder: str
+    strategy: str
+    time: Optional[str]
+    number_of_games: int
+    seed: Optional[int]
+    dice_source: Optional[str]
+    average: float
+    median: float
+    best: int
+    worst: int
+    std_dev: float
+    bonus_percentage: float
+    stop_reason: Optional[str]
+
+
+_COLUMNS = ", ".join(field.name for field in fields(RunRecord))
+
+
+def _iso_time(timestamp: Optional[str]) -> Optional[str]:
+    """Turn a run folder timestamp into ISO 8601, which sorts and compares as text."""
+    if timestamp is None:
+        return None
+    return datetime.strptime(timestamp, "%Y-%m-%d_%H-%M-%S").isoformat(sep=" ")
+
+
+def _record(row: tuple) -> RunRecord:
+    record = RunRecord(*row)
+    # Seeds are 64-bit unsigned, more than SQLite integers hold, so they are stored as text
+    return RunRecord(**{**asdict(record), "seed": int(record.seed) if record.seed is not None else None})
+
+
+class RunIndex:
+    """SQLite index of run summaries, kept in `results/index.sqlite` by default."""
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "RunIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def register(self, run_folder: str) -> RunRecord:
+        """Add the run saved in a folder to the index, replacing an earlier entry of it."""
+        with open(os.path.join(run_folder, "summary.json")) as f:
+            summary = json.load(f)
+        record = RunRecord(
+            run_folder=os.path.normpath(run_folder),
+            strategy=os.path.basename(os.path.dirname(os.path.normpath(run_folder))),
+            time=_iso_time(summary.get("time")),
+            number_of_games=summary["number_of_games"],
+            seed=summary.get("seed"),
+            dice_source=summary.get("dice_source"),
+            average=summary["average"],
+            median=summary["median"],
+            best=summary["best"],
+            worst=summary["worst"],
+            std_dev=summary["std_dev"],
+            bonus_percentage=summary["Bonus percentage"],
+            stop_reason=summary.get("stop_reason"),
+        )
+        values = asdict(record)
+        values["seed"] = str(record.seed) if record.seed is not None else None
+        with self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO runs ({_COLUMNS}, summary) VALUES "
+                f"({', '.join('?' * len(values))}, ?)",
+                (*values.values(), json.dumps(summary)),
+            )
+        return record
+
+    def rebuild(self, results_folder: str = "results") -> int:
+        """Index every run saved under a results folder and return how many there are."""
+        count = 0
+        for path in sorted(glob.glob(os.path.join(results_folder, "*", "run_*", "summary.json"))):
+            try:
+                self.register(os.path.dirname(path))
+            except (KeyError, ValueError):
+                # Not a Simulator run, e.g. a tournament, or an unreadable summary
+                continue
+            count += 1
+        return count
+
+    def remove_missing(self) -> int:
+        """Drop the runs whose folders no longer exist and return how many there were."""
+        missing = [folder for (folder,) in self.connection.execute("SELECT run_folder FROM runs")
+                   if not os.path.isdir(folder)]
+        with self.connection:
+            self.connection.executemany("DELETE FROM runs WHERE run_folder = ?", [(f,) for f in missing])
+        return len(missing)
+
+    def get(self, run_folder: str) -> Optional[RunRecord]:
+        row = self.connection.execute(f"SELECT {_COLUMNS} FROM runs WHERE run_folder = ?",
+                                      (os.path.normpath(run_folder),)).fetchone()
+        return _record(row) if row is not None else None
+
+    def summary(self, run_folder: str) -> Optional[Dict[str, object]]:
+        """Return the whole saved summary of a run."""
+        row = self.connection.execute("SELECT summary FROM runs WHERE run_folder = ?",
+                                      (os.path.normpath(run_folder),)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def query(self, strategy: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+              min_games: Optional[int] = None, order_by: str = "time", descending: bool = True,
+              limit: Optional[int] = None) -> List[RunRecord]:
+        """
+        Return the matching runs.
+
+        `since` and `until` are ISO dates or times, e.g. "2026-01-31" or "2026-01-31 12:00".
+        """
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"Cannot order by {order_by!r}, choose one of {', '.join(ORDER_COLUMNS)}")
+        conditions, parameters = self._conditions(strategy, since, until, min_games)
+        sql = f"SELECT {_COLUMNS} FROM runs{conditions} ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        return [_record(row) for row in self.connection.execute(sql, parameters)]
+
+    def best_per_strategy(self, since: Optional[str] = None, until: Optional[str] = None,
+                          min_games: Optional[int] = None) -> List[RunRecord]:
+        """Return the run with the best average score of every strategy, best strategy first."""
+        conditions, parameters = self._conditions(None, since, until, min_games)
+        # SQLite takes the other columns from the row holding the MAX
+        rows = self.connection.execute(
+            f"SELECT {_COLUMNS}, MAX(average) FROM runs{conditions} GROUP BY strategy ORDER BY average DESC",
+            parameters,
+        )
+        return [_record(row[:-1]) for row in rows]
+
+    def compare(self, run_folder: str, other_run_folder: str) -> Dict[str, float]:
+        """Return how much every metric of the first run exceeds the second."""
+        first, second = self.get(run_folder), self.get(other_run_folder)
+        for folder, record in ((run_folder, first), (other_run_folder, second)):
+            if record is None:
+                raise KeyError(f"{folder} is not in the index")
+        return {metric: getattr(first, metric) - getattr(second, metric)
+                for metric in ("average", "median", "best", "worst", "std_dev", "bonus_percentage")}
+
+    @staticmethod
+    def _conditions(strategy: Optional[str], since: Optional[str], until: Optional[str],
+                    min_games: Optional[int]) -> tuple:
+        clauses, parameters = [], []
+        if strategy is not None:
+            clauses.append("strategy = ?")
+            parameters.append(strategy)
+        if since is not None:
+            clauses.append("time >= ?")
+            parameters.append(since)
+        if until is not None:
+            clauses.append("time <= ?")
+            # A bare date includes the whole day
+            parameters.append(until + " 23:59:59" if len(until) == 10 else until)
+        if min_games is not None:
+            clauses.append("number_of_games >= ?")
+            parameters.append(min_games)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), parameters
+
+
+def register_run(run_folder: str, index_path: str = DEFAULT_INDEX_PATH) -> None:
+    with RunIndex(index_path) as index:
+        index.register(run_folder)
+
+
+def _print_records(records: List[RunRecord]) -> None:
+    print(f"{'time':<20} {'strategy':<24} {'games':>10} {'average':>9} {'std_dev':>8} {'bonus %':>8}  run_folder")
+    for record in records:
+        print(f"{record.time or '-':<20} {record.strategy:<24} {record.number_of_games:>10} "
+              f"{record.average:>9.2f} {record.std_dev:>8.2f} {record.bonus_percentage:>8.2f}  {record.run_folder}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query the index of simulation runs.")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="Path of the SQLite index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = commands.add_parser("rebuild", help="Index every run in a results folder.")
+    rebuild_parser.add_argument("results_folder", nargs="?", default="results")
+
+    for name in ("list", "best"):
+        command = commands.add_parser(name, help="List runs." if name == "list" else "Best run per strategy.")
+        if name == "list":
+            command.add_argument("--strategy")
+            command.add_argument("--order-by", default="time", choices=ORDER_COLUMNS)
+            command.add_argument("--limit", type=int)
+        command.add_argument("--since", help="ISO date or time, e.g. 2026-01-31.")
+        command.add_argument("--until", help="ISO date or time.")
+        command.add_argument("--min-games", type=int)
+
+    compare_parser = commands.add_parser("compare", help="Difference of the metrics of two runs.")
+    compare_parser.add_argument("run_folder")
+    compare_parser.add_argument("other_run_folder")
+
+    args = parser.parse_args(argv)
+    with RunIndex(args.index) as index:
+        if args.command == "rebuild":
+            count = index.rebuild(args.results_folder)
+            removed = index.remove_missing()
+            print(f"Indexed {count} runs, removed {removed} missing ones.")
+        elif args.command == "list":
+            _print_records(index.query(args.strategy, args.since, args.until, args.min_games,
+                                       order_by=args.order_by, limit=args.limit))
+        elif args.command == "best":
+            _print_records(index.best_per_strategy(args.since, args.until, args.min_games))
+        else:
+            for metric, difference in index.compare(args.run_folder, args.other_run_folder).items():
+                print(f"{metric:<18} {difference:+.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+from statistics import NormalDist
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.scorecard import Scorecard
+
+MAX_UPPER_SCORE = sum(cat.max_score for cat in list(Category)[:6])
+MAX_TOTAL_SCORE = sum(cat.max_score for cat in Category) + 50
+
+
+class ScoreStatistics:
+    """
+    Statistics of a run that take the same memory whatever the number of games.
+
+    Scores are bounded integers, so exact histograms of the total and upper section
+    scores hold all moments and quantiles, and two `ScoreStatistics` merge by adding
+    their counts. Games added one at a time are buffered and counted in bulk.
+    """
+
+    _FLUSH_SIZE = 4096
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.bonus_count = 0
+        self.total_histogram = np.zeros(MAX_TOTAL_SCORE + 1, dtype=np.int64)
+        self.upper_histogram = np.zeros(MAX_UPPER_SCORE + 1, dtype=np.int64)
+        # Per category: games where it was filled, filled with a zero, and the sum of its scores
+        self.category_filled = np.zeros(len(Category), dtype=np.int64)
+        self.category_zeros = np.zeros(len(Category), dtype=np.int64)
+        self.category_sums = np.zeros(len(Category), dtype=np.int64)
+        self._pending: List[List[int]] = []
+
+    def add(self, scorecard: Scorecard) -> None:
+        """Count a single game."""
+        self._pending.append(scorecard.category_scores())
+        if len(self._pending) >= self._FLUSH_SIZE:
+            self._flush()
+
+    def add_batch(self, category_scores: np.ndarray) -> None:
+        """Count a batch of games given as an (n, 15) array of scores, -1 for unfilled categories."""
+        category_scores = np.asarray(category_scores)
+        if len(category_scores) == 0:
+            return
+        values = np.maximum(category_scores, 0).astype(np.int64)
+        upper = values[:, :6].sum(axis=1)
+        bonus = upper >= 63
+        totals = values.sum(axis=1) + 50 * bonus
+
+        self.count += len(values)
+        self.bonus_count += int(np.count_nonzero(bonus))
+        self.total_histogram += np.bincount(totals, minlength=len(self.total_histogram))
+        self.upper_histogram += np.bincount(upper, minlength=len(self.upper_histogram))
+        self.category_filled += (category_scores >= 0).sum(axis=0)
+        self.category_zeros += (category_scores == 0).sum(axis=0)
+        self.category_sums += values.sum(axis=0)
+
+    def _flush(self) -> None:
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.add_batch(np.array(pending, dtype=np.int16))
+
+    def merge(self, other: "ScoreStatistics") -> None:
+        """Add the games counted by another `ScoreStatistics` to this one."""
+        other._flush()
+        self._flush()
+        self.count += other.count
+        self.bonus_count += other.bonus_count
+        self.total_histogram += other.total_histogram
+        self.upper_histogram += other.upper_histogram
+        self.category_filled += other.category_filled
+        self.category_zeros += other.category_zeros
+        self.category_sums += other.category_sums
+
+    def to_dict(self) -> Dict[str, object]:
+        """Return the statistics as plain Python values, e.g. for JSON."""
+        self._flush()
+        return {
+            "count": self.count,
+            "bonus_count": self.bonus_count,
+            "total_histogram": self.total_histogram.tolist(),
+            "upper_histogram": self.upper_histogram.tolist(),
+            "category_filled": self.category_filled.tolist(),
+            "category_zeros": self.category_zeros.tolist(),
+            "category_sums": self.category_sums.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "ScoreStatistics":
+        statistics = cls()
+        statistics.count = data["count"]
+        statistics.bonus_count = data["bonus_count"]
+        for name in ("total_histogram", "upper_histogram", "category_filled", "category_zeros", "category_sums"):
+            getattr(statistics, name)[:] = data[name]
+        return statistics
+
+    def histogram(self) -> np.ndarray:
+        """Return the number of games per total score, indexed by the score."""
+        self._flush()
+        return self.total_histogram
+
+    def upper_section_histogram(self) -> np.ndarray:
+        """Return the number of games per upper section score, indexed by the score."""
+        self._flush()
+        return self.upper_histogram
+
+    def _moments(self) -> tuple[int, int, int]:
+        histogram = self.histogram()
+        scores = np.arange(len(histogram), dtype=object)
+        # Python ints keep the sums exact for any number of games
+        total = int(np.dot(histogram.astype(object), scores))
+        squares = int(np.dot(histogram.astype(object), scores * scores))
+        return self.count, total, squares
+
+    def mean(self) -> float:
+        count, total, _ = self._moments()
+        return total / count if count > 0 else 0.0
+
+    def variance(self) -> float:
+        """Return the population variance of the total scores."""
+        count, total, squares = self._moments()
+        return (count * squares - total * total) / (count * count) if count > 0 else 0.0
+
+    def standard_deviation(self) -> float:
+        return float(np.sqrt(self.variance()))
+
+    def best(self) -> int:
+        scores = np.flatnonzero(self.histogram())
+        return int(scores[-1]) if len(scores) > 0 else 0
+
+    def worst(self) -> int:
+        scores = np.flatnonzero(self.histogram())
+        return int(scores[0]) if len(scores) > 0 else 0
+
+    def _score_at_rank(self, rank: int) -> int:
+        """Return the total score of the game at the given 0-based rank when sorted."""
+        return int(np.searchsorted(np.cumsum(self.histogram()), rank, side="right"))
+
+    def quantile(self, q: float) -> float:
+        """Return the q-quantile of the total scores, interpolating like `np.quantile`."""
+        self._flush()
+        if self.count == 0:
+            return 0.0
+        position = q * (self.count - 1)
+        lower = int(np.floor(position))
+        lower_score = self._score_at_rank(lower)
+        upper_score = self._score_at_rank(min(lower + 1, self.count - 1))
+        return lower_score + (upper_score - lower_score) * (position - lower)
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def bonus_percentage(self) -> float:
+        self._flush()
+        return self.bonus_count / self.count * 100 if self.count > 0 else 0.0
+
+    def mean_confidence_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """Return the normal-approximation confidence interval of the mean total score."""
+        self._flush()
+        if self.count < 2:
+            return float("-inf"), float("inf")
+        # Standard error from the sample variance, n - 1 in the denominator
+        half_width = _z_score(confidence) * float(np.sqrt(self.variance() / (self.count - 1)))
+        mean = self.mean()
+        return mean - half_width, mean + half_width
+
+    def bonus_percentage_confidence_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        """Return the Agresti-Coull confidence interval of the bonus percentage."""
+        self._flush()
+        if self.count == 0:
+            return 0.0, 100.0
+        z = _z_score(confidence)
+        count = self.count + z * z
+        p = (self.bonus_count + z * z / 2) / count
+        half_width = z * float(np.sqrt(p * (1 - p) / count))
+        return max(0.0, p - half_width) * 100, min(1.0, p + half_width) * 100
+
+    def category_fill_rates(self) -> Dict[Category, float]:
+        """Return the share of games where each category was filled with a nonzero score."""
+        self._flush()
+        rates = (self.category_filled - self.category_zeros) / max(self.count, 1)
+        return dict(zip(Category, rates.tolist()))
+
+    def category_zero_rates(self) -> Dict[Category, float]:
+        """Return the share of games where each category was scratched with a zero."""
+        self._flush()
+        return dict(zip(Category, (self.category_zeros / max(self.count, 1)).tolist()))
+
+    def category_averages(self) -> Dict[Category, float]:
+        """Return the average score of each category over the games where it was filled."""
+        self._flush()
+        averages = self.category_sums / np.maximum(self.category_filled, 1)
+        return dict(zip(Category, averages.tolist()))
+
+
+def _z_score(confidence: float) -> float:
+    """Return the two-sided standard normal quantile of a confidence level."""
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+    return NormalDist().inv_cdf((1 + confidence) / 2)
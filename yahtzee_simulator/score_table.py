@@ -0,0 +1,102 @@
+from itertools import combinations_with_replacement, product
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from yahtzee_simulator.score_category import Category, Dice
+
+CATEGORIES: List[Category] = list(Category)
+CATEGORY_INDEX: Dict[Category, int] = {cat: i for i, cat in enumerate(CATEGORIES)}
+
+
+def calculate_score(dice: Dice, category: Category) -> int:
+    """Return the points a roll scores in the given category, computed from scratch."""
+    counts = {i: dice.count(i) for i in range(1, 7)}
+    # Return the maximum possible score for the category
+    if category == Category.ONES:
+        return counts[1] * 1
+    if category == Category.TWOS:
+        return counts[2] * 2
+    if category == Category.THREES:
+        return counts[3] * 3
+    if category == Category.FOURS:
+        return counts[4] * 4
+    if category == Category.FIVES:
+        return counts[5] * 5
+    if category == Category.SIXES:
+        return counts[6] * 6
+    if category == Category.PAIR:
+        pairs = [val for val, count in counts.items() if count >= 2]
+        return max(pairs) * 2 if pairs else 0
+    if category == Category.TWO_PAIR:
+        pairs = [val for val, count in counts.items() if count >= 2]
+        if len(pairs) >= 2:
+            top_two = sorted(pairs, reverse=True)[:2]
+            return sum(val * 2 for val in top_two)
+        return 0
+    if category == Category.THREE_OF_KIND:
+        triples = [val for val, cnt in counts.items() if cnt >= 3]
+        return max(triples) * 3 if triples else 0
+    if category == Category.FOUR_OF_KIND:
+        quads = [val for val, cnt in counts.items() if cnt >= 4]
+        return max(quads) * 4 if quads else 0
+    if category == Category.SMALL_STRAIGHT:
+        return 15 if set(dice) == {1, 2, 3, 4, 5} else 0
+    if category == Category.LARGE_STRAIGHT:
+        return 20 if set(dice) == {2, 3, 4, 5, 6} else 0
+    if category == Category.FULL_HOUSE:
+        return sum(dice) if sorted(counts.values(), reverse=True)[:2] in ([3, 2], [2, 3]) else 0
+    if category == Category.YAHTZEE:
+        return 50 if any(v == 5 for v in counts.values()) else 0
+    if category == Category.CHANCE:
+        return sum(dice)
+
+    raise ValueError(f"Unknown category: {category}")
+
+
+# The 252 distinct rolls of five dice, each stored sorted.
+ROLLS: List[Dice] = list(combinations_with_replacement(range(1, 7), 5))
+
+# Score of every roll in every category, indexed [roll, category].
+ROLL_SCORES: List[Tuple[int, ...]] = [
+    tuple(calculate_score(roll, cat) for cat in CATEGORIES) for roll in ROLLS
+]
+SCORE_TABLE: np.ndarray = np.array(ROLL_SCORES, dtype=np.int16)
+
+# Maps every ordered roll (all 6^5 of them) to the index of its sorted roll,
+# so lookups never have to sort or count the dice.
+ROLL_INDEX: Dict[Tuple[int, ...], int] = {}
+for _index, _roll in enumerate(ROLLS):
+    ROLL_INDEX[_roll] = _index
+for _dice in product(range(1, 7), repeat=5):
+    ROLL_INDEX[_dice] = ROLL_INDEX[tuple(sorted(_dice))]
+del _index, _roll, _dice
+
+
+def roll_scores(dice: Dice) -> Tuple[int, ...]:
+    """Return the score of the roll in every category, in `Category` order."""
+    try:
+        return ROLL_SCORES[ROLL_INDEX[dice]]
+    except (KeyError, TypeError):
+        # Not a regular roll of five dice (e.g. a list or out-of-range values)
+        return tuple(calculate_score(dice, cat) for cat in CATEGORIES)
+
+
+# Same mapping for NumPy: an ordered roll encoded as a base-6 number (see
+# `roll_indices`) indexes the position of its sorted roll in `ROLLS`.
+_DIGIT_WEIGHTS = np.array([6 ** 4, 6 ** 3, 6 ** 2, 6, 1], dtype=np.int32)
+ROLL_CODE_INDEX: np.ndarray = np.array(
+    [ROLL_INDEX[dice] for dice in product(range(1, 7), repeat=5)], dtype=np.int16
+)
+
+
+def roll_indices(dice: np.ndarray) -> np.ndarray:
+    """Return the `ROLLS` index of every row in an (n, 5) array of dice."""
+    return ROLL_CODE_INDEX[(dice.astype(np.int32) - 1) @ _DIGIT_WEIGHTS]
+
+
+def total_scores(category_scores: np.ndarray) -> np.ndarray:
+    """Return the total score, bonus included, of every row of (n, 15) category scores (-1 if unfilled)."""
+    values = np.maximum(category_scores, 0).astype(np.int64)
+    upper = values[:, :6].sum(axis=1)
+    return values.sum(axis=1) + 50 * (upper >= 63)
@@ -1,17 +1,88 @@
+from array import array
+from collections.abc import MutableMapping
 from enum import Enum, auto
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
 from yahtzee_simulator.score_category import Category, Dice
+from yahtzee_simulator.score_table import CATEGORIES, CATEGORY_INDEX, roll_scores
+
+UPPER_CATEGORIES: List[Category] = CATEGORIES[:6]
+FULL_MASK = (1 << len(CATEGORIES)) - 1
 
 class Scorecard:
-    """Represents a Yahtzee scorecard."""
+    """
+    Represents a Yahtzee scorecard.
+
+    Filled categories are tracked in a bitmask (bit i is the i:th category in `Category`
+    order) and the upper subtotal and total are kept up to date by `set_score`.
+    """
+
+    __slots__ = ("_filled", "_values", "_upper", "_total")
 
     def __init__(self) -> None:
-        self.scores: Dict[Category, Optional[int]] = {cat: None for cat in Category}
+        self._filled = 0
+        self._values = array("B", bytes(len(CATEGORIES)))  # Only meaningful for filled categories
+        self._upper = 0
+        self._total = 0  # Without the upper section bonus
+
+    @classmethod
+    def from_category_scores(cls, category_scores: List[int]) -> "Scorecard":
+        """Rebuild a scorecard from `category_scores()`, -1 marking unfilled categories."""
+        scorecard = cls()
+        for i, score in enumerate(category_scores):
+            if score >= 0:
+                scorecard._filled |= 1 << i
+                scorecard._values[i] = score
+                scorecard._total += score
+                if i < 6:
+                    scorecard._upper += score
+        return scorecard
+
+    @property
+    def scores(self) -> "ScoresView":
+        """Score per category, None for unfilled ones, as a dict-like view of the scorecard."""
+        return ScoresView(self)
+
+    @scores.setter
+    def scores(self, scores: Mapping[Category, Optional[int]]) -> None:
+        view = ScoresView(self)
+        for category in CATEGORIES:
+            view[category] = scores.get(category)
+
+    def _put(self, index: int, score: Optional[int]) -> None:
+        """Set the score of the index:th category, or unfill it with None, keeping the totals up to date."""
+        if self._filled >> index & 1:
+            old = self._values[index]
+            self._filled &= ~(1 << index)
+            self._total -= old
+            if index < 6:
+                self._upper -= old
+        if score is None:
+            return
+        self._values[index] = score
+        self._filled |= 1 << index
+        self._total += score
+        if index < 6:
+            self._upper += score
+
+    def get_score(self, category: Category) -> Optional[int]:
+        """Return the score of a category, or None if it is unfilled."""
+        i = CATEGORY_INDEX[category]
+        return self._values[i] if self._filled >> i & 1 else None
+
+    def category_scores(self) -> List[int]:
+        """Return the score of every category in `Category` order, -1 for unfilled ones."""
+        filled = self._filled
+        return [value if filled >> i & 1 else -1 for i, value in enumerate(self._values)]
+
+    def filled_mask(self) -> int:
+        """Return the bitmask of filled categories, bit i for the i:th category in `Category`."""
+        return self._filled
 
     def __str__(self) -> str:
         lines = []
+        scores = self.scores
         for category in Category:
-            score = self.scores[category]
+            score = scores[category]
             score_str = str(score) if score is not None else "-"
             lines.append(f"{category.code:<20} {score_str}")
         lines.append("-" * 22)
@@ -22,102 +93,68 @@ class Scorecard:
 
     def is_complete(self) -> bool:
         """Return True if all categories are filled."""
-        return all(v is not None for v in self.scores.values())
+        return self._filled == FULL_MASK
 
     def available_categories(self) -> List[Category]:
         """Return a list of unfilled categories."""
-        return [cat for cat, val in self.scores.items() if val is None]
+        filled = self._filled
+        return [cat for i, cat in enumerate(CATEGORIES) if not filled >> i & 1]
 
     def total_score(self) -> int:
         """Return the total score including upper section bonus."""
-        base = sum(v or 0 for v in self.scores.values())
-        if self.upper_section_score() >= 63:
-            base += 50
-        return base
+        return self._total + 50 if self._upper >= 63 else self._total
     
     def has_bonus(self) -> bool:
         """Return True if the upper section bonus has been achieved."""
-        return self.upper_section_score() >= 63
+        return self._upper >= 63
     
     def upper_categories(self) -> list[Category]:
-        return [
-            Category.ONES,
-            Category.TWOS,
-            Category.THREES,
-            Category.FOURS,
-            Category.FIVES,
-            Category.SIXES,
-        ]
+        """Return the upper section categories. The list is shared, do not modify it."""
+        return UPPER_CATEGORIES
     
     def is_upper_section(self, cat: Category) -> bool:
-        return cat in self.upper_categories()
+        return CATEGORY_INDEX[cat] < 6
 
     def upper_section_score(self) -> int:
         """Return the subtotal for the upper section (ones–sixes)."""
-        return sum(self.scores[c] or 0 for c in self.upper_categories())
+        return self._upper
 
     def score_for_category(self, dice: Dice, category: Category) -> int:
         """Return the points this roll would score in the given category."""
-        counts = {i: dice.count(i) for i in range(1, 7)}
-        # Return the maximum possible score for the category
-        if category == Category.ONES:
-            return counts[1] * 1
-        if category == Category.TWOS:
-            return counts[2] * 2
-        if category == Category.THREES:
-            return counts[3] * 3
-        if category == Category.FOURS:
-            return counts[4] * 4
-        if category == Category.FIVES:
-            return counts[5] * 5
-        if category == Category.SIXES:
-            return counts[6] * 6
-        if category == Category.PAIR:
-            pairs = [val for val, count in counts.items() if count >= 2]
-            return max(pairs) * 2 if pairs else 0
-        if category == Category.TWO_PAIR:
-            pairs = [val for val, count in counts.items() if count >= 2]
-            if len(pairs) >= 2:
-                top_two = sorted(pairs, reverse=True)[:2]
-                return sum(val * 2 for val in top_two)
-            return 0
-        if category == Category.THREE_OF_KIND:
-            triples = [val for val, cnt in counts.items() if cnt >= 3]
-            return max(triples) * 3 if triples else 0
-        if category == Category.FOUR_OF_KIND:
-            quads = [val for val, cnt in counts.items() if cnt >= 4]
-            return max(quads) * 4 if quads else 0
-        if category == Category.SMALL_STRAIGHT:
-            return 15 if set(dice) == {1, 2, 3, 4, 5} else 0
-        if category == Category.LARGE_STRAIGHT:
-            return 20 if set(dice) == {2, 3, 4, 5, 6} else 0
-        if category == Category.FULL_HOUSE:
-            return sum(dice) if sorted(counts.values(), reverse=True)[:2] in ([3, 2], [2, 3]) else 0
-        if category == Category.YAHTZEE:
-            return 50 if any(v == 5 for v in counts.values()) else 0
-        if category == Category.CHANCE:
-            return sum(dice)
-
-        raise ValueError(f"Unknown category: {category}")
+        index = CATEGORY_INDEX.get(category)
+        if index is None:
+            raise ValueError(f"Unknown category: {category}")
+        return roll_scores(dice)[index]
 
     def set_score(self, dice: Dice, category: Category) -> None:
         """Fill a category with the score from this roll."""
-        if self.scores[category] is not None:
+        index = CATEGORY_INDEX.get(category)
+        if index is None:
+            raise ValueError(f"Unknown category: {category}")
+        if self._filled >> index & 1:
             raise ValueError(f"Category {category} already filled.")
-        self.scores[category] = self.score_for_category(dice, category)
+        score = roll_scores(dice)[index]
+        self._filled |= 1 << index
+        self._values[index] = score
+        self._total += score
+        if index < 6:
+            self._upper += score
 
     def get_available_categories_with_scores(self, dice: Dice) -> Dict[Category, int]:
         """Return a dictionary of available categories that give a nonzero score."""
+        row = roll_scores(dice)
+        filled = self._filled
         return {
             cat: score
-            for cat in self.available_categories()
-            if (score := self.score_for_category(dice, cat)) > 0
+            for i, cat in enumerate(CATEGORIES)
+            if not filled >> i & 1 and (score := row[i]) > 0
         }
     
     def print_scorecard(self):
         """Print the current state of the scorecard."""
+        scores = self.scores
         for category in Category:
-            score = self.scores[category]
+            score = scores[category]
             score_str = str(score) if score is not None else "-"
             print(f"{category.name.replace('_', ' ').title():<20} {score_str}")
         print("-" * 22)
@@ -126,4 +163,42 @@ class Scorecard:
         print()
         print(f"{'Total Score':<20} {self.total_score()}")
         print()
-        print('' * 40)
\ No newline at end of file
+        print('' * 40)
+
+class ScoresView(MutableMapping):
+    """
+    The scores of a scorecard by category, None for unfilled ones.
+
+    Holds no data of its own: reads come from the scorecard, and setting a score, or None
+    to unfill a category, updates its totals as `set_score` does.
+    """
+
+    __slots__ = ("_scorecard",)
+
+    def __init__(self, scorecard: Scorecard) -> None:
+        self._scorecard = scorecard
+
+    def __getitem__(self, category: Category) -> Optional[int]:
+        if category not in CATEGORY_INDEX:
+            raise KeyError(category)
+        return self._scorecard.get_score(category)
+
+    def __setitem__(self, category: Category, score: Optional[int]) -> None:
+        index = CATEGORY_INDEX.get(category)
+        if index is None:
+            raise KeyError(category)
+        if score is not None and not 0 <= score <= 255:
+            raise ValueError(f"Score {score} of {category} is outside 0 to 255.")
+        self._scorecard._put(index, score)
+
+    def __delitem__(self, category: Category) -> None:
+        raise TypeError("Categories cannot be removed from a scorecard, set them to None to unfill them.")
+
+    def __iter__(self) -> Iterator[Category]:
+        return iter(CATEGORIES)
+
+    def __len__(self) -> int:
+        return len(CATEGORIES)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
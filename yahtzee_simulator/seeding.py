@@ -0,0 +1,22 @@
+import secrets
+
+_MASK_64 = (1 << 64) - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def new_seed() -> int:
+    """Return a fresh random 64-bit seed from the operating system."""
+    return secrets.randbits(64)
+
+
+def game_seed(seed: int, game_index: int) -> int:
+    """
+    Return the seed of a single game in a seeded run.
+
+    Every game gets its own stream, derived from the run seed and the game's index
+    with SplitMix64, so a game plays out the same no matter which worker runs it.
+    """
+    z = (seed + (game_index + 1) * _GOLDEN_GAMMA) & _MASK_64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return z ^ (z >> 31)
@@ -1,61 +1,478 @@
+from yahtzee_simulator.atomic_file import atomic_write
 from yahtzee_simulator.game import Game
 from yahtzee_simulator.strategy import Strategy
 from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.score_statistics import ScoreStatistics
+from yahtzee_simulator.score_table import total_scores
+from yahtzee_simulator.results import TOTALS_FILE, Results, ResultsWriter, SCORE_DTYPE, truncate_results
+from yahtzee_simulator.dice_source import DiceSource, RandomDiceSource
+from yahtzee_simulator.profiling import DecisionProfile
+from yahtzee_simulator.seeding import new_seed
+from yahtzee_simulator.trace import GameTrace, write_traces
+
+from yahtzee_simulator import dice_source as dice_sources, plotting, run_index
 
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.ticker as mticker
 
 import os
 import json
+import math
+import pickle
+import sqlite3
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+DiceSourceFactory = Callable[[Optional[int]], DiceSource]
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def simulate_games(strategy: Strategy, start: int, count: int, seed: int,
+                   dice_source: DiceSourceFactory = RandomDiceSource,
+                   keep_scorecards: bool = True,
+                   profile: bool = False) -> Tuple[np.ndarray, List[Scorecard], Optional[DecisionProfile]]:
+    """
+    Play games `start` to `start + count - 1` of a seeded run.
+
+    Returns the (count, 15) category scores of the games, their scorecards if
+    `keep_scorecards` is set, and their timings if `profile` is set.
+    """
+    source = dice_source(seed)
+    decision_profile = DecisionProfile() if profile else None
+    category_scores = []
+    scorecards = []
+    for i in range(start, start + count):
+        source.start_game(i)
+        game = Game(strategy, source, profile=decision_profile)
+        game.play_game()
+        category_scores.append(game.scorecard.category_scores())
+        if keep_scorecards:
+            scorecards.append(game.scorecard)
+    return np.array(category_scores, dtype=SCORE_DTYPE).reshape(-1, len(Category)), scorecards, decision_profile
+
+
+def create_run_folder(name: str, base_folder: str = "results") -> Tuple[str, str]:
+    """
+    Create a new folder for a run under `base_folder/name` and return it with its timestamp.
+
+    Folders are named after the time, and numbered if several runs start within a second.
+    """
+    strategy_folder = os.path.join(base_folder, name)
+    os.makedirs(strategy_folder, exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    run_name = f"run_{timestamp}"
+    number = 1
+    while True:
+        try:
+            os.makedirs(os.path.join(strategy_folder, run_name))
+            return os.path.join(strategy_folder, run_name), timestamp
+        except FileExistsError:
+            number += 1
+            run_name = f"run_{timestamp}_{number}"
 
 
 class Simulator:
-    def __init__(self, strategy: Strategy, number_of_games: int, trace_history: bool = False) -> None:
+    def __init__(self, strategy: Strategy, number_of_games: int, trace_history: bool = False,
+                 workers: Optional[int] = None, seed: Optional[int] = None,
+                 dice_source: DiceSourceFactory = RandomDiceSource, keep_scorecards: bool = True,
+                 save_plots: bool = True, profile: bool = False, precision: Optional[float] = None,
+                 bonus_precision: Optional[float] = None, time_budget: Optional[float] = None,
+                 confidence: float = 0.95, check_every: int = 1000, checkpoint_every: Optional[int] = None,
+                 resume: Optional[str] = None) -> None:
+        """
+        Args:
+            strategy: Strategy used to play every game.
+            number_of_games: Number of games to simulate.
+            trace_history: Print the history of every game. To look at a few games, e.g.
+                the outliers, `replay` them after the run instead.
+            workers: Number of processes to spread the games over. Defaults to a single process.
+            seed: Seed that makes the run reproducible. Every game is seeded from it and its
+                index, so the results do not depend on the number of workers and any game
+                can be replayed. Picked at random if not given.
+            dice_source: `DiceSource` class, or any callable taking the seed, that creates
+                the dice source of the run. `NumpyDiceSource` generates the dice in bulk.
+            keep_scorecards: Keep the scorecard and score of every game. When off, only the
+                constant-size `statistics` are kept, which is what very long runs need.
+            save_plots: Save histogram plots with the results. They are drawn on a
+                background thread, see `wait_for_plots`.
+            profile: Time every strategy decision, turn, roll and scoring into
+                `profile_stats`, which is also saved in the summary. Off by default, as
+                timing every call slows the run down.
+            precision: Stop early once the confidence interval of the average score is at
+                most this many points to either side of it. `number_of_games` is then the
+                most games to play.
+            bonus_precision: Stop early once the confidence interval of the bonus
+                percentage is at most this many percentage points to either side of it.
+                With `precision` also set, both must be reached.
+            time_budget: Stop early once this many seconds have passed.
+            confidence: Confidence level of the intervals.
+            check_every: Games between checks of the stopping rules. Parallel runs that can
+                stop early use shards of this size, so a seeded run stops after the same
+                games for any number of workers.
+            checkpoint_every: Write a checkpoint to the run folder every this many games,
+                so an interrupted run can be resumed.
+            resume: Run folder of an interrupted run to continue from its last checkpoint.
+                The strategy and dice source must be the same as in the interrupted run,
+                and the final results are the same as if it had never stopped. The
+                profile continues from the checkpoint if the interrupted run was profiled
+                too, and only covers the resumed games otherwise. Runs that finished
+                cannot be resumed.
+        """
+        if check_every < 1:
+            raise ValueError(f"check_every must be at least 1, got {check_every}.")
+        if resume is not None and not os.path.exists(os.path.join(resume, CHECKPOINT_FILE)):
+            raise ValueError(f"{resume} has no checkpoint to resume from, was it run with checkpoint_every?")
         self.strategy = strategy
         self.number_of_games = number_of_games
         self.trace_history = trace_history
-
+        self.workers = workers
+        self.seed = seed
+        self.dice_source = dice_source
+        self.keep_scorecards = keep_scorecards
+        self.save_plots = save_plots
+        self.profile = profile
+        self.precision = precision
+        self.bonus_precision = bonus_precision
+        self.time_budget = time_budget
+        self.confidence = confidence
+        self.check_every = check_every
+        self.checkpoint_every = checkpoint_every
+        self.resume = resume
+        # Why the run stopped: "number_of_games", "precision" or "time_budget"
+        self.stop_reason: Optional[str] = None
+        self._start_time = 0.0
+        self._last_checkpoint = 0
+
+        self.statistics = ScoreStatistics()
         self.game_scorecards: List[Scorecard] = []
-        self.scores = np.zeros(self.number_of_games, dtype=int)
+        self.game_traces: List[GameTrace] = []
+        self.profile_stats: Optional[DecisionProfile] = DecisionProfile() if profile else None
+        self.scores = np.zeros(self.number_of_games if keep_scorecards else 0, dtype=int)
+        self.run_folder: Optional[str] = None
+        self.timestamp: Optional[str] = None
+        self._results_writer: Optional[ResultsWriter] = None
+        self._plot_thread: Optional[threading.Thread] = None
 
 
     def run(self):
-        for i in range(self.number_of_games):
+        self._start_time = time.perf_counter()
+        self.stop_reason = "number_of_games"
+        first_game = 0
+        if self.resume is not None:
+            first_game = self._load_checkpoint()
+        else:
+            self._create_run_folder()
+            if self.seed is None:
+                # Resuming and replaying games need the seeds of the games, which follow from this
+                self.seed = new_seed()
+        self._last_checkpoint = first_game
+        self._results_writer = ResultsWriter(self.run_folder)
+        try:
+            if self._use_workers():
+                self._run_parallel(first_game)
+            else:
+                self._run_serial(first_game)
+            if self.checkpoint_every is not None:
+                # Marks the run as finished, so resuming it does not play more games
+                self._checkpoint(self.number_of_games, finished=True)
+        finally:
+            self._results_writer.close()
+
+        self.save_results()
+
+    @staticmethod
+    def load_results(run_folder: str) -> Results:
+        """Memory-map the per-game results saved in a run folder."""
+        return Results(run_folder)
+
+    @classmethod
+    def from_run_folder(cls, run_folder: str, strategy: Strategy,
+                        dice_source: Optional[DiceSourceFactory] = None) -> "Simulator":
+        """
+        Return a simulator of a saved run, to `replay` its games with the same strategy.
+
+        The dice source is looked up by the name the run recorded, pass the `dice_source`
+        the run used if it is not one of the classes in `dice_source`.
+        """
+        with open(os.path.join(run_folder, "summary.json")) as f:
+            summary = json.load(f)
+        if dice_source is None:
+            name = summary.get("dice_source", "RandomDiceSource")
+            dice_source = getattr(dice_sources, name, None)
+            if not (isinstance(dice_source, type) and issubclass(dice_source, DiceSource)):
+                raise ValueError(f"The run used the dice source {name!r}, which is not a class in "
+                                 "yahtzee_simulator.dice_source. Pass the dice_source it used.")
+        simulator = cls(strategy, summary["number_of_games"], seed=summary["seed"], dice_source=dice_source,
+                        keep_scorecards=False, save_plots=False)
+        simulator.run_folder = run_folder
+        simulator.timestamp = summary.get("time")
+        return simulator
+
+    def replay(self, game_index: int) -> Game:
+        """
+        Play one game of the run again with tracing on, and return it.
+
+        The dice of a game only depend on the run seed and the game's index, so with a
+        deterministic strategy the game plays out exactly as it did in the run. Print
+        it with `Game.print_history`.
+        """
+        if self.seed is None:
+            raise ValueError("The run has no seed yet, games can only be replayed after `run`.")
+        if not 0 <= game_index < self.number_of_games:
+            raise IndexError(f"Game {game_index} is not in a run of {self.number_of_games} games.")
+        source = self.dice_source(self.seed)
+        source.start_game(game_index)
+        game = Game(self.strategy, source, trace=True)
+        game.play_game()
+        totals = self._recorded_totals()
+        if totals is not None and game_index < len(totals) and totals[game_index] != game.scorecard.total_score():
+            warnings.warn(
+                f"Game {game_index} scored {game.scorecard.total_score()} when replayed but "
+                f"{totals[game_index]} in the run, is the strategy deterministic?"
+            )
+        return game
+
+    def extreme_games(self, fraction: float = 0.001) -> Tuple[List[int], List[int]]:
+        """
+        Return the indices of the lowest and of the highest scoring `fraction` of the games,
+        at least one of each, from the worst and from the best.
+        """
+        totals = self._recorded_totals()
+        if totals is None or len(totals) == 0:
+            raise ValueError("No per-game results to pick games from, run the simulator first.")
+        count = min(len(totals), max(1, math.ceil(len(totals) * fraction)))
+        order = np.argsort(totals, kind="stable")
+        return order[:count].tolist(), order[::-1][:count].tolist()
+
+    def _recorded_totals(self) -> Optional[np.ndarray]:
+        """The total score of every game played, from memory or the run folder."""
+        if self.keep_scorecards and self.statistics.count:
+            return self.scores
+        if self.run_folder is not None and os.path.exists(os.path.join(self.run_folder, TOTALS_FILE)):
+            return Results(self.run_folder).totals
+        return None
+
+    def _use_workers(self) -> bool:
+        if self.workers is None or self.workers <= 1 or self.number_of_games == 0:
+            return False
+        if self.trace_history:
+            warnings.warn("trace_history is only supported in a single process, ignoring workers.")
+            return False
+        try:
+            pickle.dumps(self.strategy)
+        except Exception as e:
+            warnings.warn(
+                f"{self.strategy.__class__.__name__} cannot be pickled ({e}), "
+                "running in a single process instead."
+            )
+            return False
+        return True
+
+    def _run_serial(self, first_game: int = 0):
+        source = self.dice_source(self.seed)
+        self.seed = source.seed
+        for i in range(first_game, self.number_of_games):
             print(f"Simulating game {i + 1} / {self.number_of_games}", end="\r")
-            game = Game(self.strategy)
+            source.start_game(i)
+            game = Game(self.strategy, source, trace=self.trace_history, profile=self.profile_stats)
             game.play_game()
-            self.scores[i] = game.scorecard.total_score()
-            self.game_scorecards.append(game.scorecard)  # optional if you still want full scorecards
+            self._record_game(i, game.scorecard)
 
             if self.trace_history:
+                self.game_traces.append(game.trace)
                 print(f"History for game {i + 1}:")
                 game.print_history()
                 print()
 
-        self.save_results()
+            if self.checkpoint_every is not None and (i + 1) % self.checkpoint_every == 0:
+                self._checkpoint(i + 1)
+            if (i + 1) % self.check_every == 0 and self._can_stop_early() and self._should_stop():
+                self._stop_after(i + 1)
+                break
+
+    def _run_parallel(self, first_game: int = 0):
+        if self.seed is None:
+            self.seed = new_seed()
+        if self._can_stop_early():
+            # Shards end where the serial run checks the stopping rules
+            shard_size = self.check_every
+        else:
+            # Several shards per worker keep the processes busy until the end of the run
+            shard_size = max(1, min(10_000, math.ceil(self.number_of_games / (self.workers * 8))))
+        starts = self._shard_starts(first_game, shard_size)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            # Shards are submitted a few at a time and collected in order
+            pending = deque()
+            for start in starts:
+                pending.append(self._submit_shard(executor, start, shard_size))
+                if len(pending) >= self.workers * 2:
+                    break
+            while pending:
+                start, count, shard = pending.popleft()
+                category_scores, scorecards, profile = shard.result()
+                if profile is not None:
+                    self.profile_stats.merge(profile)
+                self.statistics.add_batch(category_scores)
+                self._results_writer.add_batch(category_scores)
+                if self.keep_scorecards:
+                    self.scores[start:start + count] = total_scores(category_scores)
+                    self.game_scorecards.extend(scorecards)
+                print(f"Simulating game {start + count} / {self.number_of_games}", end="\r")
+
+                if self.checkpoint_every is not None and start + count - self._last_checkpoint >= self.checkpoint_every:
+                    self._checkpoint(start + count)
+                if ((start + count) % self.check_every == 0 and self._can_stop_early()
+                        and self._should_stop()):
+                    for _, _, future in pending:
+                        future.cancel()
+                    self._stop_after(start + count)
+                    break
+                start = next(starts, None)
+                if start is not None:
+                    pending.append(self._submit_shard(executor, start, shard_size))
+
+    def _shard_starts(self, first_game: int, shard_size: int) -> Iterator[int]:
+        """Yield the first game of every shard. Shards end at multiples of the shard size, also when resuming."""
+        start = first_game
+        while start < self.number_of_games:
+            yield start
+            start += shard_size - start % shard_size
+
+    def _submit_shard(self, executor: ProcessPoolExecutor, start: int, shard_size: int):
+        count = min(shard_size - start % shard_size, self.number_of_games - start)
+        future = executor.submit(simulate_games, self.strategy, start, count, self.seed,
+                                 self.dice_source, self.keep_scorecards, self.profile)
+        return start, count, future
+
+    def _checkpoint(self, completed: int, finished: bool = False):
+        """
+        Atomically save everything needed to continue the run after `completed` games, or
+        that the run is `finished`.
+        """
+        # The results must be on disk before the checkpoint that counts them
+        self._results_writer.sync()
+        checkpoint = {
+            "completed": completed,
+            "number_of_games": self.number_of_games,
+            "seed": self.seed,
+            "strategy": self.strategy.__class__.__name__,
+            "dice_source": getattr(self.dice_source, "__name__", self.dice_source.__class__.__name__),
+            "time": self.timestamp,
+            "statistics": self.statistics.to_dict(),
+            "profile": self.profile_stats.to_dict() if self.profile_stats is not None else None,
+            # Why the run stopped, None while it is still going
+            "stop_reason": self.stop_reason if finished else None,
+        }
+        with atomic_write(os.path.join(self.run_folder, CHECKPOINT_FILE), "w") as f:
+            json.dump(checkpoint, f)
+        self._last_checkpoint = completed
+
+    def _load_checkpoint(self) -> int:
+        """Restore the state of the run to resume and return the number of games it completed."""
+        with open(os.path.join(self.resume, CHECKPOINT_FILE)) as f:
+            checkpoint = json.load(f)
+        strategy_name = self.strategy.__class__.__name__
+        dice_source_name = getattr(self.dice_source, "__name__", self.dice_source.__class__.__name__)
+        if checkpoint["strategy"] != strategy_name or checkpoint["dice_source"] != dice_source_name:
+            raise ValueError(
+                f"{self.resume} is a run of {checkpoint['strategy']} with {checkpoint['dice_source']}, "
+                f"not {strategy_name} with {dice_source_name}."
+            )
+        if self.seed is not None and self.seed != checkpoint["seed"]:
+            raise ValueError(f"{self.resume} was run with seed {checkpoint['seed']}, not {self.seed}.")
+
+        completed = checkpoint["completed"]
+        if checkpoint.get("stop_reason") is not None:
+            raise ValueError(f"{self.resume} already finished after {completed} games "
+                             f"({checkpoint['stop_reason']}), there is nothing to resume.")
+        if completed > self.number_of_games:
+            raise ValueError(f"{self.resume} has already played {completed} games, more than {self.number_of_games}.")
+        self.seed = checkpoint["seed"]
+        self.run_folder = self.resume
+        self.timestamp = checkpoint["time"]
+        self.statistics = ScoreStatistics.from_dict(checkpoint["statistics"])
+        if self.profile_stats is not None and checkpoint.get("profile") is not None:
+            self.profile_stats = DecisionProfile.from_dict(checkpoint["profile"])
+        # Games written after the checkpoint are played again
+        truncate_results(self.run_folder, completed)
+        if self.keep_scorecards:
+            results = Results(self.run_folder)
+            self.scores[:completed] = results.totals
+            self.game_scorecards = [Scorecard.from_category_scores(row) for row in results.category_scores.tolist()]
+        return completed
+
+    def _can_stop_early(self) -> bool:
+        return self.precision is not None or self.bonus_precision is not None or self.time_budget is not None
+
+    def _should_stop(self) -> bool:
+        """Return True once the requested precision is reached or the time budget has run out."""
+        if self.time_budget is not None and time.perf_counter() - self._start_time >= self.time_budget:
+            self.stop_reason = "time_budget"
+            return True
+        if self.precision is None and self.bonus_precision is None:
+            return False
+        if self.precision is not None:
+            low, high = self.average_score_confidence_interval()
+            if (high - low) / 2 > self.precision:
+                return False
+        if self.bonus_precision is not None:
+            low, high = self.bonus_percentage_confidence_interval()
+            if (high - low) / 2 > self.bonus_precision:
+                return False
+        self.stop_reason = "precision"
+        return True
+
+    def _stop_after(self, number_of_games: int):
+        """End the run after the given number of games."""
+        self.number_of_games = number_of_games
+        if self.keep_scorecards:
+            self.scores = self.scores[:number_of_games]
+
+    def _record_game(self, index: int, scorecard: Scorecard):
+        self.statistics.add(scorecard)
+        if self._results_writer is not None:
+            self._results_writer.add(scorecard)
+        if self.keep_scorecards:
+            self.scores[index] = scorecard.total_score()
+            self.game_scorecards.append(scorecard)
 
     
     def average_score(self) -> float:
-        return float(np.mean(self.scores)) if self.number_of_games > 0 else 0.0
+        return self.statistics.mean()
 
     def median_score(self) -> float:
-        return float(np.median(self.scores)) if self.number_of_games > 0 else 0.0
+        return self.statistics.median()
 
     def best_score(self) -> int:
-        return int(np.max(self.scores)) if self.number_of_games > 0 else 0
+        return self.statistics.best()
 
     def worst_score(self) -> int:
-        return int(np.min(self.scores)) if self.number_of_games > 0 else 0
+        return self.statistics.worst()
 
     def standard_deviation(self) -> float:
-        return float(np.std(self.scores)) if self.number_of_games > 0 else 0.0
+        return self.statistics.standard_deviation()
 
     def get_bonus_percentage(self) -> float:
-        return sum(1 for sc in self.game_scorecards if sc.has_bonus()) / self.number_of_games * 100 if self.number_of_games > 0 else 0.0
+        return self.statistics.bonus_percentage()
+
+    def average_score_confidence_interval(self) -> Tuple[float, float]:
+        return self.statistics.mean_confidence_interval(self.confidence)
+
+    def bonus_percentage_confidence_interval(self) -> Tuple[float, float]:
+        return self.statistics.bonus_percentage_confidence_interval(self.confidence)
     
     def print_summary(self):
         print(f"Average score over {self.number_of_games} games: {self.average_score()}")
@@ -63,111 +480,42 @@ class Simulator:
         print(f"Worst score: {self.worst_score()}")
         print(f"Standard deviation: {self.standard_deviation()}")
         print(f"Median score: {self.median_score()}")
+        if self.statistics.count > 1:
+            low, high = self.average_score_confidence_interval()
+            print(f"{self.confidence:.0%} confidence interval of the average: {low:.2f} - {high:.2f}")
+        if self.profile_stats is not None:
+            self.profile_stats.print_summary()
     
-    def _calculate_histogram_params(self, values: np.ndarray) -> tuple[int, int, int]:
-        """
-        Calculate histogram parameters for given score values.
-
-        Args:
-            values: Array of score values.
-
-        Returns:
-            Tuple (x_min, x_max, num_bins):
-                x_min: Minimum score - 5
-                x_max: Maximum score + 5
-                num_bins: Number of unique scores + 10
-        """
-        if len(values) == 0:
-            return 0, 0, 0
-
-        min_val = int(np.min(values))
-        max_val = int(np.max(values))
-        x_min = min_val - 5
-        x_max = max_val + 5
-        num_bins = len(np.unique(values)) + 10
-
-        return x_min, x_max, num_bins
-
-
-    def plot_upper_section_frequencies(self) -> Optional[plt.Figure]:
-        upper_scores = np.array([sc.upper_section_score() for sc in self.game_scorecards])
-        if len(upper_scores) == 0:
-            return None
-
-        x_min, x_max, num_bins = self._calculate_histogram_params(upper_scores)
-
-        fig = plt.figure(figsize=(10, 6))
-
-        # Get histogram data
-        counts, bin_edges = np.histogram(upper_scores, bins=num_bins, range=(x_min, x_max))
-
-        # Color bins differently depending on whether they are below/above 63
-        bin_centers = 0.5 * (bin_edges[1:] + bin_edges[:-1])
-        colors = ['orange' if center < 63 else 'lightgreen' for center in bin_centers]
-
-        plt.bar(bin_centers, counts, width=(bin_edges[1] - bin_edges[0]), 
-                color=colors, edgecolor='black')
-
-
-        plt.title(f"Upper Section Score Distribution over {self.number_of_games} Games")
-        plt.xlabel("Upper Section Score")
-        plt.ylabel("Frequency")
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.xticks(range(x_min, x_max + 1, 5))
-        ax = plt.gca()
-        ax.yaxis.set_major_locator(mticker.MaxNLocator(nbins='auto', integer=True))
-        plt.tight_layout()
-        return fig
-
-
-
-    def plot_score_frequencies(self) -> Optional[plt.Figure]:
-        scores = np.array([scorecard.total_score() for scorecard in self.game_scorecards])
-        if len(scores) == 0:
-            return None
-
-        x_min, x_max, num_bins = self._calculate_histogram_params(scores)
-
-        fig = plt.figure(figsize=(10, 6))
-        plt.hist(
-            scores,
-            bins=num_bins,
-            range=(x_min, x_max),
-            color='lightgreen',
-            edgecolor='black'
+    def plot_upper_section_frequencies(self) -> Optional["Figure"]:
+        import matplotlib.pyplot as plt
+        return plotting.plot_upper_section_frequencies(
+            self.statistics.upper_section_histogram(), self.number_of_games, plt.figure
         )
-        plt.title(f"Score Distribution over {self.number_of_games} Games")
-        plt.xlabel("Score")
-        plt.ylabel("Frequency")
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.xticks(range(x_min, x_max + 1, 10))
-        ax = plt.gca()
-        ax.yaxis.set_major_locator(mticker.MaxNLocator(nbins='auto', integer=True))
-        plt.tight_layout()
-        return fig
 
+    def plot_score_frequencies(self) -> Optional["Figure"]:
+        import matplotlib.pyplot as plt
+        return plotting.plot_score_frequencies(self.statistics.histogram(), self.number_of_games, plt.figure)
 
-    def save_results(self):
-        # Get strategy name
-        strategy_name = self.strategy.__class__.__name__
+    def wait_for_plots(self):
+        """Block until the plots of the last `save_results` have been written."""
+        if self._plot_thread is not None:
+            self._plot_thread.join()
 
-        # Base folder for results
-        base_folder = "results"
-        strategy_folder = os.path.join(base_folder, strategy_name)
+    def _create_run_folder(self):
+        self.run_folder, self.timestamp = create_run_folder(self.strategy.__class__.__name__)
 
-        # Create folder if it doesn't exist
-        os.makedirs(strategy_folder, exist_ok=True)
+    def save_results(self):
+        if self.run_folder is None:
+            self._create_run_folder()
+        run_folder = self.run_folder
+        timestamp = self.timestamp
 
-        # Create a new subfolder for this run
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        run_folder = os.path.join(strategy_folder, f"run_{timestamp}")
-        os.makedirs(run_folder, exist_ok=True)
+        # The scores of every game are already in scores.bin and totals.bin, see load_results
 
-        # Save raw scores
-        scores_file = os.path.join(run_folder, "scores.txt")
-        with open(scores_file, "w") as f:
-            for scorecard in self.game_scorecards:
-                f.write(f"{scorecard}")
+        # Save the binary trace of every game, render with trace.read_traces(...)[i].turns()
+        if self.game_traces:
+            with open(os.path.join(run_folder, "traces.bin"), "wb") as f:
+                write_traces(f, self.game_traces)
 
         # Save summary + metadata
         summary = {
@@ -177,25 +525,33 @@ class Simulator:
             "worst": self.worst_score(),
             "std_dev": self.standard_deviation(),
             "Bonus percentage": self.get_bonus_percentage(),
+            "category_fill_rates": {cat.code: rate for cat, rate in self.statistics.category_fill_rates().items()},
+            "category_zero_rates": {cat.code: rate for cat, rate in self.statistics.category_zero_rates().items()},
             "number_of_games": self.number_of_games,
-            "time": timestamp
+            "seed": self.seed,
+            "dice_source": getattr(self.dice_source, "__name__", self.dice_source.__class__.__name__),
+            "time": timestamp,
+            # Achieved precision
+            "confidence": self.confidence,
+            "average_ci": list(self.average_score_confidence_interval()) if self.statistics.count > 1 else None,
+            "bonus_percentage_ci": list(self.bonus_percentage_confidence_interval()),
+            "stop_reason": self.stop_reason,
         }
+        if self.profile_stats is not None:
+            summary["profile"] = self.profile_stats.to_dict()
         summary_file = os.path.join(run_folder, "summary.json")
         with open(summary_file, "w") as f:
             json.dump(summary, f, indent=4)
-
-        # Save histogram plot
-        histogram = self.plot_score_frequencies()
-        histogram_file = os.path.join(run_folder, "histogram.png")
-        if histogram is not None:
-            histogram.savefig(histogram_file)
-            plt.close(histogram)
-
-        # Plot Upper section score frequencies
-        upper_histogram = self.plot_upper_section_frequencies()
-        upper_histogram_file = os.path.join(run_folder, "upper_section_histogram.png")
-        if upper_histogram is not None:
-            upper_histogram.savefig(upper_histogram_file)
-            plt.close(upper_histogram)
+        try:
+            run_index.register_run(run_folder)
+        except sqlite3.Error as e:
+            warnings.warn(f"Could not add the run to the index of runs: {e}")
+
+        # Save histogram plots from the binned counts without holding up the caller
+        if self.save_plots:
+            self._plot_thread = plotting.save_plots_in_background(
+                run_folder, self.statistics.histogram(), self.statistics.upper_section_histogram(),
+                self.number_of_games
+            )
 
         print(f"Results saved in folder: {run_folder}")
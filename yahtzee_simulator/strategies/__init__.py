@@ -1 +1,4 @@
-from .example_strategy import ExampleStrategy
\ No newline at end of file
+from .example_strategy import ExampleStrategy
+from .example_batch_strategy import ExampleBatchStrategy
+from .optimal_strategy import OptimalStrategy
+from .lookahead_strategy import LookaheadStrategy
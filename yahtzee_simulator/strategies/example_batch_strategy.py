@@ -0,0 +1,23 @@
+import numpy as np
+
+from yahtzee_simulator.batch_strategy import BatchStrategy
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.score_table import SCORE_TABLE, roll_indices
+
+MAX_SCORES = np.array([cat.max_score for cat in Category], dtype=np.int16)
+
+class ExampleBatchStrategy(BatchStrategy):
+    """Batch port of `ExampleStrategy`: keep the first roll and take its best category."""
+    def should_finish_turn(self, dice: np.ndarray, rolls_left: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        return rolls_left == 3 # Always finish after first roll
+
+    def choose_dice_to_keep(self, dice: np.ndarray, rolls_left: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        return np.ones(dice.shape, dtype=bool)
+
+    def choose_category(self, dice: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        open_categories = scores < 0
+        possible = np.where(open_categories, SCORE_TABLE[roll_indices(dice)], 0)
+        best = possible.argmax(axis=1)
+        # Same as get_least_worth_category_left when nothing scores
+        least_worth = np.where(open_categories, MAX_SCORES, np.iinfo(np.int16).max).argmin(axis=1)
+        return np.where(possible.max(axis=1) > 0, best, least_worth)
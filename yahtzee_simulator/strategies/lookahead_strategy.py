@@ -0,0 +1,65 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+from yahtzee_simulator.keep_table import KEEPS
+from yahtzee_simulator.score_category import Category, Dice
+from yahtzee_simulator.score_table import CATEGORIES, ROLL_INDEX, SCORE_TABLE
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.strategy import Strategy
+from yahtzee_simulator.strategy_helpers import best_keeps, keep_values
+
+
+class LookaheadStrategy(Strategy):
+    """
+    Greedy strategy that looks ahead over the rolls left in the turn.
+
+    It keeps the dice that maximise the expected best score among the open categories at
+    the end of the turn, and scores the category worth the most. Later turns are ignored.
+    """
+
+    def __init__(self, max_plans: int = 4096) -> None:
+        """
+        Args:
+            max_plans: Most turn plans kept, one per set of filled categories. The oldest
+                are dropped first.
+        """
+        self.max_plans = max_plans
+        self._plans: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def __getstate__(self) -> Dict:
+        # Worker processes plan their own turns instead of receiving a copy
+        return {"max_plans": self.max_plans}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(state["max_plans"])
+
+    def _plan_turn(self, mask: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the best category for every roll, and the best keep for every roll with one
+        and with two rerolls left. Keeping every die is preferred on ties.
+        """
+        plan = self._plans.get(mask)
+        if plan is None:
+            if len(self._plans) >= self.max_plans:
+                del self._plans[next(iter(self._plans))]
+            open_categories = [c for c in range(len(Category)) if not mask >> c & 1]
+            scores = SCORE_TABLE[:, open_categories]
+            categories = np.array(open_categories, dtype=np.int8)[scores.argmax(axis=1)]
+            best_scores = scores.max(axis=1)
+            plan = self._plans[mask] = (categories, best_keeps(keep_values(best_scores, 1)),
+                                        best_keeps(keep_values(best_scores, 2)))
+        return plan
+
+    def should_finish_turn(self, dice: Dice, rolls_left: int, scorecard: Scorecard) -> bool:
+        if rolls_left <= 0:
+            return True
+        return len(self.choose_dice_to_keep(dice, rolls_left, scorecard)) == 5
+
+    def choose_dice_to_keep(self, dice: Dice, rolls_left: int, scorecard: Scorecard) -> tuple[int]:
+        keeps = self._plan_turn(scorecard.filled_mask())[min(rolls_left, 2)]
+        return KEEPS[keeps[ROLL_INDEX[dice]]]
+
+    def choose_category(self, dice: Dice, scorecard: Scorecard) -> Category:
+        categories = self._plan_turn(scorecard.filled_mask())[0]
+        return CATEGORIES[categories[ROLL_INDEX[dice]]]
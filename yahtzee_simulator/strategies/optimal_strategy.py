@@ -0,0 +1,166 @@
+import os
+from typing import Dict, Tuple
+
+import numpy as np
+
+from yahtzee_simulator.atomic_file import atomic_write
+from yahtzee_simulator.keep_table import KEEP_INDEX, KEEP_TRANSITIONS, KEEPS, ROLL_KEEPS, ROLL_PROBABILITIES
+from yahtzee_simulator.score_category import Category, Dice
+from yahtzee_simulator.score_table import CATEGORIES, ROLL_INDEX, ROLLS, SCORE_TABLE
+from yahtzee_simulator.scorecard import Scorecard
+from yahtzee_simulator.strategy import Strategy
+from yahtzee_simulator.strategy_helpers import best_keeps
+
+UPPER_BONUS_THRESHOLD = 63
+UPPER_BONUS = 50
+NUMBER_OF_MASKS = 1 << len(Category)
+FULL_MASK = NUMBER_OF_MASKS - 1
+
+DEFAULT_TABLE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "yahtzee_simulator",
+    "optimal_values_v1.npy",
+)
+
+_SCORES = SCORE_TABLE.astype(np.float64)
+_TRANSITIONS_T = np.ascontiguousarray(KEEP_TRANSITIONS.T)
+_KEEP_ALL = np.array([KEEP_INDEX[roll] for roll in ROLLS])
+
+
+def _best_keep_values(values: np.ndarray) -> np.ndarray:
+    """Given the value of every roll, return the value of every roll with one more reroll left."""
+    keep_values = values @ _TRANSITIONS_T
+    return keep_values[..., ROLL_KEEPS].max(axis=-1)
+
+
+def solve_state_values(verbose: bool = True) -> np.ndarray:
+    """
+    Solve the game for the strategy that maximises the expected final score.
+
+    Returns the expected score still to come, bonus included, for every state at the
+    start of a turn, indexed by [filled-category bitmask, upper subtotal capped at 63].
+    Takes a few minutes.
+    """
+    values = np.zeros((NUMBER_OF_MASKS, UPPER_BONUS_THRESHOLD + 1))
+    values[FULL_MASK, UPPER_BONUS_THRESHOLD] = UPPER_BONUS
+    uppers = np.arange(UPPER_BONUS_THRESHOLD + 1)[:, None]
+    # Capped upper subtotal after scoring each roll in each upper category, [category, upper, roll]
+    next_uppers = np.minimum(UPPER_BONUS_THRESHOLD, uppers[None] + SCORE_TABLE[:, :6].T[:, None, :])
+
+    # Filling a category only sets bits, so every successor mask has been solved already
+    for mask in range(FULL_MASK - 1, -1, -1):
+        if verbose and mask % 1024 == 0:
+            print(f"Solving optimal strategy {NUMBER_OF_MASKS - mask} / {NUMBER_OF_MASKS}", end="\r")
+        final = np.full((UPPER_BONUS_THRESHOLD + 1, len(ROLLS)), -np.inf)
+        for c in range(len(Category)):
+            if mask >> c & 1:
+                continue
+            next_values = values[mask | 1 << c]
+            if c < 6:
+                candidate = _SCORES[:, c] + next_values[next_uppers[c]]
+            else:
+                candidate = _SCORES[:, c] + next_values[:, None]
+            np.maximum(final, candidate, out=final)
+        values[mask] = _best_keep_values(_best_keep_values(final)) @ ROLL_PROBABILITIES
+    if verbose:
+        print()
+    return values
+
+
+def load_state_values(path: str = DEFAULT_TABLE_PATH) -> np.ndarray:
+    """Memory-map the state-value table at `path`, solving and writing it first if it is missing."""
+    if not os.path.exists(path):
+        values = solve_state_values().astype(np.float32)
+        with atomic_write(path) as f:
+            np.save(f, values)
+    values = np.load(path, mmap_mode="r")
+    if values.shape != (NUMBER_OF_MASKS, UPPER_BONUS_THRESHOLD + 1):
+        raise ValueError(f"{path} does not hold an optimal strategy table.")
+    return values
+
+
+class OptimalStrategy(Strategy):
+    """
+    Strategy that maximises the expected final score.
+
+    Decisions are looked up from a table holding the expected future score of every
+    (filled categories, capped upper subtotal) state. The table is solved once, written
+    to `table_path` and memory-mapped on later runs.
+    """
+
+    def __init__(self, table_path: str = DEFAULT_TABLE_PATH, max_plans: int = 16384) -> None:
+        """
+        Args:
+            table_path: Where the state-value table is read from, or written to once solved.
+            max_plans: Most turn plans kept, the oldest are dropped first.
+        """
+        self.table_path = table_path
+        self.values = load_state_values(table_path)
+        self.max_plans = max_plans
+        self._plans: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def __getstate__(self) -> Dict:
+        # Worker processes map the table and plan their turns themselves instead of receiving a copy
+        return {"table_path": self.table_path, "max_plans": self.max_plans}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(state["table_path"], state["max_plans"])
+
+    def expected_score(self) -> float:
+        """Return the expected final score of a whole game."""
+        return float(self.values[0, 0])
+
+    @staticmethod
+    def _state(scorecard: Scorecard) -> Tuple[int, int]:
+        return scorecard.filled_mask(), min(scorecard.upper_section_score(), UPPER_BONUS_THRESHOLD)
+
+    def _plan_turn(self, mask: int, upper: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the best category for every roll, and the best keep for every roll with
+        one and with two rerolls left. Keeping every die is preferred on ties.
+        """
+        plan = self._plans.get((mask, upper))
+        if plan is None:
+            if len(self._plans) >= self.max_plans:
+                del self._plans[next(iter(self._plans))]
+            plan = self._plans[mask, upper] = self._solve_turn(mask, upper)
+        return plan
+
+    def _solve_turn(self, mask: int, upper: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        final = np.full(len(ROLLS), -np.inf)
+        categories = np.zeros(len(ROLLS), dtype=np.int8)
+        for c in range(len(Category)):
+            if mask >> c & 1:
+                continue
+            next_values = self.values[mask | 1 << c]
+            if c < 6:
+                candidate = _SCORES[:, c] + next_values[np.minimum(UPPER_BONUS_THRESHOLD, upper + SCORE_TABLE[:, c])]
+            else:
+                candidate = _SCORES[:, c] + next_values[upper]
+            better = candidate > final
+            final = np.where(better, candidate, final)
+            categories[better] = c
+
+        keeps = []
+        values = final
+        for _ in range(2):
+            keep_values = values @ _TRANSITIONS_T
+            keeps.append(best_keeps(keep_values))
+            values = keep_values[keeps[-1]]
+        return categories, keeps[0], keeps[1]
+
+    def _best_keep(self, dice: Dice, rolls_left: int, scorecard: Scorecard) -> int:
+        plan = self._plan_turn(*self._state(scorecard))
+        return int(plan[min(rolls_left, 2)][ROLL_INDEX[dice]])
+
+    def should_finish_turn(self, dice: Dice, rolls_left: int, scorecard: Scorecard) -> bool:
+        if rolls_left <= 0:
+            return True
+        return self._best_keep(dice, rolls_left, scorecard) == _KEEP_ALL[ROLL_INDEX[dice]]
+
+    def choose_dice_to_keep(self, dice: Dice, rolls_left: int, scorecard: Scorecard) -> tuple[int]:
+        return KEEPS[self._best_keep(dice, rolls_left, scorecard)]
+
+    def choose_category(self, dice: Dice, scorecard: Scorecard) -> Category:
+        categories = self._plan_turn(*self._state(scorecard))[0]
+        return CATEGORIES[categories[ROLL_INDEX[dice]]]
@@ -1,7 +1,105 @@
-from typing import Dict, List
-from yahtzee_simulator.score_category import Category
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from yahtzee_simulator.keep_table import KEEP_INDEX, KEEP_TRANSITIONS, KEEPS, ROLL_KEEPS
+from yahtzee_simulator.score_category import Category, Dice
+from yahtzee_simulator.score_table import CATEGORY_INDEX, ROLL_INDEX, ROLLS, SCORE_TABLE
+
+__all__ = [
+    "get_least_worth_category_left",
+    "keep_index",
+    "outcome_distribution",
+    "possible_keeps",
+    "keep_values",
+    "best_keeps",
+    "expected_category_scores",
+    "expected_category_score",
+    "target_probabilities",
+    "probability_of_target",
+]
+
+# Lookahead helpers. Kept dice are given as values in any order and a keep is scored by
+# the rolls it can lead to, see `keep_table` for the underlying tables. `rerolls` is the
+# number of rolls still to come; with more than one, the dice kept in between are the
+# best ones for the quantity asked about.
+
+_TRANSITIONS_T = np.ascontiguousarray(KEEP_TRANSITIONS.T)
 
 
 def get_least_worth_category_left(categories: List[Category]) -> Category:
     """Return the category with the lowest possible max score from the possible categories."""
-    return min(categories, key=lambda cat: cat.max_score)
\ No newline at end of file
+    return min(categories, key=lambda cat: cat.max_score)
+
+
+def keep_index(dice_to_keep: Dice) -> int:
+    """Return the row of the kept dice in the keep tables."""
+    return KEEP_INDEX[tuple(sorted(dice_to_keep))]
+
+
+def outcome_distribution(dice_to_keep: Dice) -> Dict[Tuple[int, ...], float]:
+    """Return the probability of every sorted roll that keeping these dice and rolling the rest can give."""
+    row = KEEP_TRANSITIONS[keep_index(dice_to_keep)]
+    return {ROLLS[r]: float(row[r]) for r in np.flatnonzero(row)}
+
+
+def possible_keeps(dice: Dice) -> List[Tuple[int, ...]]:
+    """Return every distinct sorted set of dice that can be kept from a roll, from keeping none to all."""
+    row = ROLL_KEEPS[ROLL_INDEX[tuple(dice)]]
+    return [KEEPS[k] for k in sorted(set(row.tolist()))]
+
+
+def keep_values(roll_values: np.ndarray, rerolls: int = 1) -> np.ndarray:
+    """
+    Return the expected value of every keep, given a value for every roll.
+
+    `roll_values` has the 252 rolls in `ROLLS` order on its last axis, which becomes the
+    462 keeps in `KEEPS` order. Extra leading axes are evaluated independently.
+    """
+    if rerolls < 1:
+        raise ValueError(f"rerolls must be at least 1, got {rerolls}")
+    values = np.asarray(roll_values, dtype=np.float64) @ _TRANSITIONS_T
+    for _ in range(rerolls - 1):
+        values = values[..., ROLL_KEEPS].max(axis=-1) @ _TRANSITIONS_T
+    return values
+
+
+def best_keeps(values: np.ndarray) -> np.ndarray:
+    """
+    Return the index of the best keep for every roll, given the value of every keep.
+
+    `values` has the 462 keeps in `KEEPS` order, the result the 252 rolls in `ROLLS`
+    order. Keeping every die is preferred on ties.
+    """
+    candidates = np.asarray(values)[ROLL_KEEPS]
+    # Keep-everything is the last column of every row, so search from the end
+    best = ROLL_KEEPS.shape[1] - 1 - candidates[:, ::-1].argmax(axis=1)
+    return ROLL_KEEPS[np.arange(len(ROLLS)), best]
+
+
+@lru_cache(maxsize=4)
+def expected_category_scores(rerolls: int = 1) -> np.ndarray:
+    """Return the (462, 15) expected score of every keep in every category. Read only."""
+    scores = np.ascontiguousarray(keep_values(SCORE_TABLE.T, rerolls).T)
+    scores.flags.writeable = False
+    return scores
+
+
+def expected_category_score(dice_to_keep: Dice, category: Category, rerolls: int = 1) -> float:
+    """Return the expected score in a category after keeping these dice."""
+    return float(expected_category_scores(rerolls)[keep_index(dice_to_keep), CATEGORY_INDEX[category]])
+
+
+@lru_cache(maxsize=256)
+def target_probabilities(category: Category, target: int, rerolls: int = 1) -> np.ndarray:
+    """Return the probability of every keep to score at least `target` in a category. Read only."""
+    reached = SCORE_TABLE[:, CATEGORY_INDEX[category]] >= target
+    probabilities = keep_values(reached, rerolls)
+    probabilities.flags.writeable = False
+    return probabilities
+
+
+def probability_of_target(dice_to_keep: Dice, category: Category, target: int, rerolls: int = 1) -> float:
+    """Return the probability to score at least `target` in a category after keeping these dice."""
+    return float(target_probabilities(category, target, rerolls)[keep_index(dice_to_keep)])
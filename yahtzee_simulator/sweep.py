@@ -0,0 +1,247 @@
+"""
+Parameter sweeps that race the configurations of a tunable strategy.
+
+Every configuration plays the same games, with common random numbers as in a
+`Tournament`. Games are played in rounds of growing size, and after each round the
+configurations that are significantly worse than the leader drop out, so most games
+go to the configurations that are still competitive.
+
+    sweep = Sweep(lambda threshold: MyStrategy(threshold), grid_search({"threshold": range(10, 30)}),
+                  max_games=100_000, seed=1).run()
+    sweep.print_summary()
+"""
+import itertools
+import json
+import math
+import os
+import pickle
+import random
+import warnings
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from yahtzee_simulator.dice_source import AlignedDiceSource
+from yahtzee_simulator.score_statistics import ScoreStatistics
+from yahtzee_simulator.score_table import total_scores
+from yahtzee_simulator.seeding import new_seed
+from yahtzee_simulator.simulator import DiceSourceFactory, create_run_folder, simulate_games
+from yahtzee_simulator.strategy import Strategy
+from yahtzee_simulator.tournament import paired_comparison
+
+Parameters = Dict[str, Any]
+
+
+def grid_search(space: Mapping[str, Iterable]) -> List[Parameters]:
+    """Return every combination of the parameter values."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(list(space[name]) for name in names))]
+
+
+def random_search(space: Mapping[str, Union[Sequence, Callable[[random.Random], Any]]], samples: int,
+                  seed: Optional[int] = None) -> List[Parameters]:
+    """
+    Return `samples` random configurations.
+
+    A parameter is drawn from a sequence of values, or by calling a function with a
+    `random.Random`, e.g. `lambda rng: rng.uniform(0.5, 2.0)`.
+    """
+    rng = random.Random(seed)
+    return [
+        {name: values(rng) if callable(values) else rng.choice(values) for name, values in space.items()}
+        for _ in range(samples)
+    ]
+
+
+@dataclass
+class SweepResult:
+    """The games played by one configuration of a sweep."""
+    parameters: Parameters
+    statistics: ScoreStatistics = field(default_factory=ScoreStatistics)
+    # Round after which the configuration dropped out, counting from 1, None if it lasted to the end
+    eliminated_in_round: Optional[int] = None
+
+    @property
+    def games(self) -> int:
+        return self.statistics.count
+
+    def mean(self) -> float:
+        return self.statistics.mean()
+
+
+class Sweep:
+    """
+    Races the configurations of a strategy to find the parameters with the best average score.
+
+    Round r plays games up to `initial_games * growth**r` for every configuration still
+    in the race. A configuration drops out once its paired score difference to the
+    leader is below zero with the given confidence, corrected for the number of
+    configurations compared. The race ends when one configuration is left or the
+    survivors have played `max_games` games.
+    """
+
+    def __init__(self, factory: Callable[..., Strategy], configurations: Iterable[Parameters],
+                 max_games: int = 100_000, initial_games: int = 500, growth: float = 2.0,
+                 seed: Optional[int] = None, workers: Optional[int] = None,
+                 dice_source: DiceSourceFactory = AlignedDiceSource, confidence: float = 0.95) -> None:
+        """
+        Args:
+            factory: Creates a strategy from the parameters of a configuration as keyword arguments.
+            configurations: Parameters to try, e.g. from `grid_search` or `random_search`.
+            max_games: Most games a configuration plays.
+            initial_games: Games every configuration plays in the first round.
+            growth: Factor the games played grow by per round.
+            seed: Seed of the shared dice. Picked at random if not given.
+            workers: Number of processes to spread the games over.
+            dice_source: `DiceSource` class, or any callable taking the seed, like in `Simulator`.
+            confidence: Confidence needed to drop a configuration.
+        """
+        if growth <= 1:
+            raise ValueError("growth must be larger than 1.")
+        self.factory = factory
+        self.results = [SweepResult(dict(parameters)) for parameters in configurations]
+        if not self.results:
+            raise ValueError("A sweep needs at least one configuration.")
+        self.strategies = [factory(**result.parameters) for result in self.results]
+        self.max_games = max_games
+        self.initial_games = min(initial_games, max_games)
+        self.growth = growth
+        self.seed = seed
+        self.workers = workers
+        self.dice_source = dice_source
+        self.confidence = confidence
+
+        # Total score of every game played per configuration, the same games for all of them.
+        # Grown per round, and released once a configuration drops out.
+        self.totals: List[Optional[np.ndarray]] = [np.zeros(0, dtype=np.int16) for _ in self.results]
+        self.rounds = 0
+        self.run_folder: Optional[str] = None
+
+    @property
+    def total_games(self) -> int:
+        """Games played by all configurations together."""
+        return sum(result.games for result in self.results)
+
+    def run(self) -> "Sweep":
+        if self.seed is None:
+            self.seed = new_seed()
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self._use_workers() else None
+        try:
+            survivors = list(range(len(self.results)))
+            played = 0
+            target = self.initial_games
+            while True:
+                self._play(executor, survivors, played, target)
+                played = target
+                self.rounds += 1
+                if played >= self.max_games:
+                    break
+                survivors = self._eliminate(survivors, played)
+                if len(survivors) == 1:
+                    break
+                target = min(self.max_games, math.ceil(played * self.growth))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return self
+
+    def _use_workers(self) -> bool:
+        if self.workers is None or self.workers <= 1:
+            return False
+        try:
+            pickle.dumps(self.strategies)
+        except Exception as e:
+            warnings.warn(f"The strategies cannot be pickled ({e}), running in a single process instead.")
+            return False
+        return True
+
+    def _play(self, executor: Optional[Executor], survivors: List[int], start: int, stop: int) -> None:
+        """Play games [start, stop) with every surviving configuration."""
+        shard_size = max(1, min(10_000, math.ceil((stop - start) * len(survivors) / ((self.workers or 1) * 8))))
+        tasks = [(i, shard, min(shard_size, stop - shard))
+                 for i in survivors for shard in range(start, stop, shard_size)]
+        args = (
+            [self.strategies[i] for i, _, _ in tasks],
+            [shard for _, shard, _ in tasks],
+            [count for _, _, count in tasks],
+            [self.seed] * len(tasks),
+            [self.dice_source] * len(tasks),
+            [False] * len(tasks),
+        )
+        for i in survivors:
+            totals = np.zeros(stop, dtype=np.int16)
+            totals[:start] = self.totals[i][:start]
+            self.totals[i] = totals
+        shards = executor.map(simulate_games, *args) if executor is not None else map(simulate_games, *args)
+        for (i, shard, count), (category_scores, _, _) in zip(tasks, shards):
+            self.totals[i][shard:shard + count] = total_scores(category_scores)
+            self.results[i].statistics.add_batch(category_scores)
+
+    def _eliminate(self, survivors: List[int], played: int) -> List[int]:
+        """Drop the configurations significantly worse than the leader after `played` games."""
+        if played < 2:
+            return survivors
+        leader = max(survivors, key=lambda i: self.results[i].mean())
+        # Bonferroni correction, every survivor is compared with the leader
+        confidence = 1 - (1 - self.confidence) / max(1, len(survivors) - 1)
+        remaining = []
+        for i in survivors:
+            if i != leader:
+                comparison = paired_comparison(str(i), str(leader), self.totals[i][:played],
+                                               self.totals[leader][:played], confidence)
+                if comparison.high < 0:
+                    self.results[i].eliminated_in_round = self.rounds
+                    self.totals[i] = None
+                    continue
+            remaining.append(i)
+        return remaining
+
+    def ranked(self) -> List[SweepResult]:
+        """
+        Return the configurations from the best to the worst.
+
+        Configurations that lasted longer rank higher, those that dropped out in the same
+        round by their average score.
+        """
+        def key(result: SweepResult) -> tuple:
+            rounds = self.rounds + 1 if result.eliminated_in_round is None else result.eliminated_in_round
+            return rounds, result.mean()
+        return sorted(self.results, key=key, reverse=True)
+
+    def best(self) -> SweepResult:
+        return self.ranked()[0]
+
+    def print_summary(self, top: int = 10) -> None:
+        print(f"Sweep of {len(self.results)} configurations, {self.total_games} games in {self.rounds} rounds "
+              f"(seed {self.seed}), instead of {len(self.results) * self.max_games} for a fixed count")
+        for rank, result in enumerate(self.ranked()[:top], start=1):
+            status = "" if result.eliminated_in_round is None else f"  out after round {result.eliminated_in_round}"
+            print(f"{rank:>3}. {result.mean():8.2f} over {result.games:>8} games  {result.parameters}{status}")
+
+    def save_results(self) -> str:
+        """Save the ranked configurations as `results/Sweep/run_<time>/summary.json`."""
+        self.run_folder, timestamp = create_run_folder("Sweep")
+        summary = {
+            "ranking": [
+                {
+                    "parameters": result.parameters,
+                    "games": result.games,
+                    "average": result.mean(),
+                    "std_dev": result.statistics.standard_deviation(),
+                    "eliminated_in_round": result.eliminated_in_round,
+                }
+                for result in self.ranked()
+            ],
+            "total_games": self.total_games,
+            "rounds": self.rounds,
+            "max_games": self.max_games,
+            "seed": self.seed,
+            "dice_source": getattr(self.dice_source, "__name__", self.dice_source.__class__.__name__),
+            "confidence": self.confidence,
+            "time": timestamp,
+        }
+        with open(os.path.join(self.run_folder, "summary.json"), "w") as f:
+            json.dump(summary, f, indent=4, default=str)
+        return self.run_folder
@@ -0,0 +1,184 @@
+import json
+import math
+import os
+import pickle
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from statistics import NormalDist
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from yahtzee_simulator.dice_source import AlignedDiceSource
+from yahtzee_simulator.score_statistics import ScoreStatistics
+from yahtzee_simulator.score_table import total_scores
+from yahtzee_simulator.seeding import new_seed
+from yahtzee_simulator.simulator import DiceSourceFactory, create_run_folder, simulate_games
+from yahtzee_simulator.strategy import Strategy
+
+
+@dataclass(frozen=True)
+class PairedComparison:
+    """How much better one strategy scored than another on the same games."""
+    strategy: str
+    opponent: str
+    mean_difference: float
+    low: float
+    high: float
+    standard_deviation: float
+    # Games independent runs would need for the same precision, per game played here
+    variance_reduction: float
+
+    def is_significant(self) -> bool:
+        """Return True if the confidence interval of the difference excludes zero."""
+        return self.low > 0 or self.high < 0
+
+
+def paired_comparison(strategy: str, opponent: str, totals: np.ndarray, opponent_totals: np.ndarray,
+                      confidence: float = 0.95) -> PairedComparison:
+    """Compare the total scores of two strategies on the same games, game by game."""
+    differences = totals.astype(np.float64) - opponent_totals
+    n = len(differences)
+    if n < 2:
+        raise ValueError("At least two games are needed to compare strategies.")
+    mean = float(differences.mean())
+    deviation = float(differences.std(ddof=1))
+    half_width = NormalDist().inv_cdf((1 + confidence) / 2) * deviation / math.sqrt(n)
+    independent_variance = float(totals.var(ddof=1) + opponent_totals.var(ddof=1))
+    variance_reduction = independent_variance / deviation ** 2 if deviation > 0 else math.inf
+    return PairedComparison(strategy, opponent, mean, mean - half_width, mean + half_width,
+                            deviation, variance_reduction)
+
+
+class Tournament:
+    """
+    Plays several strategies on the same games, with common random numbers.
+
+    Every strategy plays game i with dice seeded from the tournament seed and i, so each
+    game is a paired comparison and luck largely cancels out of the score differences.
+    The default `AlignedDiceSource` also gives every strategy the same dice in the same
+    roll of the same turn, even once their kept dice differ.
+    """
+
+    def __init__(self, strategies: Union[Sequence[Strategy], Mapping[str, Strategy]], number_of_games: int,
+                 seed: Optional[int] = None, workers: Optional[int] = None,
+                 dice_source: DiceSourceFactory = AlignedDiceSource, confidence: float = 0.95) -> None:
+        """
+        Args:
+            strategies: Strategies to compare, by name or as a list named after their classes.
+            number_of_games: Number of games every strategy plays.
+            seed: Seed of the shared dice. Picked at random if not given.
+            workers: Number of processes to spread the strategies and games over.
+            dice_source: `DiceSource` class, or any callable taking the seed, like in `Simulator`.
+            confidence: Confidence level of the intervals.
+        """
+        if isinstance(strategies, Mapping):
+            self.strategies: Dict[str, Strategy] = dict(strategies)
+        else:
+            self.strategies = {}
+            for strategy in strategies:
+                name = strategy.__class__.__name__
+                number = 1
+                while name in self.strategies:
+                    number += 1
+                    name = f"{strategy.__class__.__name__}_{number}"
+                self.strategies[name] = strategy
+        self.number_of_games = number_of_games
+        self.seed = seed
+        self.workers = workers
+        self.dice_source = dice_source
+        self.confidence = confidence
+
+        # Total score of every game per strategy, games in the same order for all of them
+        self.totals: Dict[str, np.ndarray] = {}
+        self.statistics: Dict[str, ScoreStatistics] = {}
+        self.run_folder: Optional[str] = None
+
+    def run(self) -> "Tournament":
+        if self.seed is None:
+            self.seed = new_seed()
+        for name in self.strategies:
+            self.totals[name] = np.zeros(self.number_of_games, dtype=np.int16)
+            self.statistics[name] = ScoreStatistics()
+
+        shard_size = max(1, min(10_000, math.ceil(self.number_of_games / ((self.workers or 1) * 8))))
+        tasks = [(name, start, min(shard_size, self.number_of_games - start))
+                 for name in self.strategies for start in range(0, self.number_of_games, shard_size)]
+        args = (
+            [self.strategies[name] for name, _, _ in tasks],
+            [start for _, start, _ in tasks],
+            [count for _, _, count in tasks],
+            [self.seed] * len(tasks),
+            [self.dice_source] * len(tasks),
+            [False] * len(tasks),
+        )
+        if self._use_workers():
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                self._collect(tasks, executor.map(simulate_games, *args))
+        else:
+            self._collect(tasks, map(simulate_games, *args))
+        return self
+
+    def _use_workers(self) -> bool:
+        if self.workers is None or self.workers <= 1 or self.number_of_games == 0:
+            return False
+        for name, strategy in self.strategies.items():
+            try:
+                pickle.dumps(strategy)
+            except Exception as e:
+                warnings.warn(f"{name} cannot be pickled ({e}), running in a single process instead.")
+                return False
+        return True
+
+    def _collect(self, tasks, shards) -> None:
+        for (name, start, count), (category_scores, _, _) in zip(tasks, shards):
+            self.totals[name][start:start + count] = total_scores(category_scores)
+            self.statistics[name].add_batch(category_scores)
+
+    def compare(self, strategy: str, opponent: str) -> PairedComparison:
+        """Compare the scores of two strategies game by game."""
+        return paired_comparison(strategy, opponent, self.totals[strategy], self.totals[opponent], self.confidence)
+
+    def standings(self) -> List[str]:
+        """Return the strategy names from the best to the worst average score."""
+        return sorted(self.strategies, key=lambda name: self.statistics[name].mean(), reverse=True)
+
+    def comparisons(self) -> List[PairedComparison]:
+        """Compare every strategy with the next one in the standings."""
+        ranked = self.standings()
+        return [self.compare(a, b) for a, b in zip(ranked, ranked[1:])]
+
+    def print_summary(self) -> None:
+        print(f"Tournament of {self.number_of_games} games per strategy (seed {self.seed})")
+        for rank, name in enumerate(self.standings(), start=1):
+            print(f"{rank:>3}. {name:<30} {self.statistics[name].mean():8.2f}")
+        for comparison in self.comparisons():
+            print(f"{comparison.strategy} - {comparison.opponent}: {comparison.mean_difference:+.2f} "
+                  f"({comparison.low:+.2f} to {comparison.high:+.2f}), "
+                  f"{comparison.variance_reduction:.1f}x fewer games than independent runs")
+
+    def save_results(self) -> str:
+        """Save the standings and comparisons as `results/Tournament/run_<time>/summary.json`."""
+        self.run_folder, timestamp = create_run_folder("Tournament")
+        ranked = self.standings()
+        summary = {
+            "standings": [
+                {
+                    "strategy": name,
+                    "average": self.statistics[name].mean(),
+                    "std_dev": self.statistics[name].standard_deviation(),
+                    "Bonus percentage": self.statistics[name].bonus_percentage(),
+                }
+                for name in ranked
+            ],
+            "comparisons": [asdict(self.compare(a, b)) for i, a in enumerate(ranked) for b in ranked[i + 1:]],
+            "number_of_games": self.number_of_games,
+            "seed": self.seed,
+            "dice_source": getattr(self.dice_source, "__name__", self.dice_source.__class__.__name__),
+            "confidence": self.confidence,
+            "time": timestamp,
+        }
+        with open(os.path.join(self.run_folder, "summary.json"), "w") as f:
+            json.dump(summary, f, indent=4)
+        return self.run_folder
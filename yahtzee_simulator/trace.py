@@ -0,0 +1,112 @@
+import struct
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import BinaryIO, Iterator, List, Optional
+
+from yahtzee_simulator.decision_type import Decision, DecisionType
+from yahtzee_simulator.score_category import Category
+from yahtzee_simulator.score_table import CATEGORIES, CATEGORY_INDEX
+from yahtzee_simulator.scorecard import Scorecard
+
+
+class EventType(IntEnum):
+    """Kinds of trace events. Decisions share their values with `DecisionType`."""
+    ROLL = 0
+    FINISH_TURN = DecisionType.FINISH_TURN.value
+    KEEP_DICE = DecisionType.KEEP_DICE.value
+    CHOOSE_CATEGORY = DecisionType.CHOOSE_CATEGORY.value
+
+
+@dataclass(frozen=True)
+class TraceEvent:
+    type: EventType
+    dice: tuple[int, ...] = ()
+    roll_number: int = 0
+    category: Optional[Category] = None
+
+    def describe(self) -> str:
+        """Return the event as a line of the game history."""
+        if self.type == EventType.ROLL:
+            return f"Roll number {self.roll_number}: {self.dice}"
+        if self.type == EventType.KEEP_DICE:
+            return f"Continuing turn, keeping dice: {self.dice}"
+        if self.type == EventType.FINISH_TURN:
+            return f"Finishing turn, choosing category: {self.category}"
+        return f"No rolls left, choosing category: {self.category}"
+
+    def decision(self) -> Optional[Decision]:
+        """Return the event as a `Decision`, or None for rolls."""
+        if self.type == EventType.ROLL:
+            return None
+        return Decision(DecisionType(self.type.value), self.describe())
+
+
+# Every event is one record: type, a small argument, then up to five dice padded with zeros
+_RECORD = struct.Struct("<BB5B")
+_NO_DICE = (0, 0, 0, 0, 0)
+
+
+class GameTrace:
+    """
+    Compact binary record of everything that happened in a game.
+
+    Events take seven bytes each and are only decoded when the history is read,
+    so a traced game does no string formatting while it is played.
+    """
+
+    def __init__(self, data: bytes = b"") -> None:
+        self.data = bytearray(data)
+
+    def roll(self, roll_number: int, dice: tuple[int, ...]) -> None:
+        self.data += _RECORD.pack(EventType.ROLL, roll_number, *dice)
+
+    def keep(self, dice_to_keep: tuple[int, ...]) -> None:
+        self.data += _RECORD.pack(EventType.KEEP_DICE, len(dice_to_keep), *dice_to_keep,
+                                  *_NO_DICE[len(dice_to_keep):])
+
+    def choose(self, decision_type: DecisionType, category: Category) -> None:
+        """Record the category chosen to finish a turn, before or after the last roll."""
+        self.data += _RECORD.pack(decision_type.value, CATEGORY_INDEX[category], *_NO_DICE)
+
+    def events(self) -> Iterator[TraceEvent]:
+        for event_type, argument, *dice in _RECORD.iter_unpack(self.data):
+            event_type = EventType(event_type)
+            if event_type == EventType.ROLL:
+                yield TraceEvent(event_type, tuple(dice), roll_number=argument)
+            elif event_type == EventType.KEEP_DICE:
+                yield TraceEvent(event_type, tuple(dice[:argument]))
+            else:
+                yield TraceEvent(event_type, category=CATEGORIES[argument])
+
+    def turns(self) -> List[List[str]]:
+        """Render the trace as the lines of each turn, with the scorecard after every turn."""
+        scorecard = Scorecard()
+        turns = []
+        turn = []
+        dice = _NO_DICE
+        for event in self.events():
+            turn.append(event.describe())
+            if event.type == EventType.ROLL:
+                dice = event.dice
+            elif event.type != EventType.KEEP_DICE:
+                scorecard.set_score(dice, event.category)
+                turn.append(f"Current scorecard:\n {scorecard}")
+                turns.append(turn)
+                turn = []
+        return turns
+
+
+def write_traces(f: BinaryIO, traces: List[GameTrace]) -> None:
+    """Write game traces to a binary file, each prefixed with its length."""
+    for trace in traces:
+        f.write(struct.pack("<I", len(trace.data)))
+        f.write(trace.data)
+
+
+def read_traces(f: BinaryIO) -> List[GameTrace]:
+    """Read game traces written by `write_traces`."""
+    traces = []
+    while header := f.read(4):
+        (length,) = struct.unpack("<I", header)
+        traces.append(GameTrace(f.read(length)))
+    return traces